@@ -0,0 +1,167 @@
+"""Time the extractors, the yaml loaders, romanize, the DBF conversion and the reports on synthetic catalogues.
+
+Results are written as json, the best time in seconds of each benchmark by catalogue size, so that
+runs can be compared:
+
+    python benchmarks/run_benchmarks.py --sizes 10000 100000 --output benchmarks.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Any
+
+from synthetic_catalogue import synthetic_entries, write_dbf, write_synthetic_catalogue
+
+from skoufas_dbf_reader import generate_reports
+from skoufas_dbf_reader.catalogue import Catalogue
+from skoufas_dbf_reader.conversion import FIELD_SPECS, converted_catalog
+from skoufas_dbf_reader.correction_data import CORRECTION_TABLES
+from skoufas_dbf_reader.dbf_to_yaml import convert_dbf_to_yaml, write_entries_jsonl
+from skoufas_dbf_reader.utilities import (
+    entries_catalogue,
+    iter_jsonl_entries,
+    iter_raw_entries,
+    read_yaml_data,
+    romanize,
+)
+
+RESULTS_FORMAT = 1
+
+
+def best_time(function: Callable[[], Any], repeat: int, setup: Callable[[], Any] | None = None) -> float:
+    """Lowest wall clock time of a few runs, setup runs untimed before each of them"""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def use_catalogue(work_directory: str):
+    """Point the entries and the yaml cache to the work directory"""
+    os.environ["SKOUFAS_DBF_READER_ENTRIES"] = os.path.join(work_directory, "entries.yml")
+    os.environ["SKOUFAS_DBF_READER_CACHE_DIR"] = os.path.join(work_directory, "cache")
+
+
+def benchmarks(size: int, work_directory: str) -> dict[str, tuple[Callable[[], Any], Callable[[], Any] | None]]:
+    """Benchmarks by name, as (function, setup) pairs, for a catalogue written in the work directory"""
+    write_synthetic_catalogue(os.path.join(work_directory, "entries.yml"), size)
+    use_catalogue(work_directory)
+    entries_catalogue.cache_clear()
+    converted_catalog.cache_clear()
+    reports_directory = os.path.join(work_directory, "reports")
+
+    def without_yaml_cache():
+        os.environ["SKOUFAS_DBF_READER_CACHE_DIR"] = ""
+
+    def fresh_entries():
+        without_yaml_cache()
+        entries_catalogue.cache_clear()
+
+    def fresh_cached_entries():
+        entries_catalogue.cache_clear()
+        entries_catalogue()
+        entries_catalogue.cache_clear()
+
+    def fresh_romanize():
+        romanize.cache_clear()
+
+    def fresh_reports():
+        shutil.rmtree(reports_directory, ignore_errors=True)
+        generate_reports.drain_produced_files()
+
+    def romanize_all():
+        for value in romanized_values:
+            romanize(value)
+
+    def dbf_to_yaml():
+        convert_dbf_to_yaml(dbf_file, os.path.join(work_directory, "converted.yml"))
+
+    jsonl_file = os.path.join(work_directory, "entries.jsonl")
+    with open(jsonl_file, "w", encoding="utf-8") as outfile:
+        write_entries_jsonl(synthetic_entries(size), outfile, progress_every=0)
+
+    result: dict[str, tuple[Callable[[], Any], Callable[[], Any] | None]] = {
+        "load_entries": (entries_catalogue, fresh_entries),
+        "load_entries_cached": (entries_catalogue, fresh_cached_entries),
+        "load_entries_jsonl": (lambda: Catalogue.from_entries(iter_jsonl_entries(jsonl_file)), None),
+    }
+    for code in CORRECTION_TABLES:
+        result[f"read_yaml_data[{code}]"] = (lambda code=code: read_yaml_data(code), without_yaml_cache)
+
+    catalogue = entries_catalogue()
+    for spec in FIELD_SPECS:
+        result[f"extractor[{spec.extractor.__name__}]"] = (lambda spec=spec: spec.extract_columns(catalogue), None)
+    result["convert_catalog"] = (converted_catalog, converted_catalog.cache_clear)
+
+    romanized_values = sorted({value for column in catalogue.columns for value in column if isinstance(value, str)})
+    result["romanize"] = (romanize_all, fresh_romanize)
+
+    dbf_file = os.path.join(work_directory, "entries.dbf")
+
+    def dbf_catalogue():
+        if not os.path.exists(dbf_file):
+            write_dbf(dbf_file, list(synthetic_entries(size)))
+
+    result["convert_dbf_to_yaml"] = (dbf_to_yaml, dbf_catalogue)
+    result["load_entries_dbf"] = (lambda: Catalogue.from_entries(iter_raw_entries(dbf_file)), dbf_catalogue)
+
+    for report in generate_reports.REPORTS:
+        result[f"report[{report.__name__}]"] = (lambda report=report: report(reports_directory), fresh_reports)
+    return result
+
+
+def run_benchmarks(sizes: list[int], repeat: int, only: str | None) -> dict[str, Any]:
+    """Run the benchmarks matching the only regular expression, all of them if it is not set"""
+    results: dict[str, dict[str, float]] = {}
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix=f"skoufas-benchmark-{size}-") as work_directory:
+            results[str(size)] = {}
+            for name, (function, setup) in benchmarks(size, work_directory).items():
+                if only and not re.search(only, name):
+                    continue
+                use_catalogue(work_directory)
+                # the reports, the extractors and romanize work on the converted catalogue
+                converted_catalog()
+                results[str(size)][name] = best_time(function, repeat, setup)
+                print(f"{size:>8} {name}: {results[str(size)][name]:.4f}s", file=sys.stderr)
+    return {
+        "format": RESULTS_FORMAT,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main():
+    """Run the benchmarks and write the results as json"""
+    parser = argparse.ArgumentParser(description="Time extractors, loaders and reports on synthetic catalogues")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000], help="Catalogue sizes, e.g. 10000 100000")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each benchmark, the best one is kept")
+    parser.add_argument("--only", help="Only run the benchmarks whose name matches this regular expression")
+    parser.add_argument("--output", help="Json file to write, standard output if not set")
+    args = parser.parse_args()
+    results = run_benchmarks(args.sizes, args.repeat, args.only)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as outfile:
+            json.dump(results, outfile, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Synthetic catalogues with the shape of entries.yml, used by the benchmarks.
+
+The first cards are the cards of the real catalogue, the rest are copies of randomly chosen cards
+with new dbase numbers and new numeric entry numbers, so that the duplicate checks do not explode.
+
+    python benchmarks/synthetic_catalogue.py 100000 entries_100k.yml --dbf entries_100k.dbf
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import struct
+from collections.abc import Iterator
+
+from skoufas_dbf_reader.dbf_to_yaml import write_entries_yaml
+from skoufas_dbf_reader.utilities import all_entries
+
+DBF_COLUMNS = 30
+
+
+def synthetic_entries(size: int, seed: int = 843) -> Iterator[dict[int, str | int]]:
+    """Cards in the entries.yml layout, empty columns left out"""
+    source = all_entries()
+    rng = random.Random(seed)
+    next_entry_number = 1 + max(
+        (int(entry[5]) for entry in source if entry[5] and entry[5].strip().isdigit()),
+        default=0,
+    )
+    for count in range(size):
+        original = source[count] if count < len(source) else rng.choice(source)
+        entry: dict[int, str | int] = {i: value for i, value in original.items() if i and value}
+        entry[0] = count + 1
+        if count >= len(source) and original[5] and original[5].strip().isdigit():
+            entry[5] = str(next_entry_number)
+            next_entry_number += 1
+        yield dict(sorted(entry.items()))
+
+
+def write_synthetic_catalogue(path: str, size: int, seed: int = 843):
+    """Write a synthetic entries.yml"""
+    with open(path, "w", encoding="utf-8") as outfile:
+        write_entries_yaml(synthetic_entries(size, seed), outfile, progress_every=0)
+
+
+def write_dbf(path: str, entries: list[dict[int, str | int]]):
+    """Write entries as a dBase III file with the A01 to A30 character columns of the original"""
+    encoded = [
+        [str(entry.get(i) or "").encode("cp737", errors="replace") for i in range(1, DBF_COLUMNS + 1)]
+        for entry in entries
+    ]
+    widths = [min(254, max([1, *(len(record[i]) for record in encoded)])) for i in range(DBF_COLUMNS)]
+    header_length = 32 + 32 * DBF_COLUMNS + 1
+    record_length = 1 + sum(widths)
+    with open(path, "wb") as outfile:
+        outfile.write(struct.pack("<BBBBIHH20x", 3, 125, 1, 1, len(encoded), header_length, record_length))
+        outfile.writelines(
+            struct.pack("<11sc4xBB14x", f"A{i + 1:02}".encode("ascii"), b"C", width, 0)
+            for i, width in enumerate(widths)
+        )
+        outfile.write(b"\r")
+        for record in encoded:
+            outfile.write(b" ")
+            outfile.writelines(value[:width].ljust(width, b" ") for value, width in zip(record, widths))
+        outfile.write(b"\x1a")
+
+
+def main():
+    """Write a synthetic catalogue of the requested size"""
+    parser = argparse.ArgumentParser(description="Write a synthetic catalogue with the shape of entries.yml")
+    parser.add_argument("size", type=int, help="Number of cards")
+    parser.add_argument("yaml_file", help="entries.yml file to write")
+    parser.add_argument("--dbf", help="Also write the cards as a DBF file")
+    parser.add_argument("--seed", type=int, default=843)
+    args = parser.parse_args()
+    write_synthetic_catalogue(args.yaml_file, args.size, args.seed)
+    if args.dbf:
+        write_dbf(args.dbf, list(synthetic_entries(args.size, args.seed)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Columnar storage of the DBF entries: one list of values per column instead of one dict per entry"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, overload
+
+# The dbase number followed by the A01 to A30 columns
+COLUMN_COUNT = 31
+
+
+class EntryView(Mapping[int, Any]):
+    """A single entry of a Catalogue, read through to the columns without copying them"""
+
+    __slots__ = ("catalogue", "row")
+
+    def __init__(self, catalogue: Catalogue, row: int):
+        self.catalogue = catalogue
+        self.row = row
+
+    def __getitem__(self, column: int) -> Any:
+        if type(column) is not int or not 0 <= column < COLUMN_COUNT:
+            raise KeyError(column)
+        return self.catalogue.columns[column][self.row]
+
+    def __contains__(self, column: object) -> bool:
+        return type(column) is int and 0 <= column < COLUMN_COUNT
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(COLUMN_COUNT))
+
+    def __len__(self) -> int:
+        return COLUMN_COUNT
+
+    def __repr__(self) -> str:
+        return f"EntryView({dict(self)!r})"
+
+
+class Catalogue:
+    """Entries stored column by column, missing values as None.
+
+    Equal values of a column share a single string, and indexing returns an EntryView
+    """
+
+    def __init__(self, columns: list[list[Any]]):
+        if len(columns) != COLUMN_COUNT or len({len(column) for column in columns}) > 1:
+            raise Exception(f"A catalogue needs {COLUMN_COUNT} columns of equal length")
+        self.columns = columns
+        self._rows_by_dbase_number: dict[int, int] | None = None
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Mapping[int, Any]]) -> Catalogue:
+        """Build a catalogue from entries in the entries.yml layout, where empty columns may be left out"""
+        entries = entries if isinstance(entries, list) else list(entries)
+        columns = []
+        for i in range(COLUMN_COUNT):
+            distinct: dict[Any, Any] = {}
+            columns.append([distinct.setdefault(value, value) for value in (entry.get(i) for entry in entries)])
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(self.columns[0])
+
+    @overload
+    def __getitem__(self, row: int) -> EntryView: ...
+
+    @overload
+    def __getitem__(self, row: slice) -> list[EntryView]: ...
+
+    def __getitem__(self, row: int | slice) -> EntryView | list[EntryView]:
+        if isinstance(row, slice):
+            return [EntryView(self, i) for i in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return EntryView(self, row)
+
+    def __iter__(self) -> Iterator[EntryView]:
+        return (EntryView(self, row) for row in range(len(self)))
+
+    def column(self, column: int) -> list[Any]:
+        """All values of a column in entry order, 0 being the dbase numbers"""
+        return self.columns[column]
+
+    def by_dbase_number(self, dbase_number: int) -> EntryView:
+        """The entry with the given dbase number"""
+        if self._rows_by_dbase_number is None:
+            self._rows_by_dbase_number = {number: row for row, number in enumerate(self.columns[0])}
+        return EntryView(self, self._rows_by_dbase_number[dbase_number])
@@ -0,0 +1,236 @@
+"""Convert DBF entries to their extracted fields, running every extractor once per entry"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+
+from skoufas_dbf_reader.catalogue import Catalogue
+from skoufas_dbf_reader.correction_data import on_correction_data_reload
+from skoufas_dbf_reader.field_extractors import (
+    authors_from_a01,
+    copies_from_a17_a18_a30,
+    curator_from_a16,
+    dewey_from_a04_a05,
+    donation_from_a17_a30,
+    edition_from_a07,
+    edition_year_from_a09_a10,
+    editor_from_a08_a09,
+    entry_numbers_from_a04_a05_a06_a07_a08_a18_a19,
+    has_cd_from_a02_a03_a12_a13_a14_a17_a18_a22_a30,
+    has_dvd_from_a30,
+    isbn_from_a17_a18_a19_a22_a30,
+    language_from_a01_a02,
+    material_from_a18_a30,
+    notes_from_a17_a18_a21_a30,
+    offprint_from_a17_a21_a30,
+    pages_from_a11,
+    subtitle_from_a03,
+    title_from_a02,
+    topics_from_a12_to_a15_a20_a22_to_a24,
+    translator_from_a06,
+    volume_from_a17_a18_a20_a30,
+)
+from skoufas_dbf_reader.utilities import check_ean, check_isbn, check_issn, entries_catalogue, iter_entries
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """An extractor and the DBF columns it reads.
+
+    When as_list is set the columns are passed to the extractor as a single list argument.
+    When distinct is set extract_columns runs the extractor once per distinct combination of values,
+    so it is only set for extractors returning immutable values
+    """
+
+    name: str
+    extractor: Callable[..., Any]
+    columns: tuple[int, ...]
+    as_list: bool = False
+    distinct: bool = False
+
+    def _extract_values(self, values: tuple[Any, ...]) -> Any:
+        if self.as_list:
+            return self.extractor(list(values))
+        return self.extractor(*values)
+
+    def extract(self, entry: Mapping[int, Any]) -> Any:
+        """Run the extractor on the columns of a single entry"""
+        return self._extract_values(tuple(entry[i] for i in self.columns))
+
+    def extract_columns(self, catalogue: Catalogue) -> list[Any]:
+        """Run the extractor on every entry of a catalogue, reading whole columns at once"""
+        rows = list(zip(*(catalogue.column(i) for i in self.columns)))
+        if not self.distinct:
+            return [self._extract_values(values) for values in rows]
+        results = {values: self._extract_values(values) for values in dict.fromkeys(rows)}
+        return [results[values] for values in rows]
+
+
+FIELD_SPECS: tuple[FieldSpec, ...] = (
+    FieldSpec("authors", authors_from_a01, (1,)),
+    FieldSpec("language", language_from_a01_a02, (1, 2)),
+    FieldSpec("title", title_from_a02, (2,)),
+    FieldSpec("subtitle", subtitle_from_a03, (3,), distinct=True),
+    FieldSpec("dewey", dewey_from_a04_a05, (4, 5)),
+    FieldSpec("entry_numbers", entry_numbers_from_a04_a05_a06_a07_a08_a18_a19, (4, 5, 6, 7, 8, 18, 19)),
+    FieldSpec("translator", translator_from_a06, (6,), distinct=True),
+    FieldSpec("edition", edition_from_a07, (7,), distinct=True),
+    FieldSpec("editor", editor_from_a08_a09, (8, 9), distinct=True),
+    FieldSpec("edition_year", edition_year_from_a09_a10, (9, 10), distinct=True),
+    FieldSpec("pages", pages_from_a11, (11,), distinct=True),
+    FieldSpec("topics", topics_from_a12_to_a15_a20_a22_to_a24, (12, 13, 14, 15, 20, 22, 23, 24), as_list=True),
+    FieldSpec("curator", curator_from_a16, (16,), distinct=True),
+    FieldSpec("copies", copies_from_a17_a18_a30, (17, 18, 30), distinct=True),
+    FieldSpec("donation", donation_from_a17_a30, (17, 30), distinct=True),
+    FieldSpec("volume", volume_from_a17_a18_a20_a30, (17, 18, 20, 30), distinct=True),
+    FieldSpec("material", material_from_a18_a30, (18, 30), distinct=True),
+    FieldSpec("notes", notes_from_a17_a18_a21_a30, (17, 18, 21, 30), distinct=True),
+    FieldSpec(
+        "has_cd",
+        has_cd_from_a02_a03_a12_a13_a14_a17_a18_a22_a30,
+        (2, 3, 12, 13, 14, 17, 18, 22, 30),
+        as_list=True,
+    ),
+    FieldSpec("has_dvd", has_dvd_from_a30, (30,), as_list=True, distinct=True),
+    FieldSpec("offprint", offprint_from_a17_a21_a30, (17, 21, 30), distinct=True),
+    FieldSpec("isbn_issn_ean", isbn_from_a17_a18_a19_a22_a30, (17, 18, 19, 22, 30)),
+)
+
+
+@dataclass(frozen=True)
+class ConvertedEntry:  # pylint: disable=too-many-instance-attributes
+    """All the fields extracted from a single DBF entry"""
+
+    dbase_number: int
+    authors: list[str]
+    language: str | None
+    title: str | None
+    subtitle: str | None
+    dewey: str | None
+    entry_numbers: list[str]
+    translator: str | None
+    edition: str | None
+    editor: tuple[str | None, str | None] | None
+    edition_year: int | None
+    pages: int | None
+    topics: list[str]
+    curator: str | None
+    copies: int | None
+    donation: str | None
+    volume: str | None
+    material: str | None
+    notes: str | None
+    has_cd: bool
+    has_dvd: bool
+    offprint: bool
+    isbn_issn_ean: str | None
+    original_entry: Mapping[int, Any]
+
+    @property
+    def translators(self) -> list[str]:
+        """Translators split on the !! separator"""
+        if not self.translator:
+            return []
+        return self.translator.split("!!")
+
+    @property
+    def donors(self) -> list[str]:
+        """Donors split on the !! separator"""
+        if not self.donation:
+            return []
+        return self.donation.split("!!")
+
+    @property
+    def isbn(self) -> str | None:
+        """The isbn_issn_ean value if it is a valid ISBN"""
+        if self.isbn_issn_ean and not check_isbn(self.isbn_issn_ean):
+            return self.isbn_issn_ean
+        return None
+
+    @property
+    def issn(self) -> str | None:
+        """The isbn_issn_ean value if it is a valid ISSN"""
+        if self.isbn_issn_ean and not check_issn(self.isbn_issn_ean):
+            return self.isbn_issn_ean
+        return None
+
+    @property
+    def ean(self) -> str | None:
+        """The isbn_issn_ean value if it is a valid EAN"""
+        if self.isbn_issn_ean and not check_ean(self.isbn_issn_ean):
+            return self.isbn_issn_ean
+        return None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the layout used in converted_entries.yml"""
+        converted: dict[str, Any] = {"dbase_number": self.dbase_number, "authors": self.authors}
+        for name in ["language", "title", "subtitle", "dewey"]:
+            if getattr(self, name):
+                converted[name] = getattr(self, name)
+        converted["entry_numbers"] = self.entry_numbers
+        if self.translator:
+            converted["translators"] = self.translators
+        if self.edition:
+            converted["edition"] = self.edition
+        if self.editor:
+            converted["editor"] = f"{self.editor[0]} // {self.editor[1]}"
+        for name in ["edition_year", "pages"]:
+            if getattr(self, name):
+                converted[name] = getattr(self, name)
+        converted["topics"] = self.topics
+        for name in ["curator", "copies"]:
+            if getattr(self, name):
+                converted[name] = getattr(self, name)
+        if self.donation:
+            converted["donors"] = self.donors
+        for name in ["volume", "material", "notes"]:
+            if getattr(self, name):
+                converted[name] = getattr(self, name)
+        converted["has_cd"] = self.has_cd
+        converted["has_dvd"] = self.has_dvd
+        converted["offprint"] = self.offprint
+        for name in ["isbn", "issn", "ean"]:
+            if getattr(self, name):
+                converted[name] = getattr(self, name)
+        converted["original_entry"] = dict(self.original_entry)
+        return converted
+
+
+def convert_entry(entry: Mapping[int, Any]) -> ConvertedEntry:
+    """Run every extractor exactly once on a DBF entry"""
+    values = {spec.name: spec.extract(entry) for spec in FIELD_SPECS}
+    return ConvertedEntry(dbase_number=entry[0], original_entry=entry, **values)
+
+
+def convert_catalogue(catalogue: Catalogue) -> list[ConvertedEntry]:
+    """Run every extractor exactly once on each entry of a catalogue, one extractor at a time"""
+    names = [spec.name for spec in FIELD_SPECS]
+    extracted = zip(*(spec.extract_columns(catalogue) for spec in FIELD_SPECS))
+    return [
+        ConvertedEntry(dbase_number=entry[0], original_entry=entry, **dict(zip(names, values)))
+        for entry, values in zip(catalogue, extracted)
+    ]
+
+
+@cache
+def converted_catalog() -> list[ConvertedEntry]:
+    """All entries converted once, in DBF order"""
+    return convert_catalogue(entries_catalogue())
+
+
+def iter_converted_entries() -> Iterator[ConvertedEntry]:
+    """Converted entries in DBF order, from converted_catalog if it is loaded, else converted one at a time.
+
+    For reports that need a single pass, so that they run in constant memory on their own
+    """
+    if converted_catalog.cache_info().currsize:
+        yield from converted_catalog()
+    else:
+        yield from (convert_entry(entry) for entry in iter_entries())
+
+
+# The extracted fields depend on the correction tables
+on_correction_data_reload(converted_catalog.cache_clear)
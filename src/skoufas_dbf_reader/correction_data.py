@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
 from functools import cache
 from typing import Any
 
@@ -24,118 +26,411 @@ def converted_entries() -> Any:
     return read_yaml_data("converted_entries")
 
 
+CORRECTION_TABLES = (
+    "language_codes",
+    "author_corrections",
+    "editor_corrections",
+    "field04_corrections",
+    "field05_corrections",
+    "field06_corrections",
+    "field07_corrections",
+    "field08_corrections",
+    "field09_corrections",
+    "field10_corrections",
+    "field11_corrections",
+    "field16_corrections",
+    "field17_corrections",
+    "field18_corrections",
+    "field19_corrections",
+    "field20_corrections",
+    "field30_corrections",
+    "topic_replacements",
+    "translator_corrections",
+)
+
+# Key recorded when a whole table is read, e.g. when iterating over the language codes
+WHOLE_TABLE = None
+
+_lookup_recorder: set[tuple[str, str | None]] | None = None
+
+
+class RecordingTable(Mapping):
+    """Read only view of a correction table that records the keys looked up in it"""
+
+    __slots__ = ("code", "recorder", "table")
+
+    def __init__(self, code: str, table: dict[str, Any], recorder: set[tuple[str, str | None]]):
+        self.code = code
+        self.table = table
+        self.recorder = recorder
+
+    def __getitem__(self, key: str) -> Any:
+        self.recorder.add((self.code, key))
+        return self.table[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self.recorder.add((self.code, key))
+        return self.table.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        self.recorder.add((self.code, key))  # type: ignore[arg-type]
+        return key in self.table
+
+    def __iter__(self) -> Iterator[str]:
+        self.recorder.add((self.code, WHOLE_TABLE))
+        return iter(self.table)
+
+    def __len__(self) -> int:
+        self.recorder.add((self.code, WHOLE_TABLE))
+        return len(self.table)
+
+    def keys(self) -> Any:
+        self.recorder.add((self.code, WHOLE_TABLE))
+        return self.table.keys()
+
+    def values(self) -> Any:
+        self.recorder.add((self.code, WHOLE_TABLE))
+        return self.table.values()
+
+    def items(self) -> Any:
+        self.recorder.add((self.code, WHOLE_TABLE))
+        return self.table.items()
+
+
+@contextmanager
+def record_lookups() -> Iterator[set[tuple[str, str | None]]]:
+    """Collect the (table, key) pairs looked up in correction tables while the context is active"""
+    global _lookup_recorder  # pylint: disable=global-statement
+    previous = _lookup_recorder
+    recorded: set[tuple[str, str | None]] = set()
+    _lookup_recorder = recorded
+    try:
+        yield recorded
+    finally:
+        _lookup_recorder = previous
+        if previous is not None:
+            previous |= recorded
+
+
+# Hits and misses by correction table, while lookups are being counted
+_lookup_counts: dict[str, list[int]] | None = None
+
+
+class CountingTable(Mapping):
+    """Read only view of a correction table that counts the hits and misses of the lookups in it"""
+
+    __slots__ = ("counts", "table")
+
+    def __init__(self, table: Mapping[str, Any], counts: list[int]):
+        self.table = table
+        self.counts = counts
+
+    def _count(self, found: bool):
+        self.counts[0 if found else 1] += 1
+
+    def __getitem__(self, key: str) -> Any:
+        self._count(key in self.table)
+        return self.table[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self._count(key in self.table)
+        return self.table.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        found = key in self.table
+        self._count(found)
+        return found
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.table)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def keys(self) -> Any:
+        return self.table.keys()
+
+    def values(self) -> Any:
+        return self.table.values()
+
+    def items(self) -> Any:
+        return self.table.items()
+
+
+@contextmanager
+def count_lookups() -> Iterator[dict[str, list[int]]]:
+    """Count the [hits, misses] of the lookups in each correction table while the context is active"""
+    global _lookup_counts  # pylint: disable=global-statement
+    previous = _lookup_counts
+    counts: dict[str, list[int]] = {}
+    _lookup_counts = counts
+    try:
+        yield counts
+    finally:
+        _lookup_counts = previous
+
+
 @cache
+def load_correction_table(code: str) -> Any:
+    """Parse a correction table once"""
+    return read_yaml_data(code)
+
+
+def _recording(code: str, table: dict[str, Any]) -> Any:
+    if _lookup_recorder is None and _lookup_counts is None:
+        return table
+    view: Any = table
+    if _lookup_recorder is not None:
+        view = RecordingTable(code, table, _lookup_recorder)
+    if _lookup_counts is not None:
+        view = CountingTable(view, _lookup_counts.setdefault(code, [0, 0]))
+    return view
+
+
+def correction_table(code: str) -> Any:
+    """Correction table by name, wrapped while lookups are being recorded or counted"""
+    return _recording(code, load_correction_table(code))
+
+
+def recording_lookups() -> bool:
+    """Whether lookups are being recorded, when results computed earlier must not be reused"""
+    return _lookup_recorder is not None
+
+
+# Tables mapping a column value to a replacement string, None or a mapping of the keys below
+FIELD_CORRECTION_TABLES = (
+    "field04_corrections",
+    "field05_corrections",
+    "field06_corrections",
+    "field07_corrections",
+    "field08_corrections",
+    "field09_corrections",
+    "field17_corrections",
+    "field18_corrections",
+    "field19_corrections",
+    "field20_corrections",
+    "field30_corrections",
+)
+
+# Keys allowed in the mapping form of a field correction and the types of their values
+FIELD_CORRECTION_TYPES: dict[str, type | tuple[type, ...]] = {
+    "copies": int,
+    "dewey": str,
+    "donation": str,
+    "edition": str,
+    "editor": str,
+    "isbn": str,
+    "material": str,
+    "notes": str,
+    "offprint": bool,
+    "place": str,
+    "series": str,
+    "translator": str,
+    "use_dash": bool,
+    "volume": str,
+    "year": (str, int),
+}
+
+
+class FieldCorrection:  # pylint: disable=too-many-instance-attributes,too-few-public-methods
+    """A value of a field correction table, checked once when the table is compiled.
+
+    A replacement string is kept in text, a mapping in the attributes named after its keys.
+    None, which drops the value, leaves text unset and is_mapping false
+    """
+
+    __slots__ = ("is_mapping", "text", *FIELD_CORRECTION_TYPES)
+
+    def __init__(self):
+        self.text: str | None = None
+        self.is_mapping = False
+        self.copies: int | None = None
+        self.dewey: str | None = None
+        self.donation: str | None = None
+        self.edition: str | None = None
+        self.editor: str | None = None
+        self.isbn: str | None = None
+        self.material: str | None = None
+        self.notes: str | None = None
+        self.offprint: bool | None = None
+        self.place: str | None = None
+        self.series: str | None = None
+        self.translator: str | None = None
+        self.use_dash = True
+        self.volume: str | None = None
+        self.year: int | None = None
+
+
+def compile_field_correction(code: str, key: str, value: Any) -> FieldCorrection:
+    """Check a value of a field correction table and turn it into a FieldCorrection"""
+    if not isinstance(key, str) or not key or key != key.strip():
+        # column values are stripped strings, such a key would never match
+        raise Exception(f"Invalid key in {code} [{key}]")
+    correction = FieldCorrection()
+    if value is None:
+        return correction
+    if value in ("", {}):
+        # a blank entry could mean no correction or dropping the value, None says the latter
+        raise Exception(f"Empty correction in {code} [{key}], use null to drop the value")
+    if isinstance(value, str):
+        correction.text = value
+        return correction
+    if not isinstance(value, dict):
+        raise Exception(f"Invalid correction in {code} [{key}]")
+    correction.is_mapping = True
+    for name, attribute in value.items():
+        expected = FIELD_CORRECTION_TYPES.get(name)
+        if expected is None or not isinstance(attribute, expected):
+            raise Exception(f"Invalid correction in {code} [{key}]: {name}")
+        if attribute == "":
+            raise Exception(f"Empty correction in {code} [{key}]: {name}, leave it out instead")
+        if name == "year":
+            try:
+                attribute = int(attribute)
+            except ValueError as ex:
+                raise Exception(f"Invalid correction in {code} [{key}]: {name}") from ex
+        setattr(correction, name, attribute)
+    return correction
+
+
+@cache
+def load_field_corrections(code: str) -> dict[str, FieldCorrection]:
+    """Compile a field correction table once"""
+    return {key: compile_field_correction(code, key, value) for key, value in load_correction_table(code).items()}
+
+
+def field_corrections(code: str) -> dict[str, FieldCorrection]:
+    """Compiled field correction table by name, wrapped while lookups are being recorded or counted"""
+    return _recording(code, load_field_corrections(code))
+
+
+# Called after the correction tables are dropped, to clear whatever was computed from them
+_reload_listeners: list[Callable[[], None]] = []
+
+
+def on_correction_data_reload(listener: Callable[[], None]):
+    """Call listener every time reload_correction_data runs"""
+    _reload_listeners.append(listener)
+
+
+def reload_correction_data():
+    """Drop the parsed correction tables so that they are read again from the data directory"""
+    load_correction_table.cache_clear()
+    load_field_corrections.cache_clear()
+    load_language_suffix_re.cache_clear()
+    for listener in _reload_listeners:
+        listener()
+
+
 def language_codes() -> dict[str, str]:
     """Map of language codes in A01 to ISO language codes"""
-    return read_yaml_data("language_codes")
+    return correction_table("language_codes")
 
 
-@cache
 def author_corrections() -> dict[str, str | None]:
     """Map of author names found and manual overrides"""
-    return read_yaml_data("author_corrections")
+    return correction_table("author_corrections")
 
 
-@cache
 def editor_corrections() -> dict[str, str]:
     """Map editor and place manual overrides"""
-    return read_yaml_data("editor_corrections")
+    return correction_table("editor_corrections")
 
 
-@cache
 def field04_corrections() -> dict[str, str | dict[str, str] | None]:
     """Map of invalid dewey codes found and manual overrides"""
-    return read_yaml_data("field04_corrections")
+    return correction_table("field04_corrections")
 
 
-@cache
 def field05_corrections() -> dict[str, str | dict[str, str | bool] | None]:
     """Map of invalid entry numbers found and manual overrides"""
-    return read_yaml_data("field05_corrections")
+    return correction_table("field05_corrections")
 
 
-@cache
 def field06_corrections() -> dict[str, str | dict[str, str | bool] | None]:
     """Map of invalid entry numbers found and manual overrides"""
-    return read_yaml_data("field06_corrections")
+    return correction_table("field06_corrections")
 
 
-@cache
 def field07_corrections() -> dict[str, str | dict[str, str | bool] | None]:
     """Map of entry numbers and manual overrides"""
-    return read_yaml_data("field07_corrections")
+    return correction_table("field07_corrections")
 
 
-@cache
 def field08_corrections() -> dict[str, str | dict[str, str] | None]:
     """Map of editors and manual overrides"""
-    return read_yaml_data("field08_corrections")
+    return correction_table("field08_corrections")
 
 
-@cache
 def field09_corrections() -> dict[str, str | dict[str, str] | None]:
     """Map of editor places and manual overrides"""
-    return read_yaml_data("field09_corrections")
+    return correction_table("field09_corrections")
 
 
-@cache
 def field10_corrections() -> dict[str, str | None]:
     """Map of year and manual overrides"""
-    return read_yaml_data("field10_corrections")
+    return correction_table("field10_corrections")
 
 
-@cache
 def field11_corrections() -> dict[str, str | None]:
     """Map of pages and manual overrides"""
-    return read_yaml_data("field11_corrections")
+    return correction_table("field11_corrections")
 
 
-@cache
 def field16_corrections() -> dict[str, str | None]:
     """Map of curators and manual overrides"""
-    return read_yaml_data("field16_corrections")
+    return correction_table("field16_corrections")
 
 
-@cache
 def field17_corrections() -> dict[str, str | dict[str, str | bool | int] | None]:
     """Map of manual overrides"""
-    return read_yaml_data("field17_corrections")
+    return correction_table("field17_corrections")
 
 
-@cache
 def field18_corrections() -> dict[str, str | dict[str, str | bool | int] | None]:
     """Map of manual overrides"""
-    return read_yaml_data("field18_corrections")
+    return correction_table("field18_corrections")
 
 
-@cache
 def field19_corrections() -> dict[str, str | dict[str, str] | None]:
     """Map of manual overrides"""
-    return read_yaml_data("field19_corrections")
+    return correction_table("field19_corrections")
 
 
-@cache
 def field20_corrections() -> dict[str, str | dict[str, str | bool | int] | None]:
     """Map of manual overrides"""
-    return read_yaml_data("field20_corrections")
+    return correction_table("field20_corrections")
 
 
-@cache
 def field30_corrections() -> dict[str, str | dict[str, str | bool | int] | None]:
     """Map of manual overrides"""
-    return read_yaml_data("field30_corrections")
+    return correction_table("field30_corrections")
 
 
-@cache
 def topic_replacements() -> dict[str, str | None]:
     """Map of topic name manual overrides"""
-    return read_yaml_data("topic_replacements")
+    return correction_table("topic_replacements")
 
 
-@cache
 def translator_corrections() -> dict[str, str]:
     """Map of translator names found and manual overrides"""
-    return read_yaml_data("translator_corrections")
+    return correction_table("translator_corrections")
+
+
+@cache
+def load_language_suffix_re() -> re.Pattern[str]:
+    """Compile the language codes once into a regular expression matching a space and a code at the end"""
+    codes = sorted(load_correction_table("language_codes"), key=len, reverse=True)
+    if not codes:
+        return re.compile(r"(?!)")
+    return re.compile(rf" ({'|'.join(re.escape(code) for code in codes)})\Z")
+
+
+def language_suffix_re() -> re.Pattern[str]:
+    """Regular expression of the language codes, whose use counts as reading all of them while lookups are recorded"""
+    if _lookup_recorder is not None:
+        _lookup_recorder.add(("language_codes", WHOLE_TABLE))
+    return load_language_suffix_re()
 
 
 dewey_re1 = [
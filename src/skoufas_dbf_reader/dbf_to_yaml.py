@@ -1,32 +1,105 @@
-"""Convert dbf files to human readable yaml"""
+"""Convert dbf files to human readable yaml, or to JSON Lines for streaming"""
 
 from __future__ import annotations
 
+import argparse
+import json
 import sys
+from collections.abc import Iterable, Iterator
+from typing import Any, TextIO
 
 import dbfread
 import yaml
 
+from skoufas_dbf_reader.conversion import convert_entry
 
-def convert_dbf_to_yaml(from_dbf_file: str, to_yaml_file: str):
-    """Convert dbf files to human readable yaml"""
-    entries: list[dict[int, str | int]] = []
+# libyaml emits the same bytes as the pure python emitter for these documents, only faster
+YamlDumper = getattr(yaml, "CDumper", yaml.Dumper)
+
+PROGRESS_EVERY = 1000
+
+
+def entry_from_dbf_record(count: int, record: dict[str, str]) -> dict[int, str | int]:
+    """Turn a dbfread record into an entry keyed by column number, column 0 being the 1-based record number"""
+    entry: dict[int, str | int] = {}
+    entry[0] = count + 1
+    for name, value in record.items():
+        if not value:
+            continue
+        idx = int(name.replace("A", ""))
+        entry[idx] = value
+    return entry
+
+
+def iter_dbf_entries(from_dbf_file: str) -> Iterator[dict[int, str | int]]:
+    """Stream the entries of a dbf file one record at a time"""
     with dbfread.DBF(filename=from_dbf_file, encoding="CP737") as dbf:
         count: int
         record: dict[str, str]
         for count, record in enumerate(dbf):
-            entry: dict[int, str | int] = {}
-            entry[0] = count + 1
-            for name, value in record.items():
-                if not value:
-                    continue
-                idx = int(name.replace("A", ""))
-                entry[idx] = value
-            entries.append(entry)
-
-    data = {"entries": entries}
+            yield entry_from_dbf_record(count, record)
+
+
+def write_entries_yaml(
+    entries: Iterable[dict[int, str | int]], outfile: TextIO, progress_every: int = PROGRESS_EVERY
+) -> int:
+    """Write entries in the entries.yml layout one record at a time, return the number of records written.
+
+    The output is identical to dumping {"entries": [...]} in one go, since a block sequence
+    nested in a mapping is not indented
+    """
+    count = 0
+    for entry in entries:
+        if count == 0:
+            outfile.write("entries:\n")
+        outfile.write(yaml.dump([entry], Dumper=YamlDumper, default_flow_style=False, allow_unicode=True))
+        count += 1
+        if progress_every and count % progress_every == 0:
+            print(f"Converted {count} records", file=sys.stderr)
+    if count == 0:
+        outfile.write("entries: []\n")
+    return count
+
+
+def convert_dbf_to_yaml(from_dbf_file: str, to_yaml_file: str):
+    """Convert dbf files to human readable yaml"""
     with open(to_yaml_file, "w", encoding="utf-8") as outfile:
-        yaml.dump(data, outfile, default_flow_style=False, allow_unicode=True)
+        count = write_entries_yaml(iter_dbf_entries(from_dbf_file), outfile)
+    print(f"Converted {count} records to {to_yaml_file}", file=sys.stderr)
+
+
+def write_entries_jsonl(
+    entries: Iterable[dict[Any, Any]], outfile: TextIO, progress_every: int = PROGRESS_EVERY
+) -> int:
+    """Write one json object per line, return the number of records written.
+
+    Json keys are strings, so the column numbers are written as "0", "1"... and read back as integers by
+    utilities.iter_jsonl_entries
+    """
+    count = 0
+    for entry in entries:
+        outfile.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+        outfile.write("\n")
+        count += 1
+        if progress_every and count % progress_every == 0:
+            print(f"Converted {count} records", file=sys.stderr)
+    return count
+
+
+def iter_converted_dbf_entries(from_dbf_file: str) -> Iterator[dict[str, Any]]:
+    """Stream the entries of a dbf file converted one at a time, in the converted_entries.yml layout"""
+    for entry in iter_dbf_entries(from_dbf_file):
+        padded = dict.fromkeys(range(31))
+        padded.update(entry)
+        yield convert_entry(padded).as_dict()
+
+
+def convert_dbf_to_jsonl(from_dbf_file: str, to_jsonl_file: str, converted: bool = False):
+    """Convert a dbf file to JSON Lines, one entry or one converted entry per line"""
+    entries = iter_converted_dbf_entries(from_dbf_file) if converted else iter_dbf_entries(from_dbf_file)
+    with open(to_jsonl_file, "w", encoding="utf-8") as outfile:
+        count = write_entries_jsonl(entries, outfile)
+    print(f"Converted {count} records to {to_jsonl_file}", file=sys.stderr)
 
 
 def main():
@@ -34,5 +107,19 @@ def main():
     convert_dbf_to_yaml(sys.argv[1], sys.argv[2])
 
 
+def jsonl_main():
+    """Convert a dbf file to JSON Lines"""
+    parser = argparse.ArgumentParser(description="Convert a dbf file to JSON Lines, one entry per line")
+    parser.add_argument("dbf_file", help="DBF file to read")
+    parser.add_argument("jsonl_file", help="JSON Lines file to write")
+    parser.add_argument(
+        "--converted",
+        action="store_true",
+        help="Write the converted entries, in the converted_entries.yml layout, instead of the raw columns",
+    )
+    args = parser.parse_args()
+    convert_dbf_to_jsonl(args.dbf_file, args.jsonl_file, args.converted)
+
+
 if __name__ == "__main__":
     main()
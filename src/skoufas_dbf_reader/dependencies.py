@@ -0,0 +1,136 @@
+"""Track which correction table keys each entry looks up, to find what an edit of a correction file affects"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from skoufas_dbf_reader.conversion import FIELD_SPECS
+from skoufas_dbf_reader.correction_data import CORRECTION_TABLES, WHOLE_TABLE, load_correction_table, record_lookups
+from skoufas_dbf_reader.generate_reports import REPORT_CORRECTION_TABLES, REPORT_FIELDS
+from skoufas_dbf_reader.utilities import entries_catalogue, load_yaml_file
+
+# A correction table name and a key looked up in it, WHOLE_TABLE if the whole table was read
+LookupKey = tuple[str, str | None]
+
+_MISSING = object()
+
+
+def trace_entry(entry: Mapping[int, Any]) -> dict[str, set[LookupKey]]:
+    """Run every extractor on an entry, return the correction keys each field looked up"""
+    traced: dict[str, set[LookupKey]] = {}
+    for spec in FIELD_SPECS:
+        with record_lookups() as recorded:
+            spec.extract(entry)
+        traced[spec.name] = recorded
+    return traced
+
+
+@dataclass
+class DependencyGraph:
+    """Which fields of which entries looked up each correction key"""
+
+    lookups: dict[LookupKey, dict[int, set[str]]] = field(default_factory=dict)
+
+    def add_entry(self, dbase_number: int, traced: dict[str, set[LookupKey]]):
+        """Record the lookups of an entry as returned by trace_entry"""
+        for name, keys in traced.items():
+            for key in keys:
+                self.lookups.setdefault(key, {}).setdefault(dbase_number, set()).add(name)
+
+    def affected_entries(self, changed: Iterable[LookupKey]) -> dict[int, set[str]]:
+        """Fields to recompute for each entry, given the correction keys that changed"""
+        affected: dict[int, set[str]] = {}
+        keys = set(changed)
+        keys.update((code, WHOLE_TABLE) for code, _ in list(keys))
+        for key in keys:
+            for dbase_number, names in self.lookups.get(key, {}).items():
+                affected.setdefault(dbase_number, set()).update(names)
+        return affected
+
+    def to_json(self) -> list[Any]:
+        """Serializable form of the graph"""
+        return [
+            [code, key, [[dbase_number, sorted(names)] for dbase_number, names in sorted(entries.items())]]
+            for (code, key), entries in self.lookups.items()
+        ]
+
+    @classmethod
+    def from_json(cls, data: list[Any]) -> DependencyGraph:
+        """Rebuild a graph from the output of to_json"""
+        return cls(
+            {(code, key): {dbase_number: set(names) for dbase_number, names in entries} for code, key, entries in data}
+        )
+
+    def save(self, path: str):
+        """Store the graph in a json file"""
+        with open(path, "w", encoding="utf-8") as outfile:
+            json.dump(self.to_json(), outfile, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> DependencyGraph:
+        """Read a graph stored by save"""
+        with open(path, encoding="utf-8") as stream:
+            return cls.from_json(json.load(stream))
+
+
+def build_dependency_graph(entries: Iterable[Mapping[int, Any]] | None = None) -> DependencyGraph:
+    """Trace every entry, by default all entries of the catalogue"""
+    graph = DependencyGraph()
+    for entry in entries_catalogue() if entries is None else entries:
+        graph.add_entry(entry[0], trace_entry(entry))
+    return graph
+
+
+def changed_keys(code: str, old: dict[str, Any], new: dict[str, Any]) -> set[LookupKey]:
+    """Keys added, removed or changed between two versions of a correction table"""
+    return {(code, key) for key in set(old) | set(new) if old.get(key, _MISSING) != new.get(key, _MISSING)}
+
+
+def affected_reports(affected_fields: Iterable[str], changed_tables: Iterable[str]) -> list[str]:
+    """Reports that have to be created again when the given fields or correction tables change"""
+    fields = set(affected_fields)
+    tables = set(changed_tables)
+    reports = {name for name, read_fields in REPORT_FIELDS.items() if fields & read_fields}
+    reports.update(name for name, read_tables in REPORT_CORRECTION_TABLES.items() if tables & read_tables)
+    return sorted(reports)
+
+
+def main():
+    """Print the entries and reports affected by editing a correction file"""
+    parser = argparse.ArgumentParser(
+        description="List the entries and reports affected by the edit of a correction file, "
+        "comparing a previous version of the file with the current one"
+    )
+    parser.add_argument("previous_file", help="Previous version of a correction file, e.g. field17_corrections.yml")
+    parser.add_argument(
+        "--graph",
+        help="Json file holding the dependency graph, created from the whole catalogue if it does not exist",
+    )
+    args = parser.parse_args()
+
+    code = os.path.splitext(os.path.basename(args.previous_file))[0]
+    if code not in CORRECTION_TABLES:
+        raise Exception(f"Unknown correction file [{args.previous_file}]")
+    if args.graph and os.path.exists(args.graph):
+        graph = DependencyGraph.load(args.graph)
+    else:
+        graph = build_dependency_graph()
+        if args.graph:
+            graph.save(args.graph)
+
+    changed = changed_keys(code, load_yaml_file(args.previous_file)[code] or {}, load_correction_table(code))
+    affected = graph.affected_entries(changed)
+    fields = set().union(*affected.values())
+    print(f"Changed keys in {code}: {len(changed)}")
+    print(f"Affected entries: {' '.join(str(dbase_number) for dbase_number in sorted(affected))}")
+    print(f"Affected fields: {' '.join(sorted(fields))}")
+    print(f"Affected reports: {' '.join(affected_reports(fields, [code]))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Records of the same book entered more than once, found by ISBN, by signature and by MinHash of the signature.
+
+The signature of a record is its folded title and subtitle, its set of authors and its edition year. Records with
+the same ISBN or the same signature are grouped through hash tables. Records with nearly the same title, an author
+in common and no conflicting edition year are found through MinHash locality sensitive hashing: the minimum hashes
+of the trigrams of the title are split in bands, and only records sharing all the hashes of a band are compared
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from functools import cache
+
+from skoufas_dbf_reader.conversion import ConvertedEntry, iter_converted_entries
+from skoufas_dbf_reader.search_index import words
+
+# MinHash signatures are split in MINHASH_BANDS bands of MINHASH_ROWS hashes. Records sharing a band are
+# compared, which makes pairs with a trigram Jaccard similarity above about 0.6 likely candidates, and
+# a single typo in a title almost certain to be compared
+MINHASH_BANDS = 8
+MINHASH_ROWS = 4
+
+# Least share of equal minimum hashes of the records proposed as nearly the same
+NEAR_DUPLICATE_THRESHOLD = 0.7
+
+# Each trigram is hashed once to a 64 byte digest, read as the MINHASH_BANDS * MINHASH_ROWS 16 bit hashes of the
+# MinHash signature
+MINHASH_DIGEST_SIZE = 2 * MINHASH_BANDS * MINHASH_ROWS
+
+# Reasons of a group of duplicates
+SAME_ISBN = "isbn"
+SAME_SIGNATURE = "signature"
+SIMILAR_SIGNATURE = "similar"
+
+
+@dataclasses.dataclass
+class DuplicateGroup:
+    """Dbase numbers of records that may be the same book, and why"""
+
+    dbase_numbers: list[int]
+    reasons: list[str]
+
+
+def normalize_isbn(isbn: str | None) -> str | None:
+    """ISBN without separators, ISBN-10 turned to ISBN-13 so that both forms of a book are equal"""
+    if not isbn:
+        return None
+    normalized = re.sub(r"[\s-]+", "", isbn).upper()
+    if re.fullmatch(r"\d{9}[\dX]", normalized):
+        digits = "978" + normalized[:9]
+        check = -sum(int(digit) * (3 if i % 2 else 1) for i, digit in enumerate(digits)) % 10
+        normalized = f"{digits}{check}"
+    return normalized or None
+
+
+def title_words(converted: ConvertedEntry) -> list[str]:
+    """Folded words of the title and the subtitle"""
+    return words(converted.title) + words(converted.subtitle)
+
+
+def author_set(converted: ConvertedEntry) -> frozenset[str]:
+    """Authors with their names folded"""
+    return frozenset(" ".join(words(author)) for author in converted.authors)
+
+
+def signature(converted: ConvertedEntry) -> tuple[str, tuple[str, ...], int | None] | None:
+    """Folded title and subtitle, authors and edition year, None for records without a title"""
+    title = " ".join(title_words(converted))
+    if not title:
+        return None
+    return title, tuple(sorted(author_set(converted))), converted.edition_year
+
+
+@cache
+def _trigram_hashes(trigram: str) -> list[int]:
+    digest = hashlib.blake2b(trigram.encode("utf-8"), digest_size=MINHASH_DIGEST_SIZE).digest()
+    return memoryview(digest).cast("H").tolist()
+
+
+def minhash(converted: ConvertedEntry) -> tuple[int, ...] | None:
+    """Minimum hashes of the letter trigrams of the title and subtitle, None without a title"""
+    title = " ".join(title_words(converted))
+    if not title:
+        return None
+    return tuple(map(min, zip(*(_trigram_hashes(title[i : i + 3]) for i in range(max(len(title) - 2, 1))))))
+
+
+def find_duplicate_books(catalog: Iterable[ConvertedEntry] | None = None) -> list[DuplicateGroup]:
+    """Groups of records that may be the same book, by their first dbase number"""
+    dbase_numbers: list[int] = []
+    years: list[int | None] = []
+    authors: list[frozenset[str]] = []
+    minhashes: list[tuple[int, ...]] = []
+    by_isbn: defaultdict[str, list[int]] = defaultdict(list)
+    by_signature: defaultdict[tuple[str, tuple[str, ...], int | None], list[int]] = defaultdict(list)
+    by_band: defaultdict[tuple[int, tuple[int, ...]], list[int]] = defaultdict(list)
+    for row, converted in enumerate(iter_converted_entries() if catalog is None else catalog):
+        dbase_numbers.append(converted.dbase_number)
+        years.append(converted.edition_year)
+        authors.append(author_set(converted))
+        isbn = normalize_isbn(converted.isbn_issn_ean)
+        if isbn:
+            by_isbn[isbn].append(row)
+        record_signature = signature(converted)
+        if record_signature:
+            by_signature[record_signature].append(row)
+        record_minhash = minhash(converted)
+        minhashes.append(record_minhash or ())
+        if record_minhash:
+            for band in range(MINHASH_BANDS):
+                by_band[band, record_minhash[band * MINHASH_ROWS : (band + 1) * MINHASH_ROWS]].append(row)
+
+    parents = list(range(len(dbase_numbers)))
+    reasons: defaultdict[int, set[str]] = defaultdict(set)
+
+    def root(row: int) -> int:
+        while parents[row] != row:
+            parents[row] = parents[parents[row]]
+            row = parents[row]
+        return row
+
+    def join(first: int, second: int, reason: str):
+        first, second = root(first), root(second)
+        if first != second:
+            parents[second] = first
+            reasons[first] |= reasons.pop(second, set())
+        reasons[first].add(reason)
+
+    for reason, groups in ((SAME_ISBN, by_isbn.values()), (SAME_SIGNATURE, by_signature.values())):
+        for rows in groups:
+            for row in rows[1:]:
+                join(rows[0], row, reason)
+    hash_count = MINHASH_BANDS * MINHASH_ROWS
+    for rows in by_band.values():
+        for position, first in enumerate(rows):
+            for second in rows[position + 1 :]:
+                if root(first) == root(second):
+                    continue
+                if years[first] and years[second] and years[first] != years[second]:
+                    continue
+                if authors[first] and authors[second] and not authors[first] & authors[second]:
+                    continue
+                equal = sum(x == y for x, y in zip(minhashes[first], minhashes[second]))
+                if equal >= NEAR_DUPLICATE_THRESHOLD * hash_count:
+                    join(first, second, SIMILAR_SIGNATURE)
+
+    members: defaultdict[int, list[int]] = defaultdict(list)
+    for row in range(len(dbase_numbers)):
+        members[root(row)].append(row)
+    groups = [
+        DuplicateGroup(
+            [dbase_numbers[row] for row in rows],
+            [reason for reason in (SAME_ISBN, SAME_SIGNATURE, SIMILAR_SIGNATURE) if reason in reasons[group_root]],
+        )
+        for group_root, rows in members.items()
+        if len(rows) > 1
+    ]
+    groups.sort(key=lambda group: group.dbase_numbers[0])
+    return groups
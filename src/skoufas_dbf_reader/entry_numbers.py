@@ -0,0 +1,141 @@
+"""The dbase numbers of the entries by entry number (αριθμός εισαγωγής), for lookups, range queries and checks"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+from collections.abc import Iterable
+from functools import cache
+
+from skoufas_dbf_reader.conversion import ConvertedEntry, iter_converted_entries
+from skoufas_dbf_reader.correction_data import on_correction_data_reload
+
+# Bump when the layout of the saved index changes
+INDEX_FORMAT = 2
+
+# Latin capitals typed for the Greek ones that follow the numbers, as in 11921Α
+_latin_to_greek = str.maketrans("ABEZHIKMNOPTYX", "ΑΒΕΖΗΙΚΜΝΟΡΤΥΧ")
+
+
+def normalize_entry_number(entry_number: str) -> str:
+    """Entry number stripped and in Greek capitals, numeric ones without leading zeros"""
+    normalized = entry_number.strip().upper().translate(_latin_to_greek)
+    if normalized.isdecimal():
+        return str(int(normalized))
+    return normalized
+
+
+class EntryNumberIndex:
+    """Dbase numbers of the entries holding each normalized entry number, in catalogue order.
+
+    The entry numbers as found in the entries are kept next to their dbase numbers, for the checks
+    that point to the values to correct
+    """
+
+    def __init__(self, occurrences: dict[str, list[tuple[int, str]]], no_entry_numbers: list[int]):
+        self.occurrences = occurrences
+        self.dbase_numbers = {
+            number: [dbase_number for dbase_number, _ in found] for number, found in occurrences.items()
+        }
+        self.no_entry_numbers = no_entry_numbers
+        self._numeric: list[tuple[int, str]] | None = None
+
+    @classmethod
+    def from_catalog(cls, catalog: Iterable[ConvertedEntry]) -> EntryNumberIndex:
+        """Index the entry numbers of converted entries"""
+        occurrences: dict[str, list[tuple[int, str]]] = {}
+        no_entry_numbers: list[int] = []
+        for converted in catalog:
+            if not converted.entry_numbers:
+                no_entry_numbers.append(converted.dbase_number)
+            for entry_number in converted.entry_numbers:
+                occurrences.setdefault(normalize_entry_number(entry_number), []).append(
+                    (converted.dbase_number, entry_number)
+                )
+        return cls(occurrences, no_entry_numbers)
+
+    def __len__(self) -> int:
+        return len(self.dbase_numbers)
+
+    def __contains__(self, entry_number: object) -> bool:
+        return isinstance(entry_number, str) and normalize_entry_number(entry_number) in self.dbase_numbers
+
+    def lookup(self, entry_number: str) -> list[int]:
+        """Dbase numbers of the entries with an entry number, empty if there are none"""
+        return list(self.dbase_numbers.get(normalize_entry_number(entry_number), ()))
+
+    def duplicates(self) -> dict[str, list[tuple[int, str]]]:
+        """Dbase numbers and entry numbers as found of the entry numbers held more than once"""
+        return {number: found for number, found in self.occurrences.items() if len(found) > 1}
+
+    def non_numeric(self) -> dict[str, list[tuple[int, str]]]:
+        """Dbase numbers and entry numbers as found of the entry numbers with letters or symbols"""
+        return {number: found for number, found in self.occurrences.items() if not number.isdecimal()}
+
+    def numeric_range(self, low: int, high: int) -> dict[str, list[int]]:
+        """Numeric entry numbers from low to high inclusive, in numeric order"""
+        if self._numeric is None:
+            self._numeric = sorted((int(number), number) for number in self.dbase_numbers if number.isdecimal())
+        start = bisect.bisect_left(self._numeric, (low, ""))
+        stop = bisect.bisect_left(self._numeric, (high + 1, ""))
+        return {number: list(self.dbase_numbers[number]) for _, number in self._numeric[start:stop]}
+
+    def save(self, path: str):
+        """Write the index as json"""
+        with open(path, "w", encoding="utf-8") as outfile:
+            json.dump(self.as_dict(), outfile, ensure_ascii=False)
+
+    def as_dict(self) -> dict[str, object]:
+        """The index as json serializable values"""
+        return {
+            "format": INDEX_FORMAT,
+            "entry_numbers": self.occurrences,
+            "no_entry_numbers": self.no_entry_numbers,
+        }
+
+    @classmethod
+    def load(cls, path: str) -> EntryNumberIndex:
+        """Read an index written by save"""
+        with open(path, encoding="utf-8") as stream:
+            saved = json.load(stream)
+        if not isinstance(saved, dict) or saved.get("format") != INDEX_FORMAT:
+            raise Exception(f"Not an entry number index of format {INDEX_FORMAT} [{path}]")
+        occurrences = {
+            number: [(dbase_number, entry_number) for dbase_number, entry_number in found]
+            for number, found in saved["entry_numbers"].items()
+        }
+        return cls(occurrences, saved["no_entry_numbers"])
+
+
+@cache
+def entry_number_index() -> EntryNumberIndex:
+    """Index of the entry numbers of the whole catalogue, built on first use"""
+    return EntryNumberIndex.from_catalog(iter_converted_entries())
+
+
+# The entry numbers depend on the correction tables
+on_correction_data_reload(entry_number_index.cache_clear)
+
+
+def main():
+    """Look up entries by entry number"""
+    parser = argparse.ArgumentParser(description="Find the dbase numbers of the entries with given entry numbers")
+    parser.add_argument("entry_numbers", nargs="*", help="Entry numbers to look up, 11921Α and 11921A are the same")
+    parser.add_argument("--index", help="Read the index from a json file written by --save instead of the catalogue")
+    parser.add_argument("--save", metavar="JSON_FILE", help="Write the index of the catalogue to a json file")
+    parser.add_argument("--range", nargs=2, type=int, metavar=("LOW", "HIGH"), help="Print numeric entry numbers")
+    args = parser.parse_args()
+    index = EntryNumberIndex.load(args.index) if args.index else entry_number_index()
+    if args.save:
+        index.save(args.save)
+        print(f"Wrote {len(index)} entry numbers to {args.save}")
+    found = {normalize_entry_number(number): index.lookup(number) for number in args.entry_numbers}
+    if args.range:
+        found.update(index.numeric_range(*args.range))
+    for entry_number, dbase_numbers in found.items():
+        print(f"{entry_number}: {', '.join(str(dbase_number) for dbase_number in dbase_numbers) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
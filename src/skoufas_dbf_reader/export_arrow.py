@@ -0,0 +1,117 @@
+"""Export the raw and the converted entries as Parquet or Arrow IPC files, for pandas and other columnar tools.
+
+Needs pyarrow, installed with the arrow extra: pip install skoufas-dbf-reader[arrow]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from collections.abc import Iterable
+from typing import Any
+
+from skoufas_dbf_reader.catalogue import COLUMN_COUNT, Catalogue
+from skoufas_dbf_reader.conversion import ConvertedEntry, converted_catalog
+from skoufas_dbf_reader.utilities import entries_catalogue
+
+# Columns of converted_entries.yml, original_entry aside since the raw entries are exported on their own
+CONVERTED_STRING_COLUMNS = (
+    "language",
+    "title",
+    "subtitle",
+    "dewey",
+    "edition",
+    "editor",
+    "curator",
+    "volume",
+    "material",
+    "notes",
+    "isbn",
+    "issn",
+    "ean",
+)
+CONVERTED_LIST_COLUMNS = ("authors", "entry_numbers", "translators", "topics", "donors")
+CONVERTED_INTEGER_COLUMNS = ("dbase_number", "edition_year", "pages", "copies")
+CONVERTED_BOOLEAN_COLUMNS = ("has_cd", "has_dvd", "offprint")
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+    except ImportError as ex:
+        raise Exception("Exporting to Parquet or Arrow needs pyarrow, install skoufas-dbf-reader[arrow]") from ex
+    return pyarrow
+
+
+def _string_array(pa: Any, values: list[Any]) -> Any:
+    return pa.array([None if value is None else str(value) for value in values], type=pa.string()).dictionary_encode()
+
+
+def raw_table(catalogue: Catalogue) -> Any:
+    """The entries as a table with the dbase number and the A01 to A30 columns, dictionary encoded"""
+    pa = _pyarrow()
+    columns = {"dbase_number": pa.array(catalogue.column(0), type=pa.int64())}
+    for i in range(1, COLUMN_COUNT):
+        columns[f"A{i:02}"] = _string_array(pa, catalogue.column(i))
+    return pa.table(columns)
+
+
+def converted_table(catalog: Iterable[ConvertedEntry]) -> Any:
+    """The converted entries as a table with the columns of converted_entries.yml, lists as list columns"""
+    pa = _pyarrow()
+    rows = [converted.as_dict() for converted in catalog]
+    columns: dict[str, Any] = {}
+    for name in CONVERTED_INTEGER_COLUMNS:
+        columns[name] = pa.array([row.get(name) for row in rows], type=pa.int64())
+    for name in CONVERTED_LIST_COLUMNS:
+        columns[name] = pa.array([row.get(name) or [] for row in rows], type=pa.list_(pa.string()))
+    for name in CONVERTED_STRING_COLUMNS:
+        columns[name] = _string_array(pa, [row.get(name) for row in rows])
+    for name in CONVERTED_BOOLEAN_COLUMNS:
+        columns[name] = pa.array([row[name] for row in rows], type=pa.bool_())
+    return pa.table(columns)
+
+
+def write_table(table: Any, path: str, file_format: str):
+    """Write a table as a Parquet file or an Arrow IPC (feather version 2) file"""
+    if file_format == "parquet":
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+
+        pyarrow.parquet.write_table(table, path)
+    elif file_format == "arrow":
+        import pyarrow.feather  # pylint: disable=import-outside-toplevel
+
+        pyarrow.feather.write_feather(table, path)
+    else:
+        raise Exception(f"Unknown format [{file_format}]")
+
+
+def export_arrow(output_directory: str, file_format: str = "parquet") -> list[str]:
+    """Write entries and converted_entries files to the output directory, return their paths"""
+    _pyarrow()
+    os.makedirs(output_directory, exist_ok=True)
+    written = []
+    for name, table in (
+        ("entries", raw_table(entries_catalogue())),
+        ("converted_entries", converted_table(converted_catalog())),
+    ):
+        path = os.path.join(output_directory, f"{name}{FORMATS[file_format]}")
+        write_table(table, path, file_format)
+        written.append(path)
+    return written
+
+
+def main():
+    """Export the raw and the converted entries as Parquet or Arrow files"""
+    parser = argparse.ArgumentParser(description="Export the raw and the converted entries for columnar tools")
+    parser.add_argument("output_directory", help="Directory where entries and converted_entries files are written")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="parquet", help="File format, parquet by default")
+    args = parser.parse_args()
+    for path in export_arrow(args.output_directory, args.format):
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
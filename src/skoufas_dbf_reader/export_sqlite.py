@@ -0,0 +1,230 @@
+"""Export the converted entries to a SQLite database, in the tables described in the README"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+from skoufas_dbf_reader.conversion import ConvertedEntry, converted_catalog
+
+SCHEMA = """
+CREATE TABLE Editor (
+    Id INTEGER PRIMARY KEY,
+    Name TEXT,
+    Place TEXT,
+    UNIQUE (Name, Place)
+);
+CREATE TABLE BookEntry (
+    Id INTEGER PRIMARY KEY,
+    Title TEXT,
+    Subtitle TEXT,
+    Language TEXT,
+    Dewey TEXT,
+    Edition TEXT,
+    EditionDate INTEGER,
+    EditorId INTEGER REFERENCES Editor (Id),
+    Pages INTEGER,
+    Volumes TEXT,
+    Notes TEXT,
+    Material TEXT,
+    HasCD INTEGER NOT NULL,
+    HasDVD INTEGER NOT NULL,
+    ISBN TEXT,
+    ISSN TEXT,
+    EAN TEXT,
+    Offprint INTEGER NOT NULL
+);
+CREATE TABLE Author (
+    Id INTEGER PRIMARY KEY,
+    Name TEXT,
+    Surname TEXT NOT NULL,
+    Middlename TEXT,
+    Fullname TEXT NOT NULL UNIQUE
+);
+CREATE TABLE Authorship (
+    AuthorId INTEGER NOT NULL REFERENCES Author (Id),
+    BookEntryId INTEGER NOT NULL REFERENCES BookEntry (Id),
+    PRIMARY KEY (BookEntryId, AuthorId)
+);
+CREATE TABLE Translator (
+    Id INTEGER PRIMARY KEY,
+    Name TEXT,
+    Surname TEXT NOT NULL,
+    Middlename TEXT,
+    Fullname TEXT NOT NULL UNIQUE
+);
+CREATE TABLE Translation (
+    TranslatorId INTEGER NOT NULL REFERENCES Translator (Id),
+    BookEntryId INTEGER NOT NULL REFERENCES BookEntry (Id),
+    PRIMARY KEY (BookEntryId, TranslatorId)
+);
+CREATE TABLE Curator (
+    Id INTEGER PRIMARY KEY,
+    Name TEXT,
+    Surname TEXT NOT NULL,
+    Middlename TEXT,
+    Fullname TEXT NOT NULL UNIQUE
+);
+CREATE TABLE Curation (
+    CuratorId INTEGER NOT NULL REFERENCES Curator (Id),
+    BookEntryId INTEGER NOT NULL REFERENCES BookEntry (Id),
+    PRIMARY KEY (BookEntryId, CuratorId)
+);
+CREATE TABLE EntryNumber (
+    Id INTEGER PRIMARY KEY,
+    EntryNumber TEXT NOT NULL,
+    BookEntryId INTEGER NOT NULL REFERENCES BookEntry (Id),
+    Copies INTEGER
+);
+CREATE TABLE Topic (
+    Id INTEGER PRIMARY KEY,
+    Name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE BookInTopic (
+    TopicId INTEGER NOT NULL REFERENCES Topic (Id),
+    BookEntryId INTEGER NOT NULL REFERENCES BookEntry (Id),
+    PRIMARY KEY (BookEntryId, TopicId)
+);
+CREATE TABLE Donor (
+    Id INTEGER PRIMARY KEY,
+    Name TEXT,
+    Surname TEXT NOT NULL,
+    Middlename TEXT,
+    Fullname TEXT NOT NULL UNIQUE
+);
+CREATE TABLE Donation (
+    DonorId INTEGER NOT NULL REFERENCES Donor (Id),
+    EntryNumberId INTEGER NOT NULL REFERENCES EntryNumber (Id),
+    PRIMARY KEY (EntryNumberId, DonorId)
+);
+"""
+
+# Created after the rows are loaded, which is faster than updating them on every insert.
+# Entry numbers are not unique, the catalogue has duplicates that report_entry_numbers lists
+INDEXES = (
+    "CREATE INDEX EntryNumber_EntryNumber ON EntryNumber (EntryNumber)",
+    "CREATE INDEX EntryNumber_BookEntryId ON EntryNumber (BookEntryId)",
+    "CREATE INDEX BookEntry_Dewey ON BookEntry (Dewey)",
+    "CREATE INDEX BookEntry_ISBN ON BookEntry (ISBN)",
+    "CREATE INDEX Author_Surname ON Author (Surname)",
+    "CREATE INDEX Authorship_AuthorId ON Authorship (AuthorId)",
+    "CREATE INDEX Translation_TranslatorId ON Translation (TranslatorId)",
+    "CREATE INDEX BookInTopic_TopicId ON BookInTopic (TopicId)",
+    "CREATE INDEX Donation_DonorId ON Donation (DonorId)",
+)
+
+
+def _id(ids: dict[Any, int], key: Hashable) -> int:
+    return ids.setdefault(key, len(ids) + 1)
+
+
+def person_row(person_id: int, fullname: str) -> tuple[int, str | None, str, None, str]:
+    """Id, name, surname, middle name and full name of a person written as SURNAME,NAME"""
+    surname, _, name = fullname.partition(",")
+    return person_id, name.strip() or None, surname.strip(), None, fullname
+
+
+def export_sqlite(path: str, catalog: Iterable[ConvertedEntry] | None = None) -> int:
+    """Write the converted entries, by default the whole catalogue, to a new SQLite database.
+
+    Everything is loaded in a single transaction into a temporary file that then replaces path,
+    so readers of an older export never see a partial one. Returns the number of entries written
+    """
+    editors: dict[Any, int] = {}
+    authors: dict[Any, int] = {}
+    translators: dict[Any, int] = {}
+    curators: dict[Any, int] = {}
+    topics: dict[Any, int] = {}
+    donors: dict[Any, int] = {}
+    book_entries: list[tuple[object, ...]] = []
+    authorships: list[tuple[int, int]] = []
+    translations: list[tuple[int, int]] = []
+    curations: list[tuple[int, int]] = []
+    entry_numbers: list[tuple[int, str, int, int | None]] = []
+    books_in_topics: list[tuple[int, int]] = []
+    donations: list[tuple[int, int]] = []
+    for converted in converted_catalog() if catalog is None else catalog:
+        book_entry_id = converted.dbase_number
+        book_entries.append(
+            (
+                book_entry_id,
+                converted.title,
+                converted.subtitle,
+                converted.language,
+                converted.dewey,
+                converted.edition,
+                converted.edition_year,
+                _id(editors, converted.editor) if converted.editor else None,
+                converted.pages,
+                converted.volume,
+                converted.notes,
+                converted.material,
+                converted.has_cd,
+                converted.has_dvd,
+                converted.isbn,
+                converted.issn,
+                converted.ean,
+                converted.offprint,
+            )
+        )
+        authorships.extend((_id(authors, author), book_entry_id) for author in dict.fromkeys(converted.authors))
+        translations.extend(
+            (_id(translators, translator), book_entry_id) for translator in dict.fromkeys(converted.translators)
+        )
+        if converted.curator:
+            curations.append((_id(curators, converted.curator), book_entry_id))
+        books_in_topics.extend((_id(topics, topic), book_entry_id) for topic in dict.fromkeys(converted.topics))
+        for entry_number in converted.entry_numbers:
+            entry_number_id = len(entry_numbers) + 1
+            entry_numbers.append((entry_number_id, entry_number, book_entry_id, converted.copies))
+            donations.extend((_id(donors, donor), entry_number_id) for donor in dict.fromkeys(converted.donors))
+
+    temporary_path = f"{path}.tmp"
+    if os.path.exists(temporary_path):
+        os.remove(temporary_path)
+    connection = sqlite3.connect(temporary_path)
+    try:
+        connection.executescript(SCHEMA)
+        with connection:
+            connection.executemany(
+                "INSERT INTO Editor VALUES (?, ?, ?)", [(i, name, place) for (name, place), i in editors.items()]
+            )
+            connection.executemany(
+                "INSERT INTO BookEntry VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", book_entries
+            )
+            for insert, people in (
+                ("INSERT INTO Author VALUES (?, ?, ?, ?, ?)", authors),
+                ("INSERT INTO Translator VALUES (?, ?, ?, ?, ?)", translators),
+                ("INSERT INTO Curator VALUES (?, ?, ?, ?, ?)", curators),
+                ("INSERT INTO Donor VALUES (?, ?, ?, ?, ?)", donors),
+            ):
+                connection.executemany(insert, [person_row(i, fullname) for fullname, i in people.items()])
+            connection.executemany("INSERT INTO Authorship VALUES (?, ?)", authorships)
+            connection.executemany("INSERT INTO Translation VALUES (?, ?)", translations)
+            connection.executemany("INSERT INTO Curation VALUES (?, ?)", curations)
+            connection.executemany("INSERT INTO EntryNumber VALUES (?, ?, ?, ?)", entry_numbers)
+            connection.executemany("INSERT INTO Topic VALUES (?, ?)", [(i, topic) for topic, i in topics.items()])
+            connection.executemany("INSERT INTO BookInTopic VALUES (?, ?)", books_in_topics)
+            connection.executemany("INSERT INTO Donation VALUES (?, ?)", donations)
+            for index in INDEXES:
+                connection.execute(index)
+    finally:
+        connection.close()
+    os.replace(temporary_path, path)
+    return len(book_entries)
+
+
+def main():
+    """Export the converted entries to a SQLite database"""
+    parser = argparse.ArgumentParser(description="Export the converted entries to an indexed SQLite database")
+    parser.add_argument("database_file", help="SQLite file to create, replaced if it exists")
+    args = parser.parse_args()
+    written = export_sqlite(args.database_file)
+    print(f"Wrote {written} entries to {args.database_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,29 +6,21 @@ import re
 from collections import OrderedDict
 
 from skoufas_dbf_reader.correction_data import (
+    FieldCorrection,
     a22_has_isbn_part_re,
     author_corrections,
     dewey_re1,
     dewey_re2,
     editor_corrections,
-    field04_corrections,
-    field05_corrections,
-    field06_corrections,
-    field07_corrections,
-    field08_corrections,
-    field09_corrections,
     field10_corrections,
     field11_corrections,
     field16_corrections,
-    field17_corrections,
-    field18_corrections,
-    field19_corrections,
-    field20_corrections,
-    field30_corrections,
+    field_corrections,
     has_author,
     has_cd_re,
     has_dvd_re,
     language_codes,
+    language_suffix_re,
     topic_in_paren_re,
     topic_replacements,
     translator_corrections,
@@ -39,30 +31,38 @@ from skoufas_dbf_reader.utilities import none_if_empty_or_stripped
 only_greek = re.compile(r"[Α-ΩΉα-ω0-9 &:;,'!<>ⁿ=$\[\]\+\\\-\(\)\.\"\/]+")
 
 
+def split_language_suffix(a01: str) -> tuple[str, str | None]:
+    """Split a language code off the end of A01, return the rest and the ISO language code"""
+    match = language_suffix_re().search(a01)
+    if not match:
+        return a01, None
+    return a01[: match.start()], language_codes()[match.group(1)]
+
+
 def has_language(a01: str | None) -> bool:
     """Check values for language at the end"""
     if not a01:
         return False
-    for code in language_codes().keys():
-        if a01.endswith(f" {code}"):
-            return True
-    return False
+    return language_suffix_re().search(a01) is not None
 
 
-def authors_from_a01(a01: str | None) -> list[str]:
-    """Get author from A01 DBF record"""
+def author_correction_key(a01: str | None) -> str | None:
+    """A01 as looked up in author_corrections, None without an author"""
     if not a01:
-        return []
+        return None
     if not has_author(a01):
+        return None
+    a01, _ = split_language_suffix(a01)
+    if a01.endswith(("  Ι", "  .")):
+        a01 = a01[:-2]
+    return a01.strip()
+
+
+def authors_from_a01(a01: str | None) -> list[str]:
+    """Get author from A01 DBF record"""
+    author = author_correction_key(a01)
+    if author is None:
         return []
-    strip_finals = list(language_codes().keys()) + [
-        " Ι",
-        " .",
-    ]
-    for final in strip_finals:
-        if a01.endswith(" " + final):
-            a01 = a01.replace(final, "")
-    author = a01.strip()
     author = author_corrections().get(author, author)
     if not author:
         return []
@@ -73,10 +73,9 @@ def language_from_a01_a02(a01: str | None, a02: str | None) -> str | None:
     """Check values for language at the end"""
     if not a01:
         return None
-    if has_language(a01):
-        for language, isolanguage in language_codes().items():
-            if a01.endswith(language):
-                return isolanguage
+    _, language = split_language_suffix(a01)
+    if language:
+        return language
     title = title_from_a02(a02)
     if title and only_greek.fullmatch(title):
         return "el"
@@ -97,14 +96,9 @@ def dewey_from_a04_a05(a04: str | None, a05: str | None) -> str | None:
     """Cleanup and replace known issues"""
     value4 = none_if_empty_or_stripped(a04)
     if value4:
-        correction = field04_corrections().get(value4, value4)
-        if correction:
-            if isinstance(correction, str):
-                value4 = none_if_empty_or_stripped(correction)
-            else:
-                value4 = None
-        else:
-            value4 = None
+        correction = field_corrections("field04_corrections").get(value4)
+        if correction is not None:
+            value4 = none_if_empty_or_stripped(correction.text)
 
     if value4:
         value4 = value4.replace("Χ. Σ.", "ΧΣ")
@@ -133,15 +127,10 @@ def dewey_from_a04_a05(a04: str | None, a05: str | None) -> str | None:
 
     value5 = none_if_empty_or_stripped(a05)
     if value5:
-        correction = field05_corrections().get(value5, value5)
-        if correction:
-            if isinstance(correction, dict):
-                value5 = correction.get("dewey", None)
-            else:
-                value5 = None
-        else:
-            value5 = None
-    if value5 and isinstance(value5, str):
+        # only the dewey of a correction is used
+        correction = field_corrections("field05_corrections").get(value5)
+        value5 = correction.dewey if correction is not None else None
+    if value5:
         for dewey_re in dewey_re1:
             dewey_match = dewey_re.fullmatch(value5)
             if dewey_match:
@@ -166,30 +155,22 @@ def entry_numbers_from_a04_a05_a06_a07_a08_a18_a19(
     """Cleanup, read additional numbers from a06"""
 
     def cleanup_single_value(
-        field_name: str,
         original_value: str | None,
-        corrections: (
-            dict[str, str | dict[str, str] | None]
-            | dict[str, str | dict[str, str | bool] | None]
-            | dict[str, str | dict[str, str | bool | int] | None]
-            | dict[str, str | dict[str, str] | dict[str, str | bool] | None]
-        ),
+        corrections: dict[str, FieldCorrection],
         ignore_if_not_in_correction: bool,
     ) -> str:
         output = none_if_empty_or_stripped(original_value)
         if output:
-            if output in corrections:
-                correction = corrections[output]
-                if correction is None:
-                    return ""
-                if isinstance(correction, str):
+            correction = corrections.get(output)
+            if correction is not None:
+                if correction.text is not None:
                     if ignore_if_not_in_correction:
                         return ""
-                    return "-" + str(correction)
-                output = dict(correction).get("series", "")
-                if not isinstance(output, str):
-                    raise Exception(f"Invalid correction for field {field_name} [{original_value}]")
-                if correction.get("use_dash", True):
+                    return "-" + correction.text
+                if not correction.is_mapping:
+                    return ""
+                output = correction.series or ""
+                if correction.use_dash:
                     return "-" + output
                 return output
             if ignore_if_not_in_correction:
@@ -197,13 +178,13 @@ def entry_numbers_from_a04_a05_a06_a07_a08_a18_a19(
             return output
         return ""
 
-    value4 = cleanup_single_value("A04", a04, field04_corrections(), True) + "-"
-    value5 = cleanup_single_value("A05", a05, field05_corrections(), False)
-    value6 = cleanup_single_value("A06", a06, field06_corrections(), True)
-    value7 = cleanup_single_value("A07", a07, field07_corrections(), True)
-    value8 = cleanup_single_value("A08", a08, field08_corrections(), True)
-    value18 = cleanup_single_value("A18", a18, field18_corrections(), True)
-    value19 = cleanup_single_value("A19", a19, field19_corrections(), True)
+    value4 = cleanup_single_value(a04, field_corrections("field04_corrections"), True) + "-"
+    value5 = cleanup_single_value(a05, field_corrections("field05_corrections"), False)
+    value6 = cleanup_single_value(a06, field_corrections("field06_corrections"), True)
+    value7 = cleanup_single_value(a07, field_corrections("field07_corrections"), True)
+    value8 = cleanup_single_value(a08, field_corrections("field08_corrections"), True)
+    value18 = cleanup_single_value(a18, field_corrections("field18_corrections"), True)
+    value19 = cleanup_single_value(a19, field_corrections("field19_corrections"), True)
 
     value = value4 + value5 + value6 + value7 + value8 + value18 + value19
     # Use a dict to remove duplicates
@@ -214,22 +195,25 @@ def entry_numbers_from_a04_a05_a06_a07_a08_a18_a19(
     return list(entries_dict)
 
 
-def translator_from_a06(a06: str | None) -> str | None:
-    """Cleanup, replace special cases"""
+def translator_correction_key(a06: str | None) -> str | None:
+    """A06 as looked up in translator_corrections, after field06_corrections"""
     value = none_if_empty_or_stripped(a06)
     if not value:
         return None
-    if value in field06_corrections():
-        correction = field06_corrections()[value]
-        if correction is None:
-            return None
-        if isinstance(correction, str):
-            return None
-        value = dict(correction).get("translator", None)
+    correction = field_corrections("field06_corrections").get(value)
+    if correction is not None:
+        # only the translator of a correction is used
+        value = correction.translator
         if not value:
             return None
-        if not isinstance(value, str):
-            raise Exception(f"Invalid correction for field A06 [{a06}]")
+    return value
+
+
+def translator_from_a06(a06: str | None) -> str | None:
+    """Cleanup, replace special cases"""
+    value = translator_correction_key(a06)
+    if not value:
+        return None
     value = translator_corrections().get(value, value)
     if not value:
         return None
@@ -241,58 +225,59 @@ def edition_from_a07(a07: str | None) -> str | None:
     value = none_if_empty_or_stripped(a07)
     if not value:
         return None
-    if value in field07_corrections():
-        value = field07_corrections().get(value)
-        if not isinstance(value, str):
-            return None
+    correction = field_corrections("field07_corrections").get(value)
+    if correction is not None:
+        value = correction.text
     if not value:
         return None
     return value
 
 
-def editor_from_a08_a09(a08: str | None, a09: str | None) -> tuple[str | None, str | None] | None:
-    """Cleanup, replace special cases"""
+def editor_before_corrections(a08: str | None, a09: str | None) -> tuple[str | None, str | None] | None:
+    """Editor and place after field08_corrections and field09_corrections, before editor_corrections"""
     a08 = none_if_empty_or_stripped(a08)
     if not a08:
         a08 = None
     else:
-        if a08 in field08_corrections():
-            correction = field08_corrections().get(a08)
-            if not correction:
-                a08 = None
-            elif isinstance(correction, dict):
-                a08 = correction.get("editor", None)
-            else:
-                a08 = correction
+        correction = field_corrections("field08_corrections").get(a08)
+        if correction is not None:
+            a08 = correction.text or correction.editor
     a09 = none_if_empty_or_stripped(a09)
     if not a09:
         a09 = None
     else:
-        if a09 in field09_corrections():
-            correction = field09_corrections().get(a09)
-            if not correction:
-                a09 = None
-            elif isinstance(correction, dict):
-                a09 = correction.get("place", None)
-            else:
-                a09 = correction
+        correction = field_corrections("field09_corrections").get(a09)
+        if correction is not None:
+            a09 = correction.text or correction.place
     if not a08 and not a09:
         return None
-    correction = editor_corrections().get(f"{a08} // {a09}")
-    if correction:
-        correction = correction.split(" // ")
-        a08 = correction[0]
-        a09 = correction[1]
     return (a08, a09)
 
 
+def editor_correction_key(editor: tuple[str | None, str | None]) -> str:
+    """Editor and place as looked up in editor_corrections"""
+    return f"{editor[0]} // {editor[1]}"
+
+
+def editor_from_a08_a09(a08: str | None, a09: str | None) -> tuple[str | None, str | None] | None:
+    """Cleanup, replace special cases"""
+    editor = editor_before_corrections(a08, a09)
+    if editor is None:
+        return None
+    editor_correction = editor_corrections().get(editor_correction_key(editor))
+    if editor_correction:
+        editor_and_place = editor_correction.split(" // ")
+        return (editor_and_place[0], editor_and_place[1])
+    return editor
+
+
 def edition_year_from_a09_a10(a09: str | None, a10: str | None) -> int | None:
     """Cleanup,handle special cases"""
     a09 = none_if_empty_or_stripped(a09)
-    if a09 and a09 in field09_corrections():
-        correction = field09_corrections().get(a09)
-        if correction and isinstance(correction, dict) and "year" in correction:
-            return int(correction["year"])
+    if a09:
+        correction = field_corrections("field09_corrections").get(a09)
+        if correction is not None and correction.year is not None:
+            return correction.year
 
     a10 = none_if_empty_or_stripped(a10)
     if not a10:
@@ -375,58 +360,28 @@ def has_dvd_from_a30(many_lines: list[str | None] | None) -> bool:
     return False
 
 
+def _field_correction(code: str, value: str | None) -> FieldCorrection | None:
+    value = none_if_empty_or_stripped(value)
+    if not value:
+        return None
+    return field_corrections(code).get(value)
+
+
 def copies_from_a17_a18_a30(a17: str | None, a18: str | None, a30: str | None) -> int | None:
     """Use corrections to look for number of copies"""
-    a17 = none_if_empty_or_stripped(a17)
-    if a17:
-        correction = field17_corrections().get(a17)
-        if correction and isinstance(correction, dict):
-            copies = correction.get("copies")
-            if copies:
-                if isinstance(copies, int):
-                    return copies
-                raise Exception(f"Invalid correction for A17 [{a17}]")
-    a18 = none_if_empty_or_stripped(a18)
-    if a18:
-        correction = field18_corrections().get(a18)
-        if correction and isinstance(correction, dict):
-            copies = correction.get("copies")
-            if copies:
-                if isinstance(copies, int):
-                    return copies
-                raise Exception(f"Invalid correction for A17 [{a18}]")
-    a30 = none_if_empty_or_stripped(a30)
-    if a30:
-        correction = field30_corrections().get(a30)
-        if correction and isinstance(correction, dict):
-            copies = correction.get("copies")
-            if copies:
-                if isinstance(copies, int):
-                    return copies
-                raise Exception(f"Invalid correction for A30 [{a30}]")
+    for code, value in (("field17_corrections", a17), ("field18_corrections", a18), ("field30_corrections", a30)):
+        correction = _field_correction(code, value)
+        if correction is not None and correction.copies:
+            return correction.copies
     return None
 
 
 def donation_from_a17_a30(a17: str | None, a30: str | None) -> str | None:
     """Use corrections to look for donations"""
-    a17 = none_if_empty_or_stripped(a17)
-    if a17:
-        correction = field17_corrections().get(a17)
-        if correction and isinstance(correction, dict):
-            donation = correction.get("donation")
-            if donation:
-                if isinstance(donation, str):
-                    return donation
-                raise Exception(f"Invalid correction for A17 [{a17}]")
-    a30 = none_if_empty_or_stripped(a30)
-    if a30:
-        correction = field30_corrections().get(a30)
-        if correction and isinstance(correction, dict):
-            donation = correction.get("donation")
-            if donation:
-                if isinstance(donation, str):
-                    return donation
-                raise Exception(f"Invalid correction for A30 [{a30}]")
+    for code, value in (("field17_corrections", a17), ("field30_corrections", a30)):
+        correction = _field_correction(code, value)
+        if correction is not None and correction.donation:
+            return correction.donation
     return None
 
 
@@ -434,26 +389,19 @@ def offprint_from_a17_a21_a30(a17: str | None, a21: str | None, a30: str | None)
     """Use corrections to look for offprint or the word ΑΝΑΤΥΠΟ"""
     a17 = none_if_empty_or_stripped(a17)
     if a17:
-        correction = field17_corrections().get(a17)
-        if correction and isinstance(correction, dict):
-            offprint = correction.get("offprint")
-            if offprint:
-                if isinstance(offprint, bool):
-                    return offprint
-                raise Exception(f"Invalid correction for A17 [{a17}]")
+        correction = field_corrections("field17_corrections").get(a17)
+        if correction is not None and correction.offprint:
+            return True
         if "ΑΝΑΤΥΠΟ" in a17:
             return True
     if a21 and "ΑΝΑΤΥΠΟ" in a21:
         return True
     a30 = none_if_empty_or_stripped(a30)
     if a30:
-        correction = field30_corrections().get(a30)
-        if correction and isinstance(correction, dict):
-            offprint = correction.get("offprint")
-            if offprint:
-                if isinstance(offprint, bool):
-                    return offprint
-                raise Exception(f"Invalid correction for A30 [{a30}]")
+        correction = field_corrections("field30_corrections").get(a30)
+        if correction is not None and correction.is_mapping:
+            if correction.offprint:
+                return True
         elif "ΑΝΑΤΥΠΟ" in a30:
             return True
     return False
@@ -461,57 +409,26 @@ def offprint_from_a17_a21_a30(a17: str | None, a21: str | None, a30: str | None)
 
 def volume_from_a17_a18_a20_a30(a17: str | None, a18: str | None, a20: str | None, a30: str | None) -> str | None:
     """Use corrections to look for volume"""
-
-    def read_from_single_field(
-        field_name: str,
-        value: str | None,
-        corrections: dict[str, str | dict[str, str | bool | int] | None],
-        current_result: str,
-    ) -> str:
-        value = none_if_empty_or_stripped(value)
-        if value:
-            correction = corrections.get(value)
-            if correction and isinstance(correction, dict):
-                result = correction.get("volume")
-                if result:
-                    if isinstance(result, str):
-                        if current_result:
-                            return current_result + "\n" + result
-                        return result
-                    raise Exception(f"Invalid correction for {field_name} [{value}]")
-        return current_result
-
-    result = read_from_single_field("A17", a17, field17_corrections(), "")
-    result = read_from_single_field("A18", a18, field18_corrections(), result)
-    result = read_from_single_field("A20", a20, field20_corrections(), result)
-    result = read_from_single_field("A30", a30, field30_corrections(), result)
+    result = ""
+    for code, value in (
+        ("field17_corrections", a17),
+        ("field18_corrections", a18),
+        ("field20_corrections", a20),
+        ("field30_corrections", a30),
+    ):
+        correction = _field_correction(code, value)
+        if correction is not None and correction.volume:
+            result = result + "\n" + correction.volume if result else correction.volume
     return none_if_empty_or_stripped(result)
 
 
 def material_from_a18_a30(a18: str | None, a30: str | None) -> str | None:
     """Use corrections to look for volume"""
-
-    def read_from_single_field(
-        field_name: str,
-        value: str | None,
-        corrections: dict[str, str | dict[str, str | bool | int] | None],
-        current_result: str,
-    ) -> str:
-        value = none_if_empty_or_stripped(value)
-        if value:
-            correction = corrections.get(value)
-            if correction and isinstance(correction, dict):
-                result = correction.get("material")
-                if result:
-                    if isinstance(result, str):
-                        if current_result:
-                            return current_result + "\n" + result
-                        return result
-                    raise Exception(f"Invalid correction for {field_name} [{value}]")
-        return current_result
-
-    result = read_from_single_field("A18", a18, field18_corrections(), "")
-    result = read_from_single_field("A30", a30, field30_corrections(), result)
+    result = ""
+    for code, value in (("field18_corrections", a18), ("field30_corrections", a30)):
+        correction = _field_correction(code, value)
+        if correction is not None and correction.material:
+            result = result + "\n" + correction.material if result else correction.material
     return none_if_empty_or_stripped(result)
 
 
@@ -519,55 +436,33 @@ def notes_from_a17_a18_a21_a30(a17: str | None, a18: str | None, a21: str | None
     """Read from all three fields, apply corrections"""
 
     def read_from_single_field(
-        field_name: str,
         value: str | None,
-        corrections: dict[str, str | dict[str, str | bool | int] | None],
+        corrections: dict[str, FieldCorrection],
         current_result: str,
     ) -> str:
-        result = None
         value = none_if_empty_or_stripped(value)
         if not value:
-            result = None
-        elif value in corrections:
-            correction = corrections.get(value)
-            if correction:
-                if isinstance(correction, dict):
-                    notes_in_dict = correction.get("notes")
-                    if not notes_in_dict:
-                        result = None
-                    elif isinstance(notes_in_dict, str):
-                        result = notes_in_dict
-                    else:
-                        raise Exception(f"Invalid correction for {field_name} [{value}]")
-                if isinstance(correction, str):
-                    result = correction
-            else:
-                result = None
-        else:
-            result = value
-
+            return current_result
+        correction = corrections.get(value)
+        result = value if correction is None else correction.text or correction.notes
         if result:
             if current_result:
                 return current_result + "\n" + result
             return result
         return current_result
 
-    result = read_from_single_field("A17", a17, field17_corrections(), "")
+    result = read_from_single_field(a17, field_corrections("field17_corrections"), "")
 
-    a18 = none_if_empty_or_stripped(a18)
-    if a18 and a18 in field18_corrections():
-        correction = field18_corrections().get(a18)
-        if correction:
-            if isinstance(correction, dict):
-                notes_in_dict = correction.get("notes")
-                if notes_in_dict and isinstance(notes_in_dict, str):
-                    if result:
-                        result += "\n" + notes_in_dict
-                    else:
-                        result = notes_in_dict
+    # A18 only contributes the notes of its corrections
+    correction = _field_correction("field18_corrections", a18)
+    if correction is not None and correction.notes:
+        if result:
+            result += "\n" + correction.notes
+        else:
+            result = correction.notes
 
-    result = read_from_single_field("A21", a21, {}, result)
-    result = read_from_single_field("A30", a30, field30_corrections(), result)
+    result = read_from_single_field(a21, {}, result)
+    result = read_from_single_field(a30, field_corrections("field30_corrections"), result)
 
     return none_if_empty_or_stripped(result)
 
@@ -578,41 +473,16 @@ def isbn_from_a17_a18_a19_a22_a30(
     """Cleanup"""
 
     # Only use corrections from a17
-    a17 = none_if_empty_or_stripped(a17in)
-    if not a17:
-        a17 = ""
-    if a17 in field17_corrections():
-        correction = field17_corrections()[a17]
-
-        if correction:
-            if isinstance(correction, dict):
-                if "isbn" in correction:
-                    if correction and isinstance(correction["isbn"], str):
-                        a17 = correction["isbn"]
-                    else:
-                        a17 = ""
-                else:
-                    a17 = ""
-            else:
-                a17 = ""
-        else:
-            a17 = ""
-    else:
-        a17 = ""
+    correction = _field_correction("field17_corrections", a17in)
+    a17 = correction.isbn or "" if correction is not None else ""
 
     # Use a18 unless there's a correction
     a18 = none_if_empty_or_stripped(a18in)
-    if a18:
-        if a18 in field18_corrections():
-            a18 = ""
-    else:
+    if not a18 or a18 in field_corrections("field18_corrections"):
         a18 = ""
 
     a19 = none_if_empty_or_stripped(a19in)
-    if a19:
-        if a19 in field19_corrections():
-            a19 = ""
-    else:
+    if not a19 or a19 in field_corrections("field19_corrections"):
         a19 = ""
 
     a22 = none_if_empty_or_stripped(a22in)
@@ -622,26 +492,8 @@ def isbn_from_a17_a18_a19_a22_a30(
         a22 = ""
 
     # Only use corrections from a30
-    a30 = none_if_empty_or_stripped(a30in)
-    if not a30:
-        a30 = ""
-    if a30 in field30_corrections():
-        correction = field30_corrections()[a30]
-        if correction:
-            if isinstance(correction, dict):
-                if "isbn" in correction:
-                    if correction and isinstance(correction["isbn"], str):
-                        a30 = correction["isbn"]
-                    else:
-                        a30 = ""
-                else:
-                    a30 = ""
-            else:
-                a30 = ""
-        else:
-            a30 = ""
-    else:
-        a30 = ""
+    correction = _field_correction("field30_corrections", a30in)
+    a30 = correction.isbn or "" if correction is not None else ""
 
     result = (a17 + a18 + a19 + a22 + a30).replace(" ", "").replace(".", "")
     result = none_if_empty_or_stripped(result)
@@ -1,190 +1,293 @@
 from __future__ import annotations
 
+import argparse
+import contextlib
+import functools
+import hashlib
+import json
+import multiprocessing
 import os
 import pprint
 import re
 import shutil
 import sys
+import traceback
 from collections import defaultdict
+from collections.abc import Callable, Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from typing import Any
 
 import yaml
 from snakemd import Document, Inline, MDList, Table
 
+from skoufas_dbf_reader.conversion import FIELD_SPECS, converted_catalog, iter_converted_entries
 from skoufas_dbf_reader.correction_data import plain_author_re
-from skoufas_dbf_reader.field_extractors import (
-    author_corrections,
-    authors_from_a01,
-    copies_from_a17_a18_a30,
-    curator_from_a16,
-    dewey_from_a04_a05,
-    donation_from_a17_a30,
-    edition_from_a07,
-    edition_year_from_a09_a10,
-    editor_from_a08_a09,
-    entry_numbers_from_a04_a05_a06_a07_a08_a18_a19,
-    has_cd_from_a02_a03_a12_a13_a14_a17_a18_a22_a30,
-    has_dvd_from_a30,
-    isbn_from_a17_a18_a19_a22_a30,
-    language_from_a01_a02,
-    material_from_a18_a30,
-    none_if_empty_or_stripped,
-    notes_from_a17_a18_a21_a30,
-    offprint_from_a17_a21_a30,
-    pages_from_a11,
-    subtitle_from_a03,
-    title_from_a02,
-    topics_from_a12_to_a15_a20_a22_to_a24,
-    translator_from_a06,
-    volume_from_a17_a18_a20_a30,
-)
+from skoufas_dbf_reader.duplicate_books import SAME_ISBN, SAME_SIGNATURE, SIMILAR_SIGNATURE, find_duplicate_books
+from skoufas_dbf_reader.entry_numbers import entry_number_index
+from skoufas_dbf_reader.field_extractors import author_corrections, none_if_empty_or_stripped
+from skoufas_dbf_reader.memoization import memoize_extractors
+from skoufas_dbf_reader.profiling import ReportProfiler
+from skoufas_dbf_reader.search_index import SHARD_PREFIX_LENGTH, search_shards
 from skoufas_dbf_reader.utilities import (
-    all_entries,
     check_ean,
     check_isbn,
     check_issn,
+    entries_catalogue,
     is_valid_dewey_strict,
     romanize,
 )
 
+# Number of entry pages written by each task of report_entries
+ENTRY_SHARD_SIZE = 1000
+
+# Search box of search/index.md. Words are folded as search_index.fold does, then only the shard named
+# after the first letters of each word is fetched
+SEARCH_PAGE_HTML = """<div id="search">
+<input id="search-query" type="search" placeholder="Τίτλος, συγγραφέας, θέμα, εκδότης" autofocus>
+<p id="search-status"></p>
+<ul id="search-results"></ul>
+</div>
+<script>
+(function () {
+  const prefixLength = %(prefix_length)d;
+  const shards = {};
+  const query = document.getElementById("search-query");
+  const status = document.getElementById("search-status");
+  const results = document.getElementById("search-results");
+  function fold(text) {
+    return text.toLowerCase().replace(/ς/g, "σ").normalize("NFD").replace(/\\p{M}/gu, "").normalize("NFC");
+  }
+  function shardName(word) {
+    const prefix = Array.from(word).slice(0, prefixLength).join("");
+    return Array.from(new TextEncoder().encode(prefix), (byte) => byte.toString(16).padStart(2, "0")).join("");
+  }
+  function loadShard(name) {
+    if (!shards[name]) {
+      shards[name] = fetch("./shards/" + name + ".json").then((response) =>
+        response.ok ? response.json() : { terms: {}, titles: {} }
+      );
+    }
+    return shards[name];
+  }
+  let shardNames;
+  async function wordShards(word) {
+    const name = shardName(word);
+    if (Array.from(word).length >= prefixLength) {
+      return [name];
+    }
+    // shorter words start the terms of every shard whose name starts with theirs
+    if (!shardNames) {
+      shardNames = fetch("./shards.json").then((response) => (response.ok ? response.json() : []));
+    }
+    return (await shardNames).filter((shard) => shard.startsWith(name));
+  }
+  async function matches(word) {
+    const found = new Map();
+    for (const shard of await Promise.all((await wordShards(word)).map(loadShard))) {
+      for (const [term, entries] of Object.entries(shard.terms)) {
+        if (term.startsWith(word)) {
+          entries.forEach((entry) => found.set(entry, shard.titles[entry]));
+        }
+      }
+    }
+    return found;
+  }
+  async function search() {
+    const words = fold(query.value).match(/[\\p{L}\\p{N}_]+/gu) || [];
+    const text = query.value;
+    const found = await Promise.all(words.map(matches));
+    if (text !== query.value) {
+      return;
+    }
+    results.replaceChildren();
+    if (!found.length) {
+      status.textContent = "";
+      return;
+    }
+    const entries = [...found[0].keys()].filter((entry) => found.every((matched) => matched.has(entry)));
+    entries.sort((a, b) => a - b);
+    status.textContent = entries.length + " καρτέλες";
+    for (const entry of entries.slice(0, 200)) {
+      const link = document.createElement("a");
+      link.href = "../entries/entry_" + String(entry).padStart(5, "0") + ".html";
+      link.textContent = String(entry).padStart(5, "0") + ": " + (found[0].get(entry) || "Χωρίς Τίτλο");
+      const item = document.createElement("li");
+      item.appendChild(link);
+      results.appendChild(item);
+    }
+  }
+  let timer;
+  query.addEventListener("input", () => {
+    clearTimeout(timer);
+    timer = setTimeout(search, 200);
+  });
+})();
+</script>
+"""
+
+# Content digests of the files of a build, relative to the reports directory, used by incremental builds
+MANIFEST_FILE = ".report_manifest.json"
+
+# Digests of the report files written by this process, by absolute path
+_produced_files: dict[str, str] = {}
+
+# Digests of the report files of the previous build, by absolute path
+_previous_manifest: dict[str, str] = {}
+
+
+def write_report_file(path: str, content: str):
+    """Write a report file, unless the previous build produced the same content"""
+    path = os.path.abspath(path)
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    _produced_files[path] = digest
+    if _previous_manifest.get(path) == digest and os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as outfile:
+        outfile.write(content)
+
+
+def drain_produced_files() -> dict[str, str]:
+    """Return and forget the report files written by this process"""
+    global _produced_files  # pylint: disable=global-statement
+    produced, _produced_files = _produced_files, {}
+    return produced
+
+
+def set_previous_manifest(manifest: dict[str, str]):
+    """Set the digests of the previous build, files with the same digest will not be written again"""
+    global _previous_manifest  # pylint: disable=global-statement
+    _previous_manifest = manifest
+
+
+def load_manifest(reports_directory: str) -> dict[str, str]:
+    """Digests of the files of the previous build in a reports directory, by absolute path"""
+    try:
+        with open(os.path.join(reports_directory, MANIFEST_FILE), encoding="utf-8") as stream:
+            manifest = json.load(stream)
+    except (OSError, ValueError):
+        return {}
+    return {os.path.abspath(os.path.join(reports_directory, path)): digest for path, digest in manifest.items()}
+
+
+def save_manifest(reports_directory: str, produced: dict[str, str]):
+    """Store the digests of the files of this build in the reports directory"""
+    manifest = {os.path.relpath(path, reports_directory): digest for path, digest in sorted(produced.items())}
+    os.makedirs(reports_directory, exist_ok=True)
+    with open(os.path.join(reports_directory, MANIFEST_FILE), "w", encoding="utf-8") as outfile:
+        json.dump(manifest, outfile, indent=0, sort_keys=True)
+
+
+def remove_stale_files(previous: dict[str, str], produced: dict[str, str]) -> list[str]:
+    """Delete the files of the previous build that were not produced by this build"""
+    removed: list[str] = []
+    for path in sorted(set(previous) - set(produced)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        removed.append(path)
+    return removed
+
 
 def report_single_fields(reports_directory: str):
     field_values: list[set[str]] = [set() for _ in range(31)]
     os.makedirs(os.path.join(reports_directory, "single-field"), exist_ok=True)
-    for entry in all_entries():
-        for i in range(1, 31):
-            if i in entry and entry[i] and entry[i].strip():
-                field_values[i].add(entry[i].strip())
+    catalogue = entries_catalogue()
+    for i in range(1, 31):
+        field_values[i].update(value.strip() for value in catalogue.column(i) if value and value.strip())
     for i in range(1, 31):
         doc = Document()
         doc.add_heading(f"Τιμές στη θέση {i:02}")
         doc.add_unordered_list([f"`{v}`" for v in sorted(field_values[i])])
-        with open(
-            os.path.join(reports_directory, "single-field", f"field_{i:02}.md"), "w", encoding="utf-8"
-        ) as outfile:
-            outfile.write(str(doc))
+        write_report_file(os.path.join(reports_directory, "single-field", f"field_{i:02}.md"), str(doc))
 
     doc = Document()
     doc.add_heading("Τιμές στις στήλες των καρτελών")
     doc.add_unordered_list([str(Inline(f"Στήλη {i}", link=f"./field_{i:02}.html")) for i in range(1, 31)])
-    with open(os.path.join(reports_directory, "single-field", "index.md"), "w", encoding="utf-8") as outfile:
-        outfile.write(str(doc))
+    write_report_file(os.path.join(reports_directory, "single-field", "index.md"), str(doc))
 
 
 def report_single_extracted_fields(reports_directory: str):
     field_values: defaultdict[str, list[str | list[str]]] = defaultdict(list)
-    for entry in all_entries():
-        authors = authors_from_a01(entry[1])
-        for author in authors:
+    for converted in converted_catalog():
+        for author in converted.authors:
             field_values["author"].append(author)
             if plain_author_re.fullmatch(author) or author in author_corrections().values():
                 field_values["plain_author"].append(author)
             else:
                 field_values["weird_author"].append(author)
 
-        language = language_from_a01_a02(entry[1], entry[2])
-        if language:
-            field_values["language"].append(language)
+        if converted.language:
+            field_values["language"].append(converted.language)
 
-        title = title_from_a02(entry[2])
-        if title:
-            field_values["title"].append(title)
+        if converted.title:
+            field_values["title"].append(converted.title)
 
-        subtitle = subtitle_from_a03(entry[3])
-        if subtitle:
-            field_values["subtitle"].append(subtitle)
+        if converted.subtitle:
+            field_values["subtitle"].append(converted.subtitle)
 
-        dewey = dewey_from_a04_a05(entry[4], entry[5])
-        if dewey:
-            field_values["dewey"].append(dewey)
+        if converted.dewey:
+            field_values["dewey"].append(converted.dewey)
 
-        entry_numbers = entry_numbers_from_a04_a05_a06_a07_a08_a18_a19(
-            entry[4], entry[5], entry[6], entry[7], entry[8], entry[18], entry[19]
-        )
-
-        field_values["entry_number_lists"].append(entry_numbers)
-        for entry_number in entry_numbers:
+        field_values["entry_number_lists"].append(converted.entry_numbers)
+        for entry_number in converted.entry_numbers:
             field_values["entry_numbers"].append(entry_number)
 
-        translator = translator_from_a06(entry[6])
-        if translator:
-            translators = translator.split("!!")
-            for single_translator in translators:
-                field_values["translator"].append(single_translator)
-                translator_surname_name = single_translator.split(",", maxsplit=1)
-                if len(translator_surname_name) == 2:
-                    field_values["translator_family_name"].append(translator_surname_name[0])
-                    if translator_surname_name[1].endswith("."):
-                        field_values["translator_name_abbreviations"].append(translator_surname_name[1])
-                    else:
-                        field_values["translator_names"].append(translator_surname_name[1])
-
-        edition = edition_from_a07(entry[7])
-        if edition:
-            field_values["edition"].append(edition)
-
-        editor = editor_from_a08_a09(entry[8], entry[9])
+        for single_translator in converted.translators:
+            field_values["translator"].append(single_translator)
+            translator_surname_name = single_translator.split(",", maxsplit=1)
+            if len(translator_surname_name) == 2:
+                field_values["translator_family_name"].append(translator_surname_name[0])
+                if translator_surname_name[1].endswith("."):
+                    field_values["translator_name_abbreviations"].append(translator_surname_name[1])
+                else:
+                    field_values["translator_names"].append(translator_surname_name[1])
+
+        if converted.edition:
+            field_values["edition"].append(converted.edition)
+
+        editor = converted.editor
         if editor:
             if not editor[0] or not editor[1]:
-                field_values["editor"].append(f"{editor[0]} // {editor[1]} ({entry[0]})")
+                field_values["editor"].append(f"{editor[0]} // {editor[1]} ({converted.dbase_number})")
             else:
                 field_values["editor"].append(f"{editor[0]} // {editor[1]}")
 
-        edition_year = edition_year_from_a09_a10(entry[9], entry[10])
-        if edition_year:
-            field_values["edition_year"].append(str(edition_year))
+        if converted.edition_year:
+            field_values["edition_year"].append(str(converted.edition_year))
 
-        pages = pages_from_a11(entry[11])
-        if pages:
-            field_values["pages"].append(str(pages))
+        if converted.pages:
+            field_values["pages"].append(str(converted.pages))
 
-        topic_list = topics_from_a12_to_a15_a20_a22_to_a24(
-            [
-                entry[12],
-                entry[13],
-                entry[14],
-                entry[15],
-                entry[20],
-                entry[22],
-                entry[23],
-                entry[24],
-            ]
-        )
-        field_values["topic_lists"].append(topic_list)
-        for topic in topic_list:
+        field_values["topic_lists"].append(converted.topics)
+        for topic in converted.topics:
             field_values["topics"].append(topic)
 
-        curator = curator_from_a16(entry[16])
-        if curator:
-            field_values["curator"].append(curator)
+        if converted.curator:
+            field_values["curator"].append(converted.curator)
 
-        copies = copies_from_a17_a18_a30(entry[17], entry[18], entry[30])
-        if copies:
-            field_values["copies"].append(str(copies))
+        if converted.copies:
+            field_values["copies"].append(str(converted.copies))
 
-        donation = donation_from_a17_a30(entry[17], entry[30])
-        if donation:
-            field_values["donation"].append(donation)
+        if converted.donation:
+            field_values["donation"].append(converted.donation)
 
-        volume = volume_from_a17_a18_a20_a30(entry[17], entry[18], entry[20], entry[30])
-        if volume:
-            field_values["volume"].append(volume)
+        if converted.volume:
+            field_values["volume"].append(converted.volume)
 
-        material = material_from_a18_a30(entry[18], entry[30])
-        if material:
-            field_values["material"].append(material)
+        if converted.material:
+            field_values["material"].append(converted.material)
 
-        notes = notes_from_a17_a18_a21_a30(entry[17], entry[18], entry[21], entry[30])
-        if notes:
-            field_values["notes"].append(notes)
+        if converted.notes:
+            field_values["notes"].append(converted.notes)
 
-        isbn: str | None = isbn_from_a17_a18_a19_a22_a30(entry[17], entry[18], entry[19], entry[22], entry[30])
-        if isbn:
-            if not check_isbn(isbn):
-                field_values["isbn"].append(isbn)
-            if not check_issn(isbn):
-                field_values["issn"].append(isbn)
-            if not check_ean(isbn):
-                field_values["ean"].append(isbn)
+        if converted.isbn:
+            field_values["isbn"].append(converted.isbn)
+        if converted.issn:
+            field_values["issn"].append(converted.issn)
+        if converted.ean:
+            field_values["ean"].append(converted.ean)
 
     os.makedirs(os.path.join(reports_directory, "calculated-field"), exist_ok=True)
 
@@ -194,64 +297,58 @@ def report_single_extracted_fields(reports_directory: str):
 
     for k, values in field_values.items():
         values = [pprint.pformat(value) for value in values]
-        with open(
-            os.path.join(reports_directory, "calculated-field", f"calculated_field_{k}.md"), "w", encoding="utf-8"
-        ) as outfile:
-            doc = Document()
-            doc.add_heading(f"Υπολογισμένες τιμές για την ιδιότητα {k}, αλφαβητικά")
-            doc.add_unordered_list([f"`{v}`" for v in sorted(set(values))])
-            outfile.write(str(doc))
-            links.append(
-                str(
-                    Inline(f"Υπολογισμένες τιμές για την ιδιότητα {k}, αλφαβητικά", link=f"./calculated_field_{k}.html")
-                )
-            )
-        with open(
-            os.path.join(reports_directory, "calculated-field", f"calculated_field_{k}_romanize_sort.md"),
-            "w",
-            encoding="utf-8",
-        ) as outfile:
-            doc = Document()
-            doc.add_heading(f"Υπολογισμένες τιμές για την ιδιότητα {k}, φωνητικά")
-            doc.add_unordered_list([f"`{v}` # *{romanize(v)}*" for v in sorted(set(values), key=romanize)])
-            outfile.write(str(doc))
-            links.append(
-                str(
-                    Inline(
-                        f"Υπολογισμένες τιμές για την ιδιότητα {k}, φωνητικά",
-                        link=f"./calculated_field_{k}_romanize_sort.html",
-                    )
+        doc = Document()
+        doc.add_heading(f"Υπολογισμένες τιμές για την ιδιότητα {k}, αλφαβητικά")
+        doc.add_unordered_list([f"`{v}`" for v in sorted(set(values))])
+        write_report_file(os.path.join(reports_directory, "calculated-field", f"calculated_field_{k}.md"), str(doc))
+        links.append(
+            str(Inline(f"Υπολογισμένες τιμές για την ιδιότητα {k}, αλφαβητικά", link=f"./calculated_field_{k}.html"))
+        )
+        doc = Document()
+        doc.add_heading(f"Υπολογισμένες τιμές για την ιδιότητα {k}, φωνητικά")
+        romanized = {v: romanize(v) for v in set(values)}
+        # values with the same romanization in their own order, not in the order of the set, which changes between runs
+        doc.add_unordered_list(
+            [f"`{v}` # *{romanized[v]}*" for v in sorted(romanized, key=lambda v: (romanized[v], v))]
+        )
+        write_report_file(
+            os.path.join(reports_directory, "calculated-field", f"calculated_field_{k}_romanize_sort.md"), str(doc)
+        )
+        links.append(
+            str(
+                Inline(
+                    f"Υπολογισμένες τιμές για την ιδιότητα {k}, φωνητικά",
+                    link=f"./calculated_field_{k}_romanize_sort.html",
                 )
             )
+        )
     index.add_unordered_list(links)
-    with open(os.path.join(reports_directory, "calculated-field", "index.md"), "w", encoding="utf-8") as outfile:
-        outfile.write(str(index))
+    write_report_file(os.path.join(reports_directory, "calculated-field", "index.md"), str(index))
 
 
 def report_invalid_dewey(reports_directory: str):
     invalid_output_dewey: defaultdict[str, list[str]] = defaultdict(list)
     no_output_dewey: defaultdict[str, list[str]] = defaultdict(list)
-    for entry in all_entries():
-        dewey = dewey_from_a04_a05(entry[4], entry[5])
-        if dewey:
-            if not is_valid_dewey_strict(dewey):
-                invalid_output_dewey[dewey].append(str(entry[0]))
+    for converted in iter_converted_entries():
+        entry = converted.original_entry
+        if converted.dewey:
+            if not is_valid_dewey_strict(converted.dewey):
+                invalid_output_dewey[converted.dewey].append(str(entry[0]))
         else:
             if none_if_empty_or_stripped(entry[4]):
                 no_output_dewey[entry[4]].append(str(entry[0]))
 
     os.makedirs(os.path.join(reports_directory, "checks"), exist_ok=True)
-    with open(os.path.join(reports_directory, "checks", "invalid_dewey.md"), "w", encoding="utf-8") as outfile:
-        doc = Document()
-        doc.add_heading("Dewey με προβληματικές τιμές στην έξοδο")
-        for k, v in sorted(invalid_output_dewey.items()):
-            doc.add_heading(k, level=2)
-            doc.add_unordered_list([str(Inline(entry, link=f"../entries/entry_{entry:05}.html")) for entry in v])
-        doc.add_heading("Dewey στην είσοδο που δεν βγαίνουν στην έξοδο")
-        for k, v in sorted(no_output_dewey.items()):
-            doc.add_heading(k, level=2)
-            doc.add_unordered_list([str(Inline(entry, link=f"../entries/entry_{entry:05}.html")) for entry in v])
-        outfile.write(str(doc))
+    doc = Document()
+    doc.add_heading("Dewey με προβληματικές τιμές στην έξοδο")
+    for k, v in sorted(invalid_output_dewey.items()):
+        doc.add_heading(k, level=2)
+        doc.add_unordered_list([str(Inline(entry, link=f"../entries/entry_{entry:05}.html")) for entry in v])
+    doc.add_heading("Dewey στην είσοδο που δεν βγαίνουν στην έξοδο")
+    for k, v in sorted(no_output_dewey.items()):
+        doc.add_heading(k, level=2)
+        doc.add_unordered_list([str(Inline(entry, link=f"../entries/entry_{entry:05}.html")) for entry in v])
+    write_report_file(os.path.join(reports_directory, "checks", "invalid_dewey.md"), str(doc))
 
 
 def report_weird_names(reports_directory: str):
@@ -264,15 +361,11 @@ def report_weird_names(reports_directory: str):
     valid_name2_re = re.compile(r"[A-ZΑ-Ω\-]+,[A-ZΑ-Ω\.]*,[A-ZΑ-Ω\.]*\.?")
     valid_name3_re = re.compile(r"[A-ZΑ-Ω\-]+,[A-ZΑ-Ω\.]*\.?@[A-ZΑ-Ω\-]+")
     valid_name4_re = re.compile(r"[A-ZΑ-Ω\-]+,[A-ZΑ-Ω\.]*,[A-ZΑ-Ω\.]*\.?@[A-ZΑ-Ω\-]+")
-    for entry in all_entries():
-        translator = translator_from_a06(entry[6])
-        if translator:
-            translators = translator.split("!!")
-            for translator in translators:
-                if not valid_name_re.fullmatch(translator):
-                    weird_translators.append(translator)
-        authors = authors_from_a01(entry[1])
-        for author in authors:
+    for converted in converted_catalog():
+        for translator in converted.translators:
+            if not valid_name_re.fullmatch(translator):
+                weird_translators.append(translator)
+        for author in converted.authors:
             if (
                 (not valid_name_re.fullmatch(author))
                 and (not valid_name2_re.fullmatch(author))
@@ -280,18 +373,13 @@ def report_weird_names(reports_directory: str):
                 and (not valid_name4_re.fullmatch(author))
             ):
                 weird_authors.append(author)
-        curator = curator_from_a16(entry[16])
-        if curator:
-            curators = curator.split("!!")
-            for curator in curators:
+        if converted.curator:
+            for curator in converted.curator.split("!!"):
                 if not valid_name_re.fullmatch(curator):
                     weird_curators.append(curator)
-        donor = donation_from_a17_a30(entry[17], entry[30])
-        if donor:
-            donors = donor.split("!!")
-            for donor in donors:
-                if not valid_name_re.fullmatch(donor):
-                    weird_donors.append(donor)
+        for donor in converted.donors:
+            if not valid_name_re.fullmatch(donor):
+                weird_donors.append(donor)
 
     for field, greek_name, thelist in [
         ("translators", "Μεταφραστές", weird_translators),
@@ -299,30 +387,26 @@ def report_weird_names(reports_directory: str):
         ("curators", "Επιμελητές", weird_curators),
         ("donors", "Δωρητές", weird_donors),
     ]:
-        with open(os.path.join(reports_directory, "checks", f"invalid_{field}.md"), "w", encoding="utf-8") as outfile:
-            doc = Document()
-            doc.add_heading(f"{greek_name} με παράξενα ονόματα")
-            doc.add_unordered_list(sorted(set(thelist)))
-            outfile.write(str(doc))
+        doc = Document()
+        doc.add_heading(f"{greek_name} με παράξενα ονόματα")
+        doc.add_unordered_list(sorted(set(thelist)))
+        write_report_file(os.path.join(reports_directory, "checks", f"invalid_{field}.md"), str(doc))
 
 
 def report_donors(reports_directory: str):
     os.makedirs(os.path.join(reports_directory, "checks"), exist_ok=True)
     count_map: defaultdict[str, int] = defaultdict(int)
-    for entry in all_entries():
-        donors = donation_from_a17_a30(entry[17], entry[30])
-        if donors:
-            for donor in donors.split("!!"):
-                count_map[donor] = count_map[donor] + 1
+    for converted in iter_converted_entries():
+        for donor in converted.donors:
+            count_map[donor] = count_map[donor] + 1
     donor_count_list: list[list[str]] = []
     for donor, count in sorted(count_map.items(), reverse=True, key=lambda x: x[1]):
         donor_count_list.append([donor, str(count)])
 
-    with open(os.path.join(reports_directory, "checks", "donors.md"), "w", encoding="utf-8") as outfile:
-        doc = Document()
-        doc.add_heading("Δωρητές")
-        doc.add_table(["Δωρητής", "Αριθμός βιβλίων"], donor_count_list)
-        outfile.write(str(doc))
+    doc = Document()
+    doc.add_heading("Δωρητές")
+    doc.add_table(["Δωρητής", "Αριθμός βιβλίων"], donor_count_list)
+    write_report_file(os.path.join(reports_directory, "checks", "donors.md"), str(doc))
 
 
 def report_isbns(reports_directory: str):
@@ -330,14 +414,8 @@ def report_isbns(reports_directory: str):
     doc.add_heading("Προβληματικά ISBN")
     doc.add_table_of_contents()
 
-    for entry in all_entries():
-        result = isbn_from_a17_a18_a19_a22_a30(
-            entry[17],
-            entry[18],
-            entry[19],
-            entry[22],
-            entry[30],
-        )
+    for converted in iter_converted_entries():
+        result = converted.isbn_issn_ean
         if not result:
             continue
         checks = [check_isbn(result), check_issn(result), check_ean(result)]
@@ -348,133 +426,122 @@ def report_isbns(reports_directory: str):
         doc.add_unordered_list([check for check in checks if check])
 
         doc.add_heading("Αρχική Καρτέλα στο DBASE", level=3)
-        doc.add_code(code=entry_as_yaml(entry, minimal=True), lang="yaml")
+        doc.add_code(code=entry_as_yaml(converted.original_entry, minimal=True), lang="yaml")
 
-    with open(os.path.join(reports_directory, "checks", "invalid_isbn.md"), "w", encoding="utf-8") as outfile:
-        outfile.write(str(doc))
+    write_report_file(os.path.join(reports_directory, "checks", "invalid_isbn.md"), str(doc))
 
 
 def report_entry_numbers(reports_directory: str):
-    all_entry_numbers: dict[str, dict[int, str]] = {}
+    index = entry_number_index()
+    catalogue = entries_catalogue()
 
     no_entry_numbers = Document()
     no_entry_numbers.add_heading("Καρτέλες χωρίς αριθμό εισαγωγής")
+    for dbase_number in index.no_entry_numbers:
+        no_entry_numbers.add_horizontal_rule()
+        no_entry_numbers.add_code(entry_as_yaml(catalogue.by_dbase_number(dbase_number), minimal=True), lang="yaml")
 
     non_numeric = Document()
     non_numeric.add_heading("Καρτέλες με μή αριθμητικό αριθμό εισαγωγής")
+    for occurrences in index.non_numeric().values():
+        for dbase_number, entry_number in occurrences:
+            non_numeric.add_horizontal_rule()
+            non_numeric.add_paragraph(entry_number)
+            non_numeric.add_code(entry_as_yaml(catalogue.by_dbase_number(dbase_number), minimal=True), lang="yaml")
 
-    duplicate_entry_numbers: defaultdict[str, list[dict[int, str]]] = defaultdict(list)
+    os.makedirs(os.path.join(reports_directory, "checks"), exist_ok=True)
+    write_report_file(os.path.join(reports_directory, "checks", "no_entry_numbers.md"), str(no_entry_numbers))
+    write_report_file(os.path.join(reports_directory, "checks", "non_numeric_entry_numbers.md"), str(non_numeric))
+
+    dup = Document()
+    dup.add_heading("Καρτέλες με διπλοπερασμένο αριθμητικό αριθμό εισαγωγής")
+    for occurrences in index.duplicates().values():
+        dup.add_horizontal_rule()
+        # the entry numbers as found in the entries, which may differ in zeros or Latin letters
+        dup.add_paragraph(", ".join(dict.fromkeys(entry_number for _, entry_number in occurrences)))
+        for dbase_number, _ in occurrences:
+            dup.add_code(entry_as_yaml(catalogue.by_dbase_number(dbase_number), minimal=True), lang="yaml")
+    write_report_file(os.path.join(reports_directory, "checks", "duplicate_entry_numbers.md"), str(dup))
+
+    # For the pages of the library site that look books up by entry number
+    write_report_file(
+        os.path.join(reports_directory, "entries", "entry_numbers.json"),
+        json.dumps(index.as_dict(), ensure_ascii=False, separators=(",", ":")),
+    )
 
-    for entry in all_entries():
-        entry_numbers = entry_numbers_from_a04_a05_a06_a07_a08_a18_a19(
-            entry[4], entry[5], entry[6], entry[7], entry[8], entry[18], entry[19]
-        )
-        if not entry_numbers:
-            no_entry_numbers.add_horizontal_rule()
-            no_entry_numbers.add_code(entry_as_yaml(entry, minimal=True), lang="yaml")
-        else:
-            for n in entry_numbers:
-                if n in all_entry_numbers:
-                    if not duplicate_entry_numbers[n]:
-                        duplicate_entry_numbers[n].append(all_entry_numbers[n])
-                    duplicate_entry_numbers[n].append(entry)
-                else:
-                    all_entry_numbers[n] = entry
-                if not n.isnumeric():
-                    non_numeric.add_horizontal_rule()
-                    non_numeric.add_paragraph(n)
-                    non_numeric.add_code(entry_as_yaml(entry, minimal=True), lang="yaml")
 
+DUPLICATE_REASONS = {
+    SAME_ISBN: "Ίδιο ISBN",
+    SAME_SIGNATURE: "Ίδιος τίτλος, συγγραφείς και έτος έκδοσης",
+    SIMILAR_SIGNATURE: "Παρόμοιος τίτλος και συγγραφείς",
+}
+
+
+def report_duplicate_books(reports_directory: str):
+    converted_by_dbase_number = {converted.dbase_number: converted for converted in converted_catalog()}
+    doc = Document()
+    doc.add_heading("Καρτέλες που μπορεί να είναι το ίδιο βιβλίο")
+    doc.add_table_of_contents()
+    for group in find_duplicate_books(converted_by_dbase_number.values()):
+        first = converted_by_dbase_number[group.dbase_numbers[0]]
+        doc.add_heading(f"{group.dbase_numbers[0]:05}: {first.title or 'Χωρίς Τίτλο'}", level=2)
+        doc.add_paragraph(", ".join(DUPLICATE_REASONS[reason] for reason in group.reasons))
+        rows = []
+        for dbase_number in group.dbase_numbers:
+            converted = converted_by_dbase_number[dbase_number]
+            rows.append(
+                [
+                    str(Inline(f"{dbase_number:05}", link=f"../entries/entry_{dbase_number:05}.html")),
+                    " - ".join(text for text in (converted.title, converted.subtitle) if text),
+                    "; ".join(converted.authors),
+                    str(converted.edition_year or ""),
+                    converted.isbn_issn_ean or "",
+                    ", ".join(converted.entry_numbers),
+                ]
+            )
+        doc.add_table(["Καρτέλα", "Τίτλος", "Συγγραφείς", "Έτος", "ISBN", "Αριθμοί εισαγωγής"], rows)
     os.makedirs(os.path.join(reports_directory, "checks"), exist_ok=True)
-    with open(os.path.join(reports_directory, "checks", "no_entry_numbers.md"), "w", encoding="utf-8") as outfile:
-        outfile.write(str(no_entry_numbers))
-    with open(
-        os.path.join(reports_directory, "checks", "non_numeric_entry_numbers.md"), "w", encoding="utf-8"
-    ) as outfile:
-        outfile.write(str(non_numeric))
-
-    with open(
-        os.path.join(reports_directory, "checks", "duplicate_entry_numbers.md"), "w", encoding="utf-8"
-    ) as outfile:
-        dup = Document()
-        dup.add_heading("Καρτέλες με διπλοπερασμένο αριθμητικό αριθμό εισαγωγής")
-        for entry_number, entries in duplicate_entry_numbers.items():
-            dup.add_horizontal_rule()
-            dup.add_paragraph(entry_number)
-            for entry in entries:
-                dup.add_code(entry_as_yaml(entry, minimal=True), lang="yaml")
-        outfile.write(str(dup))
-
-
-def entry_as_yaml(entry: dict[int, str], minimal: bool) -> str:
+    write_report_file(os.path.join(reports_directory, "checks", "duplicate_books.md"), str(doc))
+
+
+def entry_as_yaml(entry: Mapping[int, str], minimal: bool) -> str:
     """return an entry for a code section"""
     if minimal:
         minimal_entry = {k: v for k, v in entry.items() if v}
         return yaml.dump(minimal_entry, default_flow_style=False, allow_unicode=True)
-    return yaml.dump(entry, default_flow_style=False, allow_unicode=True)
+    return yaml.dump(dict(entry), default_flow_style=False, allow_unicode=True)
 
 
-def report_entries(reports_directory: str):
-    os.makedirs(os.path.join(reports_directory, "entries"), exist_ok=True)
-    all_id_titles: list[tuple[str, str]] = []
-    by_author: defaultdict[str, defaultdict[str, list[tuple[str, str]]]] = defaultdict(lambda: defaultdict(list))
-    by_dewey: defaultdict[str, list[tuple[str, str]]] = defaultdict(list)
+def report_entry_pages(reports_directory: str, start: int, stop: int) -> list[tuple[int, str, list[str], str | None]]:
+    """Write the pages of a shard of the converted catalogue.
 
-    for entry in all_entries():
-        translator = translator_from_a06(entry[6])
+    Return the id, title, authors and dewey of each entry, in catalogue order, for the indexes
+    """
+    index_rows: list[tuple[int, str, list[str], str | None]] = []
+    for converted in converted_catalog()[start:stop]:
+        entry = converted.original_entry
         translators: list[str] = []
-        if translator:
-            for single_translator in translator.split("!!"):
-                translator_surname_name = single_translator.split(",", maxsplit=1)
-                if len(translator_surname_name) == 2:
-                    if translator_surname_name[1].endswith("."):
-                        translators.append(
-                            f"Επίθετο:{translator_surname_name[0]}, Μή πλήρες όνομα: {translator_surname_name[1]}"
-                        )
-                    else:
-                        translators.append(f"Επίθετο:{translator_surname_name[0]}, Oνομα: {translator_surname_name[1]}")
+        for single_translator in converted.translators:
+            translator_surname_name = single_translator.split(",", maxsplit=1)
+            if len(translator_surname_name) == 2:
+                if translator_surname_name[1].endswith("."):
+                    translators.append(
+                        f"Επίθετο:{translator_surname_name[0]}, Μή πλήρες όνομα: {translator_surname_name[1]}"
+                    )
                 else:
-                    translators.append(f"{single_translator}")
-
-        donation = donation_from_a17_a30(entry[17], entry[30])
-        donors: list[str] = []
-        if donation:
-            donors = donation.split("!!")
-
-        editor = editor_from_a08_a09(entry[8], entry[9])
-        if editor:
-            editor = f"{editor[0]} ({editor[1]})"
-
-        topic_list = topics_from_a12_to_a15_a20_a22_to_a24(
-            [
-                entry[12],
-                entry[13],
-                entry[14],
-                entry[15],
-                entry[20],
-                entry[22],
-                entry[23],
-                entry[24],
-            ]
-        )
+                    translators.append(f"Επίθετο:{translator_surname_name[0]}, Oνομα: {translator_surname_name[1]}")
+            else:
+                translators.append(f"{single_translator}")
 
-        isbn_issn_ean = isbn_from_a17_a18_a19_a22_a30(entry[17], entry[18], entry[19], entry[22], entry[30])
-        isbn = ""
-        issn = ""
-        ean = ""
-        if isbn_issn_ean:
-            if not check_isbn(isbn_issn_ean):
-                isbn = isbn_issn_ean
-            if not check_issn(isbn_issn_ean):
-                issn = isbn_issn_ean
-            if not check_ean(isbn_issn_ean):
-                ean = isbn_issn_ean
+        editor = None
+        if converted.editor:
+            editor = f"{converted.editor[0]} ({converted.editor[1]})"
 
         doc = Document()
 
         doc.add_heading("Τίτλος")
-        doc.add_paragraph(str(title_from_a02(entry[2])))
-        doc.add_paragraph(str(subtitle_from_a03(entry[3])))
+        doc.add_paragraph(str(converted.title))
+        doc.add_paragraph(str(converted.subtitle))
         doc.add_paragraph(
             str(
                 Inline(
@@ -484,34 +551,30 @@ def report_entries(reports_directory: str):
         )
 
         doc.add_heading("Συγγραφείς", level=2)
-        doc.add_unordered_list(authors_from_a01(entry[1]))
+        doc.add_unordered_list(converted.authors)
 
         doc.add_heading("Αριθμοί Εισαγωγης", level=2)
-        doc.add_unordered_list(
-            entry_numbers_from_a04_a05_a06_a07_a08_a18_a19(
-                entry[4], entry[5], entry[6], entry[7], entry[8], entry[18], entry[19]
-            )
-        )
+        doc.add_unordered_list(converted.entry_numbers)
 
         doc.add_table(
             ["Πεδίο", "Τιμή"],
             [
                 ["dbase_number", str(entry[0])],
-                ["Γλώσσα", str(language_from_a01_a02(entry[1], entry[2]))],
-                ["Dewey", str(dewey_from_a04_a05(entry[4], entry[5]))],
-                ["Έκδοση", str(edition_from_a07(entry[7]))],
+                ["Γλώσσα", str(converted.language)],
+                ["Dewey", str(converted.dewey)],
+                ["Έκδοση", str(converted.edition)],
                 ["Εκδότης (Πόλη)", f"{editor}"],
-                ["Χρόνος έκδοσης", f"{edition_year_from_a09_a10(entry[9], entry[10])}"],
-                ["Σελίδες", f"{pages_from_a11(entry[11])}"],
-                ["Επιμελητής", f"{curator_from_a16(entry[16])}"],
-                ["Αντίτυπα", f"{copies_from_a17_a18_a30(entry[17], entry[18], entry[30])}"],
-                ["Δωρητές", str(MDList(donors))],
-                ["Τεύχος/Τόμος", f"{volume_from_a17_a18_a20_a30(entry[17], entry[18], entry[20], entry[30])}"],
-                ["Υλικό", f"{material_from_a18_a30(entry[18], entry[30])}"],
-                ["Σημειώσεις", f"{notes_from_a17_a18_a21_a30(entry[17], entry[18], entry[21], entry[30])}"],
-                ["ISBN", isbn],
-                ["ISSN", issn],
-                ["EAN", ean],
+                ["Χρόνος έκδοσης", f"{converted.edition_year}"],
+                ["Σελίδες", f"{converted.pages}"],
+                ["Επιμελητής", f"{converted.curator}"],
+                ["Αντίτυπα", f"{converted.copies}"],
+                ["Δωρητές", str(MDList(converted.donors))],
+                ["Τεύχος/Τόμος", f"{converted.volume}"],
+                ["Υλικό", f"{converted.material}"],
+                ["Σημειώσεις", f"{converted.notes}"],
+                ["ISBN", converted.isbn or ""],
+                ["ISSN", converted.issn or ""],
+                ["EAN", converted.ean or ""],
             ],
             [Table.Align.LEFT, Table.Align.RIGHT],
             0,
@@ -521,69 +584,76 @@ def report_entries(reports_directory: str):
         doc.add_unordered_list(translators)
 
         doc.add_paragraph("Θέματα")
-        doc.add_unordered_list(topic_list)
+        doc.add_unordered_list(converted.topics)
 
         doc.add_paragraph("Ιδιότητες")
-        doc.add_block(
-            MDList(
-                ["Εχει CD"],
-                checked=has_cd_from_a02_a03_a12_a13_a14_a17_a18_a22_a30(
-                    [
-                        entry[2],
-                        entry[3],
-                        entry[12],
-                        entry[13],
-                        entry[14],
-                        entry[17],
-                        entry[18],
-                        entry[22],
-                        entry[30],
-                    ]
-                ),
-            )
-        )
+        doc.add_block(MDList(["Εχει CD"], checked=converted.has_cd))
 
-        doc.add_block(
-            MDList(
-                ["Εχει DVD"],
-                checked=has_dvd_from_a30(
-                    [
-                        entry[30],
-                    ]
-                ),
-            )
-        )
+        doc.add_block(MDList(["Εχει DVD"], checked=converted.has_dvd))
 
-        doc.add_block(MDList(["Ανάτυπο"], checked=offprint_from_a17_a21_a30(entry[17], entry[21], entry[30])))
+        doc.add_block(MDList(["Ανάτυπο"], checked=converted.offprint))
 
         doc.add_heading("Αρχική Καρτέλα στο DBASE", level=1)
         doc.add_code(code=entry_as_yaml(entry, minimal=False), lang="yaml")
 
-        title = title_from_a02(entry[2])
+        title = converted.title
         if not title:
             title = "Χωρίς Τίτλο"
-        subtitle = subtitle_from_a03(entry[3])
-        if subtitle:
-            title += " - " + subtitle
-
-        all_id_titles.append((entry[0], title))
-        for author in authors_from_a01(entry[1]):
-            if len(author) == 0:
-                by_author["#"]["Χωρίς συγγραφέα"].append((entry[0], title))
-            else:
-                by_author[author[0]][author].append((entry[0], title))
+        if converted.subtitle:
+            title += " - " + converted.subtitle
 
-        dewey = dewey_from_a04_a05(entry[4], entry[5])
+        index_rows.append((entry[0], title, converted.authors, converted.dewey))
 
-        if dewey:
-            by_dewey[dewey].append((entry[0], title))
-        else:
-            by_dewey["Xωρίς dewey"].append((entry[0], title))
+        write_report_file(os.path.join(reports_directory, "entries", f"entry_{entry[0]:05}.md"), str(doc))
+    return index_rows
+
+
+def _report_entry_pages_task(
+    reports_directory: str, start: int, stop: int
+) -> tuple[list[tuple[int, str, list[str], str | None]], dict[str, str]]:
+    index_rows = report_entry_pages(reports_directory, start, stop)
+    return index_rows, drain_produced_files()
+
+
+def _merge_produced_files(result: Any, produced: dict[str, str]) -> Any:
+    _produced_files.update(produced)
+    return result
+
+
+def report_entries(reports_directory: str, executor: Executor | None = None):
+    """Write a page per entry and the indexes by id, author and dewey.
+
+    The pages are written in shards of ENTRY_SHARD_SIZE entries, on the executor when one is given.
+    The indexes are merged from the shards in catalogue order so the output does not depend on the executor
+    """
+    os.makedirs(os.path.join(reports_directory, "entries"), exist_ok=True)
+    all_id_titles: list[tuple[str, str]] = []
+    by_author: defaultdict[str, defaultdict[str, list[tuple[str, str]]]] = defaultdict(lambda: defaultdict(list))
+    by_dewey: defaultdict[str, list[tuple[str, str]]] = defaultdict(list)
 
-        with open(
-            os.path.join(reports_directory, "entries", f"entry_{entry[0]:05}.md"), "w", encoding="utf-8"
-        ) as outfile:
-            outfile.write(str(doc))
+    catalog_size = len(converted_catalog())
+    shards = [
+        (start, min(start + ENTRY_SHARD_SIZE, catalog_size)) for start in range(0, catalog_size, ENTRY_SHARD_SIZE)
+    ]
+    if executor:
+        futures = [executor.submit(_report_entry_pages_task, reports_directory, start, stop) for start, stop in shards]
+        shard_rows = (_merge_produced_files(*future.result()) for future in futures)
+    else:
+        shard_rows = (report_entry_pages(reports_directory, start, stop) for start, stop in shards)
+
+    for index_rows in shard_rows:
+        for entry_id, title, authors, dewey in index_rows:
+            all_id_titles.append((entry_id, title))
+            for author in authors:
+                if len(author) == 0:
+                    by_author["#"]["Χωρίς συγγραφέα"].append((entry_id, title))
+                else:
+                    by_author[author[0]][author].append((entry_id, title))
+
+            if dewey:
+                by_dewey[dewey].append((entry_id, title))
+            else:
+                by_dewey["Xωρίς dewey"].append((entry_id, title))
 
     index = Document()
     index.add_heading("Όλες οι καρτέλες")
@@ -599,8 +669,7 @@ def report_entries(reports_directory: str):
         sublist = [str(Inline(f"{int(id):05}: {title}", link=f"./entry_{int(id):05}.html")) for id, title in sublist]
         index.add_unordered_list(sublist)
 
-    with open(os.path.join(reports_directory, "entries", "index.md"), "w", encoding="utf-8") as outfile:
-        outfile.write(str(index))
+    write_report_file(os.path.join(reports_directory, "entries", "index.md"), str(index))
 
     index_by_author = Document()
     index_by_author.add_heading("Όλες οι καρτέλες, κατα συγγραφέα")
@@ -613,8 +682,7 @@ def report_entries(reports_directory: str):
                 str(Inline(f"{int(id):05}: {title}", link=f"./entry_{int(id):05}.html")) for id, title in entry_list
             ]
             index_by_author.add_unordered_list(entry_list)
-    with open(os.path.join(reports_directory, "entries", "index_by_author.md"), "w", encoding="utf-8") as outfile:
-        outfile.write(str(index_by_author))
+    write_report_file(os.path.join(reports_directory, "entries", "index_by_author.md"), str(index_by_author))
 
     index_by_dewey = Document()
     index_by_dewey.add_heading("Όλες οι καρτέλες, κατα συγγραφέα")
@@ -625,8 +693,29 @@ def report_entries(reports_directory: str):
             str(Inline(f"{int(id):05}: {title}", link=f"./entry_{int(id):05}.html")) for id, title in entry_list
         ]
         index_by_dewey.add_unordered_list(entry_list)
-    with open(os.path.join(reports_directory, "entries", "index_by_dewey.md"), "w", encoding="utf-8") as outfile:
-        outfile.write(str(index_by_dewey))
+    write_report_file(os.path.join(reports_directory, "entries", "index_by_dewey.md"), str(index_by_dewey))
+
+
+def report_search(reports_directory: str):
+    """Write a search page and the search index shards it loads, one json file per first letters of the terms.
+
+    The names of the shards are listed in shards.json, for the words of a query shorter than the shard prefix
+    """
+    shards = search_shards()
+    for name, shard in sorted(shards.items()):
+        write_report_file(
+            os.path.join(reports_directory, "search", "shards", f"{name}.json"),
+            json.dumps(shard, ensure_ascii=False, sort_keys=True, separators=(",", ":")),
+        )
+    write_report_file(os.path.join(reports_directory, "search", "shards.json"), json.dumps(sorted(shards)))
+    doc = Document()
+    doc.add_heading("Αναζήτηση")
+    doc.add_paragraph(
+        "Βρίσκει τις καρτέλες με λέξεις στον τίτλο, τον υπότιτλο, τους συγγραφείς, τα θέματα, τον εκδότη ή τις "
+        "σημειώσεις που αρχίζουν με κάθε λέξη της αναζήτησης, με ή χωρίς τόνους, και με λατινικούς χαρακτήρες."
+    )
+    doc.add_raw(SEARCH_PAGE_HTML % {"prefix_length": SHARD_PREFIX_LENGTH})
+    write_report_file(os.path.join(reports_directory, "search", "index.md"), str(doc))
 
 
 def add_index(reports_directory: str):
@@ -636,6 +725,7 @@ def add_index(reports_directory: str):
     doc.add_heading("Βιβλιοθήκη Σκουφά: προσωρινός κατάλογος βιβλίων")
     doc.add_table_of_contents()
 
+    doc.add_paragraph(str(Inline("Αναζήτηση", link="./search/index.html")))
     doc.add_paragraph(str(Inline("Όλες οι καρτέλες", link="./entries/index.html")))
     doc.add_paragraph(str(Inline("Όλες οι καρτέλες, κατα συγγραφέα", link="./entries/index_by_author.html")))
     doc.add_paragraph(str(Inline("Όλες οι καρτέλες, κατα dewey", link="./entries/index_by_dewey.html")))
@@ -653,6 +743,7 @@ def add_index(reports_directory: str):
         )
     )
     doc.add_paragraph(str(Inline("Καρτέλες χωρίς αριθμό εισαγωγής", link="./checks/no_entry_numbers.html")))
+    doc.add_paragraph(str(Inline("Καρτέλες που μπορεί να είναι το ίδιο βιβλίο", link="./checks/duplicate_books.html")))
     doc.add_paragraph(
         str(Inline("Καρτέλες με μή αριθμητικό αριθμό εισαγωγής", link="./checks/non_numeric_entry_numbers.html"))
     )
@@ -667,27 +758,204 @@ def add_index(reports_directory: str):
 
     doc.add_paragraph(str(Inline("Δωρητές", link="./checks/donors.html")))
 
-    with open(os.path.join(reports_directory, "index.md"), "w", encoding="utf-8") as outfile:
-        outfile.write(str(doc))
+    write_report_file(os.path.join(reports_directory, "index.md"), str(doc))
+
+
+REPORTS: tuple[Callable[[str], None], ...] = (
+    add_index,
+    report_weird_names,
+    report_donors,
+    report_isbns,
+    report_entry_numbers,
+    report_duplicate_books,
+    report_entries,
+    report_search,
+    report_single_fields,
+    report_single_extracted_fields,
+    report_invalid_dewey,
+)
+
+# Converted fields read by each report, reports missing from here only read the raw entries
+REPORT_FIELDS: dict[str, frozenset[str]] = {
+    "report_weird_names": frozenset({"authors", "translator", "curator", "donation"}),
+    "report_donors": frozenset({"donation"}),
+    "report_isbns": frozenset({"isbn_issn_ean"}),
+    "report_entry_numbers": frozenset({"entry_numbers"}),
+    "report_duplicate_books": frozenset(
+        {"isbn_issn_ean", "title", "subtitle", "authors", "edition_year", "entry_numbers"}
+    ),
+    "report_entries": frozenset(spec.name for spec in FIELD_SPECS),
+    "report_single_extracted_fields": frozenset(
+        spec.name for spec in FIELD_SPECS if spec.name not in ("has_cd", "has_dvd", "offprint")
+    ),
+    "report_invalid_dewey": frozenset({"dewey"}),
+    "report_search": frozenset({"title", "subtitle", "authors", "topics", "editor", "notes"}),
+}
+
+# Correction tables read by a report directly rather than through the converted entries
+REPORT_CORRECTION_TABLES: dict[str, frozenset[str]] = {
+    "report_single_extracted_fields": frozenset({"author_corrections"}),
+}
+
+
+def preload_catalog():
+    """Load and convert all entries, so that forked workers inherit them instead of loading them again"""
+    converted_catalog()
+
+
+def _initialize_worker(previous_manifest: dict[str, str]):
+    set_previous_manifest(previous_manifest)
+    preload_catalog()
+
+
+def report_executor(jobs: int) -> ProcessPoolExecutor:
+    """A process pool whose workers have the converted catalogue and the previous manifest loaded"""
+    if "fork" in multiprocessing.get_all_start_methods():
+        preload_catalog()
+        return ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("fork"))
+    return ProcessPoolExecutor(max_workers=jobs, initializer=_initialize_worker, initargs=(_previous_manifest,))
+
+
+def run_report(report: Callable[[str], None], reports_directory: str) -> tuple[str | None, dict[str, str]]:
+    """Run a single report, return the formatted traceback if it fails and the files it wrote"""
+    try:
+        report(reports_directory)
+    except Exception:  # noqa: BLE001
+        return traceback.format_exc(), drain_produced_files()
+    return None, drain_produced_files()
+
+
+def run_reports(reports_directory: str, jobs: int = 1, profiler: ReportProfiler | None = None) -> dict[str, str]:
+    """Run all reports, on a process pool if jobs is more than one, return the tracebacks of failed reports.
+
+    The files written by the reports are collected in this process, see drain_produced_files.
+    A profiler records each report as a stage, it needs the reports to run in this process
+    """
+    failures: dict[str, str] = {}
+    if jobs <= 1 or profiler:
+        for report in REPORTS:
+            with profiler.stage(report.__name__) if profiler else contextlib.nullcontext():
+                error = _merge_produced_files(*run_report(report, reports_directory))
+            if error:
+                failures[report.__name__] = error
+        return failures
+
+    with report_executor(jobs) as executor:
+        futures = {
+            executor.submit(run_report, report, reports_directory): report.__name__
+            for report in REPORTS
+            if report is not report_entries
+        }
+        if report_entries in REPORTS:
+            # The entry pages are sharded on the same pool, merging the indexes in this process
+            error = _merge_produced_files(
+                *run_report(functools.partial(report_entries, executor=executor), reports_directory)
+            )
+            if error:
+                failures[report_entries.__name__] = error
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                error = _merge_produced_files(*future.result())
+            except Exception:  # noqa: BLE001
+                error = traceback.format_exc()
+            if error:
+                failures[name] = error
+            else:
+                print(f"Finished {name}")
+    return failures
 
 
 def main():
     """Create markdown reports"""
-    if len(sys.argv) > 0:
-        md_report_dir = os.path.abspath(sys.argv[1])
-    else:
-        md_report_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, "md_reports")
+    parser = argparse.ArgumentParser(description="Create markdown reports from the DBF entries")
+    parser.add_argument(
+        "reports_directory",
+        nargs="?",
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, "md_reports"),
+        help="Directory where the reports are created",
+    )
+    parser.add_argument(
+        "--source",
+        help="Entries to read: an entries.yml file, a .jsonl file written by dbf-to-jsonl or the .dbf file itself, "
+        "read directly without converting it to yaml first. Defaults to SKOUFAS_DBF_READER_ENTRIES or data/entries.yml",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of processes used to create the reports, 0 to use all CPUs",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep the reports directory, only rewrite files whose content changed and delete files no longer created",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="JSON_FILE",
+        help="Write the time and memory of each report, extractor timings, correction lookup counts and "
+        "output sizes to a json file. Runs the reports one at a time in this process, and slower",
+    )
+    parser.add_argument(
+        "--cprofile",
+        metavar="PROF_FILE",
+        help="Write cProfile statistics of the run, for pstats, snakeviz or flameprof",
+    )
+    parser.add_argument(
+        "--memoize",
+        action="store_true",
+        help="Cache the results of the extractors by their raw DBF values and print the hit rates",
+    )
+    args = parser.parse_args()
+    if args.source:
+        # through the environment, so that workers that do not fork read the same entries
+        os.environ["SKOUFAS_DBF_READER_ENTRIES"] = os.path.abspath(args.source)
+    md_report_dir = os.path.abspath(args.reports_directory)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    profiler = ReportProfiler(cprofile=bool(args.cprofile)) if args.profile or args.cprofile else None
+    if profiler and jobs > 1:
+        print("Profiling runs the reports in a single process, ignoring --jobs")
+
     print(f"Creating reports in {md_report_dir}")
-    shutil.rmtree(md_report_dir, ignore_errors=True)
-    add_index(md_report_dir)
-    report_weird_names(md_report_dir)
-    report_donors(md_report_dir)
-    report_isbns(md_report_dir)
-    report_entry_numbers(md_report_dir)
-    report_entries(md_report_dir)
-    report_single_fields(md_report_dir)
-    report_single_extracted_fields(md_report_dir)
-    report_invalid_dewey(md_report_dir)
+    previous_manifest: dict[str, str] = {}
+    if args.incremental:
+        previous_manifest = load_manifest(md_report_dir)
+    else:
+        shutil.rmtree(md_report_dir, ignore_errors=True)
+    set_previous_manifest(previous_manifest)
+    with memoize_extractors() if args.memoize else contextlib.nullcontext({}) as memoized:
+        if profiler:
+            with profiler:
+                with profiler.stage("converted_catalog"):
+                    preload_catalog()
+                failures = run_reports(md_report_dir, jobs, profiler)
+        else:
+            failures = run_reports(md_report_dir, jobs)
+    for name, extractor in memoized.items():
+        stats = extractor.stats()
+        print(f"Memoized {name}: {stats.hit_rate:.1%} hits of {stats.hits + stats.misses} calls")
+    produced = drain_produced_files()
+    if profiler:
+        if args.profile:
+            with open(args.profile, "w", encoding="utf-8") as outfile:
+                json.dump(profiler.summary(md_report_dir, produced), outfile, indent=2)
+            print(f"Wrote profile to {args.profile}")
+        if args.cprofile:
+            profiler.dump_cprofile(args.cprofile)
+            print(f"Wrote cProfile statistics to {args.cprofile}")
+    for name, error in failures.items():
+        print(f"Report {name} failed:\n{error}", file=sys.stderr)
+    if failures:
+        # Keep track of the files of the previous build that the failed reports did not get to rewrite
+        save_manifest(md_report_dir, previous_manifest | produced)
+        sys.exit(f"{len(failures)} of {len(REPORTS)} reports failed")
+    removed = remove_stale_files(previous_manifest, produced)
+    save_manifest(md_report_dir, produced)
+    if args.incremental:
+        changed = sum(1 for path, digest in produced.items() if previous_manifest.get(path) != digest)
+        print(f"Rewrote {changed} of {len(produced)} files, removed {len(removed)} files")
     print(f"Finished creating reports in {md_report_dir}")
 
 
@@ -0,0 +1,91 @@
+"""Opt-in memoization of the extractors, keyed on the raw DBF values they are called with"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import weakref
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from skoufas_dbf_reader import conversion
+from skoufas_dbf_reader.correction_data import on_correction_data_reload, recording_lookups
+
+# Results kept by each extractor before the least recently used ones are dropped
+DEFAULT_MAXSIZE = 65536
+
+
+@dataclasses.dataclass
+class MemoStats:
+    """Hits and misses of a memoized extractor"""
+
+    hits: int
+    misses: int
+    size: int
+    maxsize: int | None
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of the calls answered from the cache"""
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+class MemoizedExtractor:
+    """An extractor with a bounded LRU cache of its results.
+
+    List arguments, as passed by the as_list field specs, are cached as tuples, and list results
+    are copied so that callers cannot change the cached ones. Calls made while lookups are
+    recorded skip the cache, so that the lookups of every entry are seen
+    """
+
+    def __init__(self, extractor: Callable[..., Any], maxsize: int | None = DEFAULT_MAXSIZE):
+        functools.update_wrapper(self, extractor)
+        self.extractor = extractor
+        self._cached = functools.lru_cache(maxsize=maxsize)(self._extract)
+        _memoized_extractors.add(self)
+
+    def _extract(self, *key: Any) -> Any:
+        return self.extractor(*(list(argument) if isinstance(argument, tuple) else argument for argument in key))
+
+    def __call__(self, *args: Any) -> Any:
+        if recording_lookups():
+            return self.extractor(*args)
+        result = self._cached(*(tuple(argument) if isinstance(argument, list) else argument for argument in args))
+        if isinstance(result, list):
+            return list(result)
+        return result
+
+    def stats(self) -> MemoStats:
+        """Hits and misses since the cache was last cleared"""
+        info = self._cached.cache_info()
+        return MemoStats(hits=info.hits, misses=info.misses, size=info.currsize, maxsize=info.maxsize)
+
+    def cache_clear(self):
+        """Drop the cached results and the statistics"""
+        self._cached.cache_clear()
+
+
+_memoized_extractors: weakref.WeakSet[MemoizedExtractor] = weakref.WeakSet()
+
+
+def clear_memoized_extractors():
+    """Drop the cached results of every memoized extractor, done when the correction data reloads"""
+    for extractor in list(_memoized_extractors):
+        extractor.cache_clear()
+
+
+on_correction_data_reload(clear_memoized_extractors)
+
+
+@contextmanager
+def memoize_extractors(maxsize: int | None = DEFAULT_MAXSIZE) -> Iterator[dict[str, MemoizedExtractor]]:
+    """Memoize the extractors of conversion.FIELD_SPECS while the context is active, yield them by field name"""
+    original_specs = conversion.FIELD_SPECS
+    memoized = {spec.name: MemoizedExtractor(spec.extractor, maxsize) for spec in original_specs}
+    conversion.FIELD_SPECS = tuple(dataclasses.replace(spec, extractor=memoized[spec.name]) for spec in original_specs)
+    try:
+        yield memoized
+    finally:
+        conversion.FIELD_SPECS = original_specs
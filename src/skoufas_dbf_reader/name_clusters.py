@@ -0,0 +1,299 @@
+"""Candidate merges of spelling variants of authors, translators and editors, as patches of the correction files.
+
+The distinct names are grouped in blocks by three letter windows of their romanized and accent folded forms, and
+only names sharing a block are compared, by the similarity of their letter trigrams. Similar names are clustered
+and the most frequent name of each cluster is proposed for the others
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable, Mapping
+from functools import cache
+
+import yaml
+
+from skoufas_dbf_reader.conversion import ConvertedEntry, converted_catalog, iter_converted_entries
+from skoufas_dbf_reader.correction_data import correction_table
+from skoufas_dbf_reader.field_extractors import (
+    author_correction_key,
+    editor_before_corrections,
+    editor_correction_key,
+    translator_correction_key,
+)
+from skoufas_dbf_reader.search_index import fold
+from skoufas_dbf_reader.utilities import romanize
+
+# Names at least this similar are proposed as the same name
+DEFAULT_THRESHOLD = 0.85
+
+# Starts of the three letter windows of the comparison key used as blocking keys. A single typo in the first
+# six letters leaves at least one of the windows unchanged, and typos further on leave all of them unchanged
+BLOCK_KEY_OFFSETS = (0, 1, 3)
+
+# Separator of the names of a value, for several authors or translators
+NAMES_SEPARATOR = "!!"
+
+# Separator of the editor and the place in editor_corrections
+EDITOR_PLACE_SEPARATOR = " // "
+
+
+def _authors(converted: ConvertedEntry) -> list[str]:
+    return converted.authors
+
+
+def _translators(converted: ConvertedEntry) -> list[str]:
+    return converted.translators
+
+
+def _editors(converted: ConvertedEntry) -> list[str]:
+    if not converted.editor:
+        return []
+    return [editor_correction_key(converted.editor)]
+
+
+def _author_key(converted: ConvertedEntry) -> str | None:
+    return author_correction_key(converted.original_entry[1])
+
+
+def _translator_key(converted: ConvertedEntry) -> str | None:
+    return translator_correction_key(converted.original_entry[6])
+
+
+def _editor_key(converted: ConvertedEntry) -> str | None:
+    editor = editor_before_corrections(converted.original_entry[8], converted.original_entry[9])
+    return editor_correction_key(editor) if editor else None
+
+
+# The names of each correction table, as in its values
+NAME_TABLES: dict[str, Callable[[ConvertedEntry], list[str]]] = {
+    "author_corrections": _authors,
+    "translator_corrections": _translators,
+    "editor_corrections": _editors,
+}
+
+# The key each correction table is looked up with, from the raw values of an entry
+CORRECTION_KEYS: dict[str, Callable[[ConvertedEntry], str | None]] = {
+    "author_corrections": _author_key,
+    "translator_corrections": _translator_key,
+    "editor_corrections": _editor_key,
+}
+
+# Separator of the names in the values of each correction table, None for tables with a single name per value
+VALUE_SEPARATORS: dict[str, str | None] = {
+    "author_corrections": NAMES_SEPARATOR,
+    "translator_corrections": NAMES_SEPARATOR,
+    "editor_corrections": None,
+}
+
+
+def name_counts(table: str, catalog: Iterable[ConvertedEntry] | None = None) -> Counter[str]:
+    """Number of entries with each distinct name of a correction table"""
+    names = NAME_TABLES[table]
+    counts: Counter[str] = Counter()
+    for converted in iter_converted_entries() if catalog is None else catalog:
+        counts.update(dict.fromkeys(names(converted), 1))
+    return counts
+
+
+def lookup_values(table: str, catalog: Iterable[ConvertedEntry] | None = None) -> dict[str, str]:
+    """The names of the entries as a value of a correction table, by the key the table is looked up with"""
+    names = NAME_TABLES[table]
+    key = CORRECTION_KEYS[table]
+    separator = VALUE_SEPARATORS[table] or ""
+    values: dict[str, str] = {}
+    for converted in iter_converted_entries() if catalog is None else catalog:
+        lookup_key = key(converted)
+        found = names(converted)
+        if lookup_key is not None and found:
+            values.setdefault(lookup_key, separator.join(found))
+    return values
+
+
+@cache
+def comparison_key(name: str) -> str:
+    """Letters and digits of the romanized name, folded, so that Greek, Latin and mixed spellings compare equal"""
+    return re.sub(r"[\W_]+", "", fold(romanize(name)))
+
+
+def _split_place(name: str) -> tuple[str, str | None]:
+    editor, separator, place = name.partition(EDITOR_PLACE_SEPARATOR)
+    if not separator or place == "None":
+        return editor, None
+    return editor, place
+
+
+def blocking_keys(key: str) -> set[str]:
+    """Three letter windows of a comparison key, the key itself if it is shorter"""
+    if len(key) <= 3:
+        return {key}
+    return {key[offset : offset + 3] for offset in BLOCK_KEY_OFFSETS if offset + 3 <= len(key)}
+
+
+def _trigrams(key: str) -> frozenset[str]:
+    padded = f"  {key} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def similarity(first: str, second: str) -> float:
+    """Dice coefficient of the letter trigrams of the comparison keys of two names, 1 for the same key"""
+    first_trigrams = _trigrams(comparison_key(first))
+    second_trigrams = _trigrams(comparison_key(second))
+    return 2 * len(first_trigrams & second_trigrams) / (len(first_trigrams) + len(second_trigrams))
+
+
+def cluster_names(
+    counts: Mapping[str, int], threshold: float = DEFAULT_THRESHOLD, with_places: bool = False
+) -> list[list[tuple[str, float]]]:
+    """Clusters of similar names with their similarity to the first name, the most frequent one.
+
+    With places, the names are editors with their places, compared on the editor alone, and only
+    names with the same place, or both without one, are compared. Names on their own are not returned
+    """
+    names = sorted(counts)
+    compared: list[str] = []
+    places: list[str | None] = []
+    for name in names:
+        editor, place = _split_place(name) if with_places else (name, None)
+        compared.append(comparison_key(editor))
+        places.append(fold(place) if place else None)
+    trigrams = [_trigrams(key) for key in compared]
+
+    blocks: defaultdict[str, list[int]] = defaultdict(list)
+    for i, key in enumerate(compared):
+        if key:
+            for block_key in blocking_keys(key):
+                blocks[f"{places[i]}{EDITOR_PLACE_SEPARATOR}{block_key}"].append(i)
+
+    parents = list(range(len(names)))
+
+    def root(i: int) -> int:
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    minimum_ratio = threshold / (2 - threshold)
+    for block in blocks.values():
+        for position, i in enumerate(block):
+            for j in block[position + 1 :]:
+                size_i, size_j = len(trigrams[i]), len(trigrams[j])
+                # the Dice coefficient cannot reach the threshold when the sizes are too far apart
+                if min(size_i, size_j) < minimum_ratio * max(size_i, size_j):
+                    continue
+                if 2 * len(trigrams[i] & trigrams[j]) >= threshold * (size_i + size_j):
+                    parents[root(i)] = root(j)
+
+    members: defaultdict[int, list[int]] = defaultdict(list)
+    for i in range(len(names)):
+        members[root(i)].append(i)
+    clusters = []
+    for cluster in members.values():
+        if len(cluster) < 2:
+            continue
+        # the most frequent name, then the first in order
+        cluster.sort(key=lambda i: (-counts[names[i]], names[i]))
+        canonical = cluster[0]
+        clusters.append(
+            [
+                (names[i], 2 * len(trigrams[i] & trigrams[canonical]) / (len(trigrams[i]) + len(trigrams[canonical])))
+                for i in cluster
+            ]
+        )
+    clusters.sort(key=lambda cluster: cluster[0][0])
+    return clusters
+
+
+def correction_patch(
+    clusters: list[list[tuple[str, float]]],
+    table: Mapping[str, str | None],
+    counts: Mapping[str, int],
+    values: Mapping[str, str],
+    separator: str | None = NAMES_SEPARATOR,
+) -> list[tuple[str, str, str]]:
+    """Keys and values to add to a correction table, with a comment, to merge the names of each cluster.
+
+    The keys are the ones the table is looked up with: those of the entries, from lookup_values, which
+    hold the names of uncorrected entries, and those of the table itself, since the corrections are not
+    applied again to their values. Every variant in their values is replaced by the first name of its cluster
+    """
+    merged: dict[str, tuple[str, float]] = {}
+    for (canonical, _), *variants in clusters:
+        for variant, score in variants:
+            merged[variant] = (canonical, score)
+    current = {key: values[key] for key in sorted(values) if key not in table}
+    current.update((key, value) for key, value in table.items() if value)
+    patch: list[tuple[str, str, str]] = []
+    for key, value in current.items():
+        names = value.split(separator) if separator else [value]
+        variants = [name for name in names if name in merged]
+        if not variants:
+            continue
+        corrected = (separator or "").join(merged[name][0] if name in merged else name for name in names)
+        if key in table:
+            comment = f"was {value}"
+        else:
+            comment = "; ".join(
+                f"{name + ': ' if len(names) > 1 else ''}entries {counts[name]}, similarity {merged[name][1]:.2f}"
+                for name in variants
+            )
+        patch.append((key, corrected, comment))
+    return patch
+
+
+def format_patch(patches: Mapping[str, list[tuple[str, str, str]]]) -> str:
+    """The patches of the correction tables as yaml, in the layout of the correction files"""
+    lines = ["# Candidate merges found by cluster-names, to review before copying them to the correction files"]
+    for table, patch in patches.items():
+        lines.append("---")
+        lines.append(f"{table}:")
+        for key, value, comment in patch:
+            entry = yaml.dump({key: value}, allow_unicode=True, default_flow_style=False, width=sys.maxsize)
+            lines.append(f"  {entry.rstrip()}  # {comment}")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    """Propose merges of spelling variants as patches of the correction files"""
+    parser = argparse.ArgumentParser(description="Find spelling variants of authors, translators and editors")
+    parser.add_argument(
+        "--table",
+        action="append",
+        choices=sorted(NAME_TABLES),
+        help="Correction table whose names are clustered, may be repeated, all of them by default",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Least trigram similarity of names proposed as the same, {DEFAULT_THRESHOLD} by default",
+    )
+    parser.add_argument("--output", help="Yaml file for the patches, printed if missing")
+    args = parser.parse_args()
+    patches = {}
+    catalog = converted_catalog()
+    for table in args.table or NAME_TABLES:
+        start = time.perf_counter()
+        counts = name_counts(table, catalog)
+        clusters = cluster_names(counts, args.threshold, with_places=table == "editor_corrections")
+        values = lookup_values(table, catalog)
+        patches[table] = correction_patch(clusters, correction_table(table), counts, values, VALUE_SEPARATORS[table])
+        print(
+            f"{table}: {len(counts)} names, {len(clusters)} clusters, {len(patches[table])} corrections "
+            f"in {time.perf_counter() - start:.1f}s",
+            file=sys.stderr,
+        )
+    patch_yaml = format_patch(patches)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as outfile:
+            outfile.write(patch_yaml)
+    else:
+        print(patch_yaml, end="")
+
+
+if __name__ == "__main__":
+    main()
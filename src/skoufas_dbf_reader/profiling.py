@@ -0,0 +1,118 @@
+"""Timings and counters collected by generate-reports --profile"""
+
+from __future__ import annotations
+
+import cProfile
+import dataclasses
+import os
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from typing import Any
+
+from skoufas_dbf_reader import conversion
+from skoufas_dbf_reader.correction_data import count_lookups
+
+
+@dataclasses.dataclass
+class StageProfile:
+    """Wall time, CPU time and peak traced memory of a stage of the run"""
+
+    wall_seconds: float
+    cpu_seconds: float
+    peak_memory_bytes: int
+
+
+@dataclasses.dataclass
+class ExtractorProfile:
+    """Number of calls and cumulative time of an extractor"""
+
+    calls: int = 0
+    seconds: float = 0.0
+
+
+def _timed_extractor(extractor: Callable[..., Any], profile: ExtractorProfile) -> Callable[..., Any]:
+    def timed(*args: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return extractor(*args)
+        finally:
+            profile.calls += 1
+            profile.seconds += time.perf_counter() - start
+
+    return timed
+
+
+class ReportProfiler:
+    """Collect timings and counters while active.
+
+    Extractors are timed by swapping conversion.FIELD_SPECS, correction lookups are counted with
+    count_lookups and memory is traced with tracemalloc, all of which slow the run down
+    """
+
+    def __init__(self, cprofile: bool = False):
+        self.stages: dict[str, StageProfile] = {}
+        self.extractors: dict[str, ExtractorProfile] = {}
+        self.lookups: dict[str, list[int]] = {}
+        self.cprofile = cProfile.Profile() if cprofile else None
+        self._exit_stack = ExitStack()
+
+    def __enter__(self) -> ReportProfiler:
+        original_specs = conversion.FIELD_SPECS
+        timed_specs = []
+        for spec in original_specs:
+            profile = self.extractors.setdefault(spec.extractor.__name__, ExtractorProfile())
+            timed_specs.append(dataclasses.replace(spec, extractor=_timed_extractor(spec.extractor, profile)))
+        conversion.FIELD_SPECS = tuple(timed_specs)
+        self._exit_stack.callback(setattr, conversion, "FIELD_SPECS", original_specs)
+        self.lookups = self._exit_stack.enter_context(count_lookups())
+        tracemalloc.start()
+        self._exit_stack.callback(tracemalloc.stop)
+        if self.cprofile:
+            self.cprofile.enable()
+            self._exit_stack.callback(self.cprofile.disable)
+        return self
+
+    def __exit__(self, *exc_info: object):
+        self._exit_stack.close()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Record the wall time, CPU time and peak memory of a stage"""
+        tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            self.stages[name] = StageProfile(
+                wall_seconds=time.perf_counter() - start_wall,
+                cpu_seconds=time.process_time() - start_cpu,
+                peak_memory_bytes=tracemalloc.get_traced_memory()[1] - start_memory,
+            )
+
+    def summary(self, reports_directory: str, produced: dict[str, str]) -> dict[str, Any]:
+        """Everything collected, plus the size of the files produced under each output directory"""
+        output_bytes: dict[str, int] = {}
+        for path in produced:
+            directory = os.path.relpath(os.path.dirname(path), reports_directory)
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            output_bytes[directory] = output_bytes.get(directory, 0) + size
+        return {
+            "stages": {name: dataclasses.asdict(profile) for name, profile in self.stages.items()},
+            "extractors": {name: dataclasses.asdict(profile) for name, profile in self.extractors.items()},
+            "correction_lookups": {
+                code: {"hits": hits, "misses": misses} for code, (hits, misses) in sorted(self.lookups.items())
+            },
+            "output_bytes": dict(sorted(output_bytes.items())),
+        }
+
+    def dump_cprofile(self, path: str):
+        """Write the cProfile statistics, readable by pstats, snakeviz or flameprof"""
+        if self.cprofile:
+            self.cprofile.dump_stats(path)
@@ -0,0 +1,254 @@
+"""Full text search over the converted entries, through an inverted index stored in a single file.
+
+Titles, subtitles, authors, topics, editors and notes are split in words folded to lowercase without
+accents, final sigma folded to sigma, and their romanized forms are indexed too, so that Latin keyboard
+queries find Greek entries.
+
+The index file holds a header, the sorted terms, the offsets of their postings, the postings as delta
+encoded varints of document numbers, and a json line per document with what is printed for a result.
+search_shards splits the same terms by their first letters for the search page of the reports
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import re
+import struct
+import sys
+import time
+import unicodedata
+from array import array
+from collections.abc import Iterable
+from typing import Any
+
+from skoufas_dbf_reader.conversion import ConvertedEntry, converted_catalog
+from skoufas_dbf_reader.utilities import romanize
+
+INDEX_MAGIC = b"SKSI"
+# Bump when the layout of the index file changes
+INDEX_FORMAT = 1
+# magic, format, number of terms, number of documents, then the byte length of each of the four sections
+_HEADER = struct.Struct("<4sIII4Q")
+
+# Folded letters that name the search shard of a term, see search_shards
+SHARD_PREFIX_LENGTH = 2
+
+_word_re = re.compile(r"\w+")
+
+
+def fold(text: str) -> str:
+    """Lowercase text without accents or diaeresis, final sigma turned to sigma"""
+    decomposed = unicodedata.normalize("NFD", text.casefold())
+    return unicodedata.normalize("NFC", "".join(c for c in decomposed if not unicodedata.combining(c)))
+
+
+def words(text: str | None) -> list[str]:
+    """Folded words of a text"""
+    if not text:
+        return []
+    return _word_re.findall(fold(text))
+
+
+def entry_texts(converted: ConvertedEntry) -> list[str]:
+    """The texts of an entry that are searched"""
+    texts = [converted.title, converted.subtitle, *converted.authors, *converted.topics, converted.notes]
+    if converted.editor:
+        texts.extend(converted.editor)
+    return [text for text in texts if text]
+
+
+def entry_terms(converted: ConvertedEntry) -> set[str]:
+    """Folded words of the searched texts and of their romanized forms"""
+    terms: set[str] = set()
+    for text in entry_texts(converted):
+        terms.update(words(text))
+        terms.update(words(romanize(text)))
+    return terms
+
+
+def entry_document(converted: ConvertedEntry) -> dict[str, Any]:
+    """What is shown for an entry found by a search"""
+    return {
+        "dbase_number": converted.dbase_number,
+        "title": converted.title,
+        "authors": converted.authors,
+        "dewey": converted.dewey,
+        "entry_numbers": converted.entry_numbers,
+    }
+
+
+def _encode_varint(value: int, output: bytearray):
+    while value >= 0x80:
+        output.append((value & 0x7F) | 0x80)
+        value >>= 7
+    output.append(value)
+
+
+def _decode_postings(postings: bytes, start: int, stop: int) -> list[int]:
+    documents = []
+    document = 0
+    value = 0
+    shift = 0
+    for byte in postings[start:stop]:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        document += value
+        documents.append(document)
+        value = 0
+        shift = 0
+    return documents
+
+
+class SearchIndex:
+    """An inverted index of the converted entries, see build_search_index and SearchIndex.load"""
+
+    def __init__(self, terms: list[str], offsets: array, postings: bytes, documents: list[bytes]):
+        self.terms = terms
+        self.offsets = offsets
+        self.postings = postings
+        self.documents = documents
+
+    def term_documents(self, term: str) -> list[int]:
+        """Numbers of the documents holding a term, in catalogue order"""
+        position = bisect.bisect_left(self.terms, term)
+        if position == len(self.terms) or self.terms[position] != term:
+            return []
+        return _decode_postings(self.postings, self.offsets[position], self.offsets[position + 1])
+
+    def prefix_documents(self, prefix: str) -> set[int]:
+        """Numbers of the documents holding a term starting with prefix"""
+        found: set[int] = set()
+        position = bisect.bisect_left(self.terms, prefix)
+        while position < len(self.terms) and self.terms[position].startswith(prefix):
+            found.update(_decode_postings(self.postings, self.offsets[position], self.offsets[position + 1]))
+            position += 1
+        return found
+
+    def search(self, query: str, limit: int | None = None) -> list[dict[str, Any]]:
+        """Documents holding a word starting with each word of the query, in catalogue order"""
+        query_words = sorted(set(words(query)), key=len, reverse=True)
+        if not query_words:
+            return []
+        found = self.prefix_documents(query_words[0])
+        for word in query_words[1:]:
+            if not found:
+                break
+            found &= self.prefix_documents(word)
+        return [json.loads(self.documents[document]) for document in sorted(found)[:limit]]
+
+    def save(self, path: str):
+        """Write the index to a file"""
+        terms = "\n".join(self.terms).encode("utf-8")
+        offsets = self.offsets.tobytes()
+        documents = b"\n".join(self.documents)
+        with open(path, "wb") as outfile:
+            outfile.write(
+                _HEADER.pack(
+                    INDEX_MAGIC,
+                    INDEX_FORMAT,
+                    len(self.terms),
+                    len(self.documents),
+                    len(terms),
+                    len(offsets),
+                    len(self.postings),
+                    len(documents),
+                )
+            )
+            outfile.writelines([terms, offsets, self.postings, documents])
+
+    @classmethod
+    def load(cls, path: str) -> SearchIndex:
+        """Read an index written by save"""
+        with open(path, "rb") as stream:
+            data = stream.read()
+        magic, index_format, term_count, document_count, *lengths = _HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC or index_format != INDEX_FORMAT:
+            raise Exception(f"Not a search index of format {INDEX_FORMAT} [{path}]")
+        sections = []
+        start = _HEADER.size
+        for length in lengths:
+            sections.append(data[start : start + length])
+            start += length
+        terms = sections[0].decode("utf-8").split("\n") if term_count else []
+        offsets = array("Q")
+        offsets.frombytes(sections[1])
+        documents = sections[3].split(b"\n") if document_count else []
+        return cls(terms, offsets, sections[2], documents)
+
+
+def build_search_index(catalog: Iterable[ConvertedEntry] | None = None) -> SearchIndex:
+    """Index the converted entries, by default the whole catalogue"""
+    term_documents: dict[str, list[int]] = {}
+    documents: list[bytes] = []
+    for document, converted in enumerate(converted_catalog() if catalog is None else catalog):
+        documents.append(json.dumps(entry_document(converted), ensure_ascii=False).encode("utf-8"))
+        for term in entry_terms(converted):
+            term_documents.setdefault(term, []).append(document)
+    terms = sorted(term_documents)
+    offsets = array("Q", [0])
+    postings = bytearray()
+    for term in terms:
+        previous = 0
+        for document in term_documents[term]:
+            _encode_varint(document - previous, postings)
+            previous = document
+        offsets.append(len(postings))
+    return SearchIndex(terms, offsets, bytes(postings), documents)
+
+
+def shard_name(term: str) -> str:
+    """Name of the search shard holding a term: the utf-8 hex of its first folded letters"""
+    return term[:SHARD_PREFIX_LENGTH].encode("utf-8").hex()
+
+
+def search_shards(catalog: Iterable[ConvertedEntry] | None = None) -> dict[str, dict[str, Any]]:
+    """Search index split by the first letters of the terms, for pages that load only the shard of a query.
+
+    Each shard maps its terms to the dbase numbers of the entries holding them, and these dbase numbers
+    to the titles of the entries
+    """
+    shards: dict[str, dict[str, Any]] = {}
+    for converted in converted_catalog() if catalog is None else catalog:
+        for term in sorted(entry_terms(converted)):
+            shard = shards.setdefault(shard_name(term), {"terms": {}, "titles": {}})
+            shard["terms"].setdefault(term, []).append(converted.dbase_number)
+            shard["titles"][str(converted.dbase_number)] = converted.title or ""
+    return shards
+
+
+def build_main():
+    """Build the search index of the catalogue"""
+    parser = argparse.ArgumentParser(description="Build the full text search index of the converted entries")
+    parser.add_argument("index_file", help="Index file to write")
+    args = parser.parse_args()
+    index = build_search_index()
+    index.save(args.index_file)
+    print(f"Indexed {len(index.documents)} entries, {len(index.terms)} terms, in {args.index_file}")
+
+
+def search_main():
+    """Search the catalogue"""
+    parser = argparse.ArgumentParser(
+        description="Find entries whose title, subtitle, authors, topics, editor or notes have words starting with "
+        "every word of the query, in Greek with or without accents or in Latin characters"
+    )
+    parser.add_argument("index_file", help="Index file written by build-search-index")
+    parser.add_argument("query", nargs="+", help="Words to look for")
+    parser.add_argument("--limit", type=int, default=50, help="Most results printed, 50 by default")
+    parser.add_argument("--json", action="store_true", help="Print the results as json lines")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    index = SearchIndex.load(args.index_file)
+    results = index.search(" ".join(args.query))
+    elapsed = time.perf_counter() - start
+    for result in results[: args.limit]:
+        if args.json:
+            print(json.dumps(result, ensure_ascii=False))
+        else:
+            authors = "; ".join(result["authors"])
+            print(f"{result['dbase_number']:>6}  {result['title'] or ''}  / {authors}  [{result['dewey'] or ''}]")
+    print(f"{len(results)} entries in {elapsed * 1000:.1f} ms", file=sys.stderr)
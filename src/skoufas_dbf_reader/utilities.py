@@ -2,19 +2,106 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import marshal
 import os
 import re
-from functools import cache
+import tempfile
+from collections.abc import Iterator, Mapping
+from functools import cache, lru_cache
+from types import MappingProxyType
 from typing import Any
 
 import yaml
 
+from skoufas_dbf_reader.catalogue import COLUMN_COUNT, Catalogue
+
+# libyaml parses the same documents as the pure python loader, only faster
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Bump when the layout of the cache files changes
+YAML_CACHE_FORMAT = 1
+
+# Entries parsed at a time by iter_yaml_entries
+YAML_STREAM_BATCH = 1000
+
+
+def yaml_cache_directory() -> str | None:
+    """Directory holding compiled yaml data, None if caching is disabled.
+
+    Set SKOUFAS_DBF_READER_CACHE_DIR to move the cache, or to an empty string to disable it
+    """
+    cache_directory = os.environ.get("SKOUFAS_DBF_READER_CACHE_DIR")
+    if cache_directory is not None:
+        return cache_directory or None
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "skoufas-dbf-reader")
+
+
+def _yaml_cache_file(cache_directory: str, path: str) -> str:
+    path_digest = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_directory, f"{os.path.basename(path)}.{path_digest}.marshal")
+
+
+def _read_yaml_cache(cache_file: str) -> tuple[tuple[Any, ...] | None, Any]:
+    try:
+        with open(cache_file, "rb") as stream:
+            # The cache is only ever written by _write_yaml_cache from data parsed with the safe loader
+            header = marshal.load(stream)  # nosec B302
+            if not isinstance(header, tuple) or len(header) != 4 or header[0] != YAML_CACHE_FORMAT:
+                return None, None
+            return header, marshal.load(stream)  # nosec B302
+    except (OSError, EOFError, ValueError, TypeError):
+        return None, None
+
+
+def _write_yaml_cache(cache_file: str, header: tuple[Any, ...], data: Any):
+    try:
+        payload = marshal.dumps(header) + marshal.dumps(data)
+    except ValueError:
+        # Not made only of plain types, keep parsing the yaml every time
+        return
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        file_descriptor, temporary_file = tempfile.mkstemp(dir=os.path.dirname(cache_file), suffix=".tmp")
+        with os.fdopen(file_descriptor, "wb") as stream:
+            stream.write(payload)
+        os.replace(temporary_file, cache_file)
+    except OSError:
+        pass
+
+
+def load_yaml_file(path: str) -> Any:
+    """Parse a yaml file, going through the compiled cache when it is up to date.
+
+    The cache is keyed on the modification time and size of the yaml file and falls back to
+    comparing its sha256 digest, so a touched but unchanged file does not need parsing again
+    """
+    cache_directory = yaml_cache_directory()
+    if not cache_directory:
+        with open(path, "rb") as stream:
+            return yaml.load(stream, Loader=YamlLoader)  # nosec B506
+
+    source_stat = os.stat(path)
+    cache_file = _yaml_cache_file(cache_directory, path)
+    header, data = _read_yaml_cache(cache_file)
+    if header and header[1:3] == (source_stat.st_mtime_ns, source_stat.st_size):
+        return data
+
+    with open(path, "rb") as stream:
+        source = stream.read()
+    digest = hashlib.sha256(source).hexdigest()
+    if not header or header[3] != digest:
+        data = yaml.load(source, Loader=YamlLoader)  # nosec B506
+    _write_yaml_cache(cache_file, (YAML_CACHE_FORMAT, source_stat.st_mtime_ns, source_stat.st_size, digest), data)
+    return data
+
 
 def read_yaml_data(code: str) -> Any:
     """Return the only object from a yaml file in the data directory"""
-    with open(os.path.join(os.path.dirname(__file__), "data", f"{code}.yml"), encoding="utf-8") as stream:
-        parsed_yaml = yaml.safe_load(stream)
-        return parsed_yaml[code]
+    parsed_yaml = load_yaml_file(os.path.join(os.path.dirname(__file__), "data", f"{code}.yml"))
+    return parsed_yaml[code]
 
 
 def none_if_empty_or_stripped(i: str | None) -> str | None:
@@ -26,101 +113,191 @@ def none_if_empty_or_stripped(i: str | None) -> str | None:
     return i.strip()
 
 
+def entries_file() -> str:
+    """Yaml file holding the entries, SKOUFAS_DBF_READER_ENTRIES replaces the one in the data directory.
+
+    It can also point to a JSON Lines file written by dbf-to-jsonl, whose name ends in .jsonl, or to the
+    DBF file itself, whose name ends in .dbf
+    """
+    return os.environ.get("SKOUFAS_DBF_READER_ENTRIES") or os.path.join(
+        os.path.dirname(__file__), "data", "entries.yml"
+    )
+
+
+def iter_jsonl_entries(path: str, start: int = 0, stop: int | None = None) -> Iterator[dict[int, Any]]:
+    """Stream the entries of a file written by dbf-to-jsonl, with the column numbers as integer keys.
+
+    Only the lines starting at a byte offset from start up to stop are read, so that a file can be
+    split between workers at any offsets, see jsonl_byte_ranges
+    """
+    with open(path, "rb") as stream:
+        if start:
+            # a line starting before start belongs to the previous range
+            stream.seek(start - 1)
+            stream.readline()
+        while stop is None or stream.tell() < stop:
+            line = stream.readline()
+            if not line:
+                break
+            if line.strip():
+                yield {int(key): value for key, value in json.loads(line).items()}
+
+
+def jsonl_byte_ranges(path: str, parts: int) -> list[tuple[int, int]]:
+    """Split a file in byte ranges of about the same size, to read with iter_jsonl_entries"""
+    size = os.path.getsize(path)
+    return [(size * part // parts, size * (part + 1) // parts) for part in range(parts)]
+
+
+def iter_yaml_entries(path: str) -> Iterator[dict[int, Any]]:
+    """Stream the entries of an entries.yml file, parsing a batch of entries at a time.
+
+    Relies on the layout written by dbf-to-yaml, where every entry starts with "- " at the start of
+    a line, files in any other layout are parsed whole
+    """
+    with open(path, encoding="utf-8") as stream:
+        if stream.readline() != "entries:\n":
+            stream.seek(0)
+            yield from (yaml.load(stream, Loader=YamlLoader) or {}).get("entries") or []  # nosec B506
+            return
+        batch: list[str] = []
+        batch_entries = 0
+        for line in stream:
+            if line.startswith("- "):
+                if batch_entries == YAML_STREAM_BATCH:
+                    yield from yaml.load("".join(batch), Loader=YamlLoader)  # nosec B506
+                    batch = []
+                    batch_entries = 0
+                batch_entries += 1
+            batch.append(line)
+        if batch:
+            yield from yaml.load("".join(batch), Loader=YamlLoader) or []  # nosec B506
+
+
+def iter_raw_entries(path: str) -> Iterator[Mapping[int, Any]]:
+    """Stream the entries of a yaml, JSON Lines (.jsonl) or DBF (.dbf) file as stored, empty columns left out"""
+    if path.lower().endswith(".dbf"):
+        # dbf_to_yaml imports the extractors, which import this module
+        from skoufas_dbf_reader.dbf_to_yaml import iter_dbf_entries  # pylint: disable=import-outside-toplevel
+
+        return iter_dbf_entries(path)
+    if path.endswith(".jsonl"):
+        return iter_jsonl_entries(path)
+    return iter_yaml_entries(path)
+
+
+def iter_entries(path: str | None = None) -> Iterator[Mapping[int, Any]]:
+    """Stream read only entries padded with None up to column 30, without keeping them in memory.
+
+    Reads entries_file() by default, or any yaml, JSON Lines (.jsonl) or DBF (.dbf) file
+    """
+    for entry in iter_raw_entries(path or entries_file()):
+        padded: dict[int, Any] = dict.fromkeys(range(COLUMN_COUNT))
+        padded.update(entry)
+        yield MappingProxyType(padded)
+
+
+@cache
+def entries_catalogue() -> Catalogue:
+    """All entries converted from a DBF file, stored column by column.
+
+    Yaml files go through the compiled cache of load_yaml_file, DBF and JSON Lines files are streamed
+    """
+    path = entries_file()
+    if path.lower().endswith((".dbf", ".jsonl")):
+        return Catalogue.from_entries(iter_raw_entries(path))
+    return Catalogue.from_entries(load_yaml_file(path)["entries"])
+
+
 @cache
 def all_entries() -> list[dict[int, str]]:
-    """All entries converted from a DBF file"""
-    data = read_yaml_data("entries")
-    for entry in data:
-        for i in range(0, 31):
-            if i not in entry:
-                entry[i] = None
-    return data
+    """All entries converted from a DBF file, as dicts with every column from 0 to 30"""
+    return [dict(entry) for entry in entries_catalogue()]
+
 
+# Lowercase Greek letters transcribed the same way wherever they appear
+_ROMANIZE_LETTERS = {
+    **dict(zip("άβδέζήιίϊΐκλνξόπρσςτυύϋΰφωώ", "avdeziiiiiklnxoprsstyyyyfoo")),
+    "θ": "th",
+    "χ": "ch",
+    "ψ": "ps",
+}
+# Vowels forming av/ef/if with a following υ
+_ROMANIZE_YPSILON_DIGRAPHS = {"α": "a", "ε": "e", "η": "i"}
+_ROMANIZE_YPSILONS = ("υ", "ύ")
+# A digraph at the end of the text is transcribed with v
+_ROMANIZE_BEFORE_V = frozenset(("", *"βγδζλμνραάεέηήιίϊΐοόυύϋΰωώ"))
+_ROMANIZE_BEFORE_F = frozenset("θκξπστφχψ")
+# γ at the end of the text is transcribed as nch
+_ROMANIZE_GAMMA_DIGRAPHS = {"γ": "ng", "ξ": "nx", "χ": "nch", "": "nch"}
 
+
+@lru_cache(maxsize=65536)
 def romanize(greek_text: str | None) -> str:
     """Return the ISO 843:1997 transcription of the input Greek text.
     Any non-Greek characters will be ignored and printed as they were.
 
-    This function is (c) George Schizas, released under the Apache 2,0 licence
+    Based on the function by George Schizas, released under the Apache 2,0 licence
     See https://github.com/gschizas/RomanizePython/blob/master/src/romanize/romanize.py
     """
 
     if not greek_text:
         return ""
-    result = ""
+    length = len(greek_text)
+    # letters are lowered one at a time, str.lower on the whole text would turn a final Σ into ς
+    lowered = [letter.lower() for letter in greek_text]
+    # characters without case count as uppercase
+    uppercase = [letter.upper() == letter for letter in greek_text]
+    uppercase.append(True)
+    result: list[str] = []
     cursor = 0
-    while cursor < len(greek_text):
-        letter = greek_text[cursor]
-        prev_letter = greek_text[cursor - 1] if cursor > 0 else ""
-        next_letter = greek_text[cursor + 1] if cursor < len(greek_text) - 1 else ""
-        third_letter = greek_text[cursor + 2] if cursor < len(greek_text) - 2 else ""
-
-        is_upper = letter.upper() == letter
-        is_upper_next = next_letter.upper() == next_letter
-        letter = letter.lower()
-        prev_letter = prev_letter.lower()
-        next_letter = next_letter.lower()
-        third_letter = third_letter.lower()
-
-        simple_translation_greek = "άβδέζήιίϊΐκλνξόπρσςτυύϋΰφωώ"
-        simple_translation_latin = "avdeziiiiiklnxoprsstyyyyfoo"
-
-        digraph_translation_greek = "θχψ"
-        digraph_translation_latin = "thchps"
-
-        digraph_ypsilon_greek = "αεη"
-        digraph_ypsilon_latin = "aei"
-        digraph_ypsilon_beta = "βγδζλμνραάεέηήιίϊΐοόυύϋΰωώ"
-        digraph_ypsilon_phi = "θκξπστφχψ"
-
-        if letter in simple_translation_greek:
-            new_letter = simple_translation_latin[simple_translation_greek.index(letter)]
-        elif letter in digraph_translation_greek:
-            diphthong_index = digraph_translation_greek.index(letter)
-            new_letter = digraph_translation_latin[diphthong_index * 2 : diphthong_index * 2 + 2]
-        elif letter in digraph_ypsilon_greek:
-            new_letter = digraph_ypsilon_latin[digraph_ypsilon_greek.index(letter)]
-            if next_letter in ["υ", "ύ"]:
-                if third_letter in digraph_ypsilon_beta:
-                    new_letter += "v"
-                    cursor += 1
-                elif third_letter in digraph_ypsilon_phi:
-                    new_letter += "f"
+    while cursor < length:
+        start = cursor
+        letter = lowered[cursor]
+        new_letter = _ROMANIZE_LETTERS.get(letter)
+        if new_letter is None:
+            next_letter = lowered[cursor + 1] if cursor + 1 < length else ""
+            if letter in _ROMANIZE_YPSILON_DIGRAPHS:
+                new_letter = _ROMANIZE_YPSILON_DIGRAPHS[letter]
+                if next_letter in _ROMANIZE_YPSILONS:
+                    third_letter = lowered[cursor + 2] if cursor + 2 < length else ""
+                    if third_letter in _ROMANIZE_BEFORE_V:
+                        new_letter += "v"
+                        cursor += 1
+                    elif third_letter in _ROMANIZE_BEFORE_F:
+                        new_letter += "f"
+                        cursor += 1
+            elif letter == "γ":
+                new_letter = _ROMANIZE_GAMMA_DIGRAPHS.get(next_letter)
+                if new_letter is None:
+                    new_letter = "g"
+                else:
                     cursor += 1
-        elif letter == "γ":
-            if next_letter == "γ":
-                new_letter = "ng"
-                cursor += 1
-            elif next_letter == "ξ":
-                new_letter = "nx"
-                cursor += 1
-            elif next_letter in "χ":
-                new_letter = "nch"
-                cursor += 1
-            else:
-                new_letter = "g"
-        elif letter == "μ":
-            if next_letter == "π":
-                if prev_letter.strip() == "" or third_letter.strip() == "":
-                    new_letter = "b"
+            elif letter == "μ":
+                if next_letter == "π":
+                    prev_letter = lowered[cursor - 1] if cursor > 0 else ""
+                    third_letter = lowered[cursor + 2] if cursor + 2 < length else ""
+                    new_letter = "b" if prev_letter.strip() == "" or third_letter.strip() == "" else "mp"
                     cursor += 1
                 else:
-                    new_letter = "mp"
+                    new_letter = "m"
+            elif letter == "ο":
+                if next_letter in _ROMANIZE_YPSILONS:
+                    new_letter = "ou"
                     cursor += 1
+                else:
+                    new_letter = "o"
+            else:
+                new_letter = letter
+        if uppercase[start]:
+            # the letter after an uppercase one decides whether the rest of a digraph is uppercase
+            if uppercase[start + 1]:
+                new_letter = new_letter.upper()
             else:
-                new_letter = "m"
-        elif letter == "ο":
-            new_letter = "o"
-            if next_letter in ["υ", "ύ"]:
-                new_letter += "u"
-                cursor += 1
-        else:
-            new_letter = letter
-        if is_upper:
-            new_letter = new_letter[0].upper() + (new_letter[1:].upper() if is_upper_next else new_letter[1:].lower())
-        result += new_letter
+                new_letter = new_letter[0].upper() + new_letter[1:].lower()
+        result.append(new_letter)
         cursor += 1
-    return result
+    return "".join(result)
 
 
 def check_isbn(isbn: str) -> str | None:
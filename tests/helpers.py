@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+
+def padded_entry(values: dict[int, str | int]) -> dict[int, str]:
+    """DBF entry with every column up to 30, None unless given"""
+    entry: dict[int, str | int | None] = dict.fromkeys(range(31))
+    entry.update(values)
+    return entry  # type: ignore[return-value]
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import pytest
+
+from skoufas_dbf_reader.catalogue import Catalogue
+from skoufas_dbf_reader.utilities import all_entries, entries_catalogue
+
+
+def test_catalogue():
+    catalogue = Catalogue.from_entries([{0: 1, 2: "ΤΙΤΛΟΣ", 9: "ΑΘΗΝΑ"}, {0: 2, 9: "ΑΘΗΝΑ"}])
+    assert len(catalogue) == 2
+    entry = catalogue[1]
+    assert entry[0] == 2
+    assert entry[2] is None
+    assert entry[9] == "ΑΘΗΝΑ"
+    assert 30 in entry
+    assert 31 not in entry
+    with pytest.raises(KeyError):
+        entry[31]
+    assert dict(catalogue[0]) == {0: 1, 2: "ΤΙΤΛΟΣ", 9: "ΑΘΗΝΑ"} | {i: None for i in range(31) if i not in (0, 2, 9)}
+    assert [entry[0] for entry in catalogue] == [1, 2]
+    assert [entry[0] for entry in catalogue[-1:]] == [2]
+    assert catalogue.column(2) == ["ΤΙΤΛΟΣ", None]
+    assert catalogue.by_dbase_number(2) == catalogue[1]
+    with pytest.raises(IndexError):
+        catalogue[2]
+
+
+def test_catalogue_shares_equal_values():
+    first, second = ("ΑΘΗΝΑ".encode().decode() for _ in range(2))
+    assert first is not second
+    catalogue = Catalogue.from_entries([{0: 1, 9: first}, {0: 2, 9: second}])
+    assert catalogue.column(9)[0] is catalogue.column(9)[1]
+
+
+def test_entries_catalogue():
+    catalogue = entries_catalogue()
+    entries = all_entries()
+    assert len(catalogue) == len(entries)
+    assert catalogue[1000] == entries[1000]
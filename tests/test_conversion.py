@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from skoufas_dbf_reader.catalogue import Catalogue
+from skoufas_dbf_reader.conversion import (
+    FIELD_SPECS,
+    FieldSpec,
+    convert_catalogue,
+    convert_entry,
+    converted_catalog,
+    iter_converted_entries,
+)
+from skoufas_dbf_reader.utilities import entries_catalogue
+
+from helpers import padded_entry
+
+
+def test_convert_entry():
+    entry = padded_entry(
+        {
+            0: 12,
+            1: "BITSIOS,DIMITRIS                  AGL",
+            2: "english title",
+            4: "001.009ΚΟΝ ",
+            5: "2710-2709",
+            6: "2847 ΠΑΠΑΡΡΟΔΟΥ,ΝΙΚ",
+            8: '"Η ΔΑΜΑΣΚΟΣ"',
+            9: "ΑΘΗΝΑ 1984",
+            10: "2010",
+            11: "127Σ",
+            12: "foobar-(19 ΑΙΩΝΑ)",
+            17: "ΒΙΒΙΟΘΗΚΗ ΓΑΡΟΥΦΑΛΙΑ",
+            18: "2ΑΝΤΙΤΥΠΑ",
+            21: "ΑΝΑΤΥΠΟ",
+            30: "ΠΕΡΙΕΧΕΙ CD",
+        }
+    )
+    converted = convert_entry(entry)
+    assert converted.dbase_number == 12
+    assert converted.authors == ["ΒΙΤΣΙΟΣ,ΔΗΜΗΤΡΗΣ"]
+    assert converted.language == "en"
+    assert converted.title == "english title"
+    assert converted.subtitle is None
+    assert converted.dewey == "001.009 ΚΟΝ"
+    assert converted.entry_numbers == ["2710", "2709", "2847"]
+    assert converted.translators == ["ΠΑΠΑΡΡΟΔΟΥ,ΝΙΚΟΛΑΟΣ"]
+    assert converted.editor == ("Η ΔΑΜΑΣΚΟΣ", "ΑΘΗΝΑ")
+    assert converted.edition_year == 1984
+    assert converted.pages == 127
+    assert converted.topics == ["19 ΑΙΩΝΑΣ", "foobar"]
+    assert converted.copies == 2
+    assert converted.donors == ["ΒΙΒΛΙΟΘΗΚΗ ΓΑΡΟΥΦΑΛΙΑ"]
+    assert converted.has_cd
+    assert not converted.has_dvd
+    assert converted.offprint
+    assert converted.original_entry is entry
+
+
+def test_convert_entry_as_dict():
+    entry = padded_entry({0: 1, 2: "ΤΙΤΛΟΣ", 6: "2847 ΠΑΠΑΡΡΟΔΟΥ,ΝΙΚ", 17: "9789601419985"})
+    assert convert_entry(entry).as_dict() == {
+        "dbase_number": 1,
+        "authors": [],
+        "title": "ΤΙΤΛΟΣ",
+        "entry_numbers": ["2847"],
+        "translators": ["ΠΑΠΑΡΡΟΔΟΥ,ΝΙΚΟΛΑΟΣ"],
+        "topics": [],
+        "has_cd": False,
+        "has_dvd": False,
+        "offprint": False,
+        "ean": "9789601419985",
+        "original_entry": entry,
+    }
+
+
+def test_field_specs_are_unique():
+    names = [spec.name for spec in FIELD_SPECS]
+    assert len(names) == len(set(names))
+
+
+def test_convert_catalogue():
+    entries = [
+        padded_entry({0: 1, 2: "ΤΙΤΛΟΣ", 9: "ΑΘΗΝΑ 1984", 12: "foobar-(19 ΑΙΩΝΑ)"}),
+        padded_entry({0: 2, 1: "BITSIOS,DIMITRIS                  AGL", 11: "127Σ", 18: "2ΑΝΤΙΤΥΠΑ"}),
+    ]
+    converted = convert_catalogue(Catalogue.from_entries(entries))
+    assert [entry.as_dict() for entry in converted] == [convert_entry(entry).as_dict() for entry in entries]
+
+
+def test_extract_columns_runs_once_per_distinct_value():
+    calls: list[str | None] = []
+
+    def extractor(value: str | None) -> str | None:
+        calls.append(value)
+        return value and value.lower()
+
+    catalogue = Catalogue.from_entries([{0: 1, 9: "ΑΘΗΝΑ"}, {0: 2}, {0: 3, 9: "ΑΘΗΝΑ"}, {0: 4}])
+    spec = FieldSpec("place", extractor, (9,), distinct=True)
+    assert spec.extract_columns(catalogue) == ["αθηνα", None, "αθηνα", None]
+    assert calls == ["ΑΘΗΝΑ", None]
+    assert FieldSpec("place", extractor, (9,)).extract_columns(catalogue) == spec.extract_columns(catalogue)
+
+
+def test_distinct_field_specs_return_immutable_values():
+    for spec in FIELD_SPECS:
+        if spec.distinct:
+            for value in spec.extract_columns(entries_catalogue()):
+                assert value is None or isinstance(value, (str, int, tuple)), spec.name
+
+
+def test_iter_converted_entries():
+    converted_catalog.cache_clear()
+    streamed = [converted.as_dict() for converted in iter_converted_entries()]
+    assert converted_catalog.cache_info().currsize == 0
+    assert streamed == [converted.as_dict() for converted in converted_catalog()]
+    assert next(iter_converted_entries()) is converted_catalog()[0]
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import struct
+
+import yaml
+
+from skoufas_dbf_reader.dbf_to_yaml import (
+    convert_dbf_to_jsonl,
+    convert_dbf_to_yaml,
+    write_entries_jsonl,
+    write_entries_yaml,
+)
+from skoufas_dbf_reader.utilities import entries_catalogue, iter_entries, iter_jsonl_entries
+
+
+def write_dbf(path: str, records: list[dict[str, str]], field_names: list[str], width: int = 40):
+    """Write a minimal dBase III file with character fields only"""
+    header_length = 32 + 32 * len(field_names) + 1
+    record_length = 1 + width * len(field_names)
+    with open(path, "wb") as outfile:
+        outfile.write(struct.pack("<BBBBIHH20x", 3, 125, 1, 1, len(records), header_length, record_length))
+        outfile.writelines(struct.pack("<11sc4xBB14x", name.encode("ascii"), b"C", width, 0) for name in field_names)
+        outfile.write(b"\r")
+        for record in records:
+            outfile.write(b" ")
+            outfile.writelines(record.get(name, "").encode("cp737").ljust(width, b" ") for name in field_names)
+        outfile.write(b"\x1a")
+
+
+def test_write_entries_yaml_matches_single_dump():
+    entries: list[dict[int, str | int]] = [
+        {0: 1, 1: "ΚΕΛΕΣΙΔΗΣ, ΤΕΛΗΣ " * 10, 2: "x: y"},
+        {0: 2, 5: "2710-2709", 30: "a'b\"c"},
+    ]
+    outfile = io.StringIO()
+    assert write_entries_yaml(entries, outfile, progress_every=1) == 2
+    assert outfile.getvalue() == yaml.dump({"entries": entries}, default_flow_style=False, allow_unicode=True)
+
+
+def test_write_entries_yaml_empty():
+    outfile = io.StringIO()
+    assert write_entries_yaml([], outfile) == 0
+    assert outfile.getvalue() == yaml.dump({"entries": []}, default_flow_style=False, allow_unicode=True)
+
+
+def test_convert_dbf_to_yaml(tmp_path):
+    dbf_file = os.path.join(tmp_path, "entries.dbf")
+    yaml_file = os.path.join(tmp_path, "entries.yml")
+    write_dbf(
+        dbf_file,
+        [{"A01": "ΚΕΛΕΣΙΔΗΣ, ΤΕΛΗΣ", "A02": "ΤΙΤΛΟΣ"}, {"A05": "2710-2709"}],
+        [f"A{i:02}" for i in range(1, 31)],
+    )
+    convert_dbf_to_yaml(dbf_file, yaml_file)
+    with open(yaml_file, encoding="utf-8") as stream:
+        assert yaml.safe_load(stream) == {
+            "entries": [{0: 1, 1: "ΚΕΛΕΣΙΔΗΣ, ΤΕΛΗΣ", 2: "ΤΙΤΛΟΣ"}, {0: 2, 5: "2710-2709"}],
+        }
+    assert list(iter_entries(dbf_file)) == list(iter_entries(yaml_file))
+    assert next(iter_entries(dbf_file))[30] is None
+
+
+def test_write_entries_jsonl():
+    entries: list[dict[int, str | int]] = [{0: 1, 1: "ΚΕΛΕΣΙΔΗΣ, ΤΕΛΗΣ", 2: "a\nb"}, {0: 2, 5: "2710-2709"}]
+    outfile = io.StringIO()
+    assert write_entries_jsonl(entries, outfile, progress_every=1) == 2
+    lines = outfile.getvalue().splitlines()
+    assert lines[0] == '{"0":1,"1":"ΚΕΛΕΣΙΔΗΣ, ΤΕΛΗΣ","2":"a\\nb"}'
+    assert len(lines) == 2
+
+
+def test_convert_dbf_to_jsonl(tmp_path):
+    dbf_file = os.path.join(tmp_path, "entries.dbf")
+    jsonl_file = os.path.join(tmp_path, "entries.jsonl")
+    write_dbf(
+        dbf_file,
+        [{"A01": "ΚΕΛΕΣΙΔΗΣ, ΤΕΛΗΣ", "A02": "ΤΙΤΛΟΣ"}, {"A05": "2710-2709"}],
+        [f"A{i:02}" for i in range(1, 31)],
+    )
+    convert_dbf_to_jsonl(dbf_file, jsonl_file)
+    assert list(iter_jsonl_entries(jsonl_file)) == [
+        {0: 1, 1: "ΚΕΛΕΣΙΔΗΣ, ΤΕΛΗΣ", 2: "ΤΙΤΛΟΣ"},
+        {0: 2, 5: "2710-2709"},
+    ]
+
+    convert_dbf_to_jsonl(dbf_file, jsonl_file, converted=True)
+    with open(jsonl_file, encoding="utf-8") as stream:
+        converted = [json.loads(line) for line in stream]
+    assert converted[0]["title"] == "ΤΙΤΛΟΣ"
+    assert converted[1]["entry_numbers"] == ["2710", "2709"]
+    assert converted[1]["original_entry"]["5"] == "2710-2709"
+
+
+def test_dbf_source(tmp_path, monkeypatch):
+    dbf_file = os.path.join(tmp_path, "ENTRIES.DBF")
+    yaml_file = os.path.join(tmp_path, "entries.yml")
+    write_dbf(
+        dbf_file,
+        [{"A01": "ΚΕΛΕΣΙΔΗΣ, ΤΕΛΗΣ", "A02": "ΤΙΤΛΟΣ"}, {"A05": "2710-2709"}],
+        [f"A{i:02}" for i in range(1, 31)],
+    )
+    convert_dbf_to_yaml(dbf_file, yaml_file)
+    catalogues = []
+    for source in (dbf_file, yaml_file):
+        monkeypatch.setenv("SKOUFAS_DBF_READER_ENTRIES", source)
+        entries_catalogue.cache_clear()
+        try:
+            catalogues.append(entries_catalogue())
+        finally:
+            entries_catalogue.cache_clear()
+    assert catalogues[0].columns == catalogues[1].columns
+    assert catalogues[0][0][2] == "ΤΙΤΛΟΣ"
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+
+from skoufas_dbf_reader.correction_data import WHOLE_TABLE, field17_corrections, record_lookups
+from skoufas_dbf_reader.dependencies import (
+    DependencyGraph,
+    affected_reports,
+    build_dependency_graph,
+    changed_keys,
+    trace_entry,
+)
+
+from helpers import padded_entry
+
+
+def test_record_lookups():
+    with record_lookups() as outer:
+        field17_corrections().get("ΑΝΑΤΥΠΟ")
+        with record_lookups() as inner:
+            "2ΑΝΤΙΤΥΠΑ" in field17_corrections()  # noqa: B015
+        assert inner == {("field17_corrections", "2ΑΝΤΙΤΥΠΑ")}
+    assert outer == {("field17_corrections", "ΑΝΑΤΥΠΟ"), ("field17_corrections", "2ΑΝΤΙΤΥΠΑ")}
+    assert type(field17_corrections()) is dict
+
+
+def test_trace_entry():
+    traced = trace_entry(padded_entry({0: 1, 1: "BITSIOS,DIMITRIS                  AGL", 9: "ΑΘΗΝΑ 1984", 10: "2010"}))
+    assert ("author_corrections", "BITSIOS,DIMITRIS") in traced["authors"]
+    assert ("language_codes", WHOLE_TABLE) in traced["language"]
+    assert traced["edition_year"] == {("field09_corrections", "ΑΘΗΝΑ 1984")}
+    assert traced["title"] == set()
+
+
+def test_dependency_graph(tmp_path):
+    graph = build_dependency_graph(
+        [
+            padded_entry({0: 1, 9: "ΑΘΗΝΑ 1984"}),
+            padded_entry({0: 2, 9: "ΘΕΣΣΑΛΟΝΙΚΗ", 11: "127Σ"}),
+            padded_entry({0: 3, 1: "ΚΕΛΕΣΙΔΗΣ, ΤΕΛΗΣ                       Ι"}),
+        ]
+    )
+    changed = changed_keys("field09_corrections", {"ΑΘΗΝΑ 1984": "ΑΘΗΝΑ"}, {"ΑΘΗΝΑ 1984": {"place": "ΑΘΗΝΑ"}})
+    assert changed == {("field09_corrections", "ΑΘΗΝΑ 1984")}
+    assert graph.affected_entries(changed) == {1: {"editor", "edition_year"}}
+    # a new key matters to the entries that looked it up without finding it
+    assert graph.affected_entries(changed_keys("field11_corrections", {}, {"127Σ": "127"})) == {2: {"pages"}}
+    # every entry with an author reads the whole list of language codes
+    assert set(graph.affected_entries([("language_codes", "GAL")])) == {3}
+
+    graph_file = os.path.join(tmp_path, "graph.json")
+    graph.save(graph_file)
+    assert DependencyGraph.load(graph_file) == graph
+
+
+def test_affected_reports():
+    assert affected_reports({"dewey"}, ["field04_corrections"]) == [
+        "report_entries",
+        "report_invalid_dewey",
+        "report_single_extracted_fields",
+    ]
+    assert affected_reports([], ["author_corrections"]) == ["report_single_extracted_fields"]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from skoufas_dbf_reader.conversion import convert_entry
+from skoufas_dbf_reader.duplicate_books import (
+    SAME_ISBN,
+    SAME_SIGNATURE,
+    SIMILAR_SIGNATURE,
+    DuplicateGroup,
+    find_duplicate_books,
+    minhash,
+    normalize_isbn,
+    signature,
+)
+
+from helpers import padded_entry
+
+
+def test_normalize_isbn():
+    assert normalize_isbn("960-88458-3-1") == "9789608845831"
+    assert normalize_isbn("978-960-88458-3-1") == "9789608845831"
+    assert normalize_isbn("0-19-853453-X") == normalize_isbn("9780198534532")
+    assert normalize_isbn(" - ") is None
+    assert normalize_isbn(None) is None
+
+
+def test_signature():
+    first = convert_entry(padded_entry({0: 1, 1: "ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ", 2: "Η ΑΣΚΗΤΙΚΗ", 10: "1971"}))
+    second = convert_entry(padded_entry({0: 2, 1: "Καζαντζάκης,Νίκος", 2: "Η Ασκητική", 10: "1971"}))
+    assert signature(first) == ("η ασκητικη", ("καζαντζακησ νικοσ",), 1971)
+    assert signature(first) == signature(second)
+    assert minhash(first) == minhash(second)
+    assert signature(convert_entry(padded_entry({0: 3, 1: "ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ"}))) is None
+
+
+def test_find_duplicate_books():
+    catalog = [
+        convert_entry(padded_entry({0: 1, 1: "ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ", 2: "Η ΑΣΚΗΤΙΚΗ", 10: "1971"})),
+        convert_entry(padded_entry({0: 2, 1: "ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ", 2: "Η ΑΣΚΗΤΙΚΗ", 10: "1971"})),
+        convert_entry(padded_entry({0: 3, 1: "ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ", 2: "Η ΑΣΚΗΤΙΚΗ", 10: "1985"})),
+        convert_entry(padded_entry({0: 4, 1: "HOMER", 2: "Η ΟΔΥΣΣΕΙΑ ΤΟΥ ΟΜΗΡΟΥ ΣΕ ΝΕΑ ΜΕΤΑΦΡΑΣΗ", 10: "1990"})),
+        convert_entry(padded_entry({0: 5, 1: "HOMER", 2: "Η ΟΔΥΣΣΙΑ ΤΟΥ ΟΜΗΡΟΥ ΣΕ ΝΕΑ ΜΕΤΑΦΡΑΣΗ"})),
+        convert_entry(padded_entry({0: 6, 2: "ΑΛΛΟ ΒΙΒΛΙΟ", 19: "960-88458-3-1"})),
+        convert_entry(padded_entry({0: 7, 2: "ΚΑΤΙ ΑΛΛΟ", 19: "978-960-88458-3-1"})),
+        convert_entry(padded_entry({0: 8, 1: "HOMER"})),
+        convert_entry(padded_entry({0: 9, 1: "HOMER"})),
+    ]
+    assert find_duplicate_books(catalog) == [
+        DuplicateGroup([1, 2], [SAME_SIGNATURE]),
+        DuplicateGroup([4, 5], [SIMILAR_SIGNATURE]),
+        DuplicateGroup([6, 7], [SAME_ISBN]),
+    ]
+
+
+def test_similar_titles_need_an_author_in_common():
+    catalog = [
+        convert_entry(padded_entry({0: 1, 1: "HOMER", 2: "Η ΟΔΥΣΣΕΙΑ ΤΟΥ ΟΜΗΡΟΥ"})),
+        convert_entry(padded_entry({0: 2, 1: "ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ", 2: "Η ΟΔΥΣΣΕΙΑ ΤΟΥ ΟΜΗΡΟΥ"})),
+        convert_entry(padded_entry({0: 3, 2: "Η ΟΔΥΣΣΕΙΑ ΤΟΥ ΟΜΗΡΟΥ."})),
+    ]
+    assert find_duplicate_books(catalog[:2]) == []
+    assert find_duplicate_books(catalog[1:]) == [DuplicateGroup([2, 3], [SIMILAR_SIGNATURE])]
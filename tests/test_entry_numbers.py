@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from skoufas_dbf_reader.conversion import convert_entry
+from skoufas_dbf_reader.entry_numbers import EntryNumberIndex, normalize_entry_number
+
+from helpers import padded_entry
+
+
+def test_normalize_entry_number():
+    assert normalize_entry_number(" 2710 ") == "2710"
+    assert normalize_entry_number("02710") == "2710"
+    assert normalize_entry_number("11921A") == "11921Α"
+    assert normalize_entry_number("11921α") == "11921Α"
+    assert normalize_entry_number("11921Α") == "11921Α"
+
+
+def test_entry_number_index(tmp_path):
+    catalog = [
+        convert_entry(padded_entry({0: 1, 5: "2710-2709"})),
+        convert_entry(padded_entry({0: 2, 5: "2710"})),
+        convert_entry(padded_entry({0: 3, 2: "ΧΩΡΙΣ ΑΡΙΘΜΟ"})),
+        convert_entry(padded_entry({0: 4, 5: "11921Α-10"})),
+        convert_entry(padded_entry({0: 5, 5: "02710-11921a"})),
+    ]
+    index = EntryNumberIndex.from_catalog(catalog)
+    assert index.lookup("2710") == [1, 2, 5]
+    assert index.lookup("02709") == [1]
+    assert index.lookup("11921A") == [4, 5]
+    assert index.lookup("1") == []
+    assert "11921a" in index
+    assert 2710 not in index
+    assert len(index) == 4
+    assert index.no_entry_numbers == [3]
+    assert index.duplicates() == {
+        "2710": [(1, "2710"), (2, "2710"), (5, "02710")],
+        "11921Α": [(4, "11921Α"), (5, "11921a")],
+    }
+    assert index.non_numeric() == {"11921Α": [(4, "11921Α"), (5, "11921a")]}
+    assert index.numeric_range(10, 2709) == {"10": [4], "2709": [1]}
+    assert index.numeric_range(2709, 2710) == {"2709": [1], "2710": [1, 2, 5]}
+    assert index.numeric_range(11, 2708) == {}
+
+    index_file = os.path.join(tmp_path, "entry_numbers.json")
+    index.save(index_file)
+    loaded = EntryNumberIndex.load(index_file)
+    assert loaded.dbase_numbers == index.dbase_numbers
+    assert loaded.occurrences == index.occurrences
+    assert loaded.no_entry_numbers == [3]
+    assert loaded.numeric_range(0, 100000) == {"10": [4], "2709": [1], "2710": [1, 2, 5]}
+
+
+def test_entry_number_index_rejects_other_files(tmp_path):
+    index_file = os.path.join(tmp_path, "entry_numbers.json")
+    with open(index_file, "w", encoding="utf-8") as outfile:
+        outfile.write("[]")
+    with pytest.raises(Exception, match="Not an entry number index"):
+        EntryNumberIndex.load(index_file)
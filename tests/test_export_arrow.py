@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from skoufas_dbf_reader.catalogue import Catalogue
+from skoufas_dbf_reader.conversion import convert_entry, converted_catalog
+from skoufas_dbf_reader.export_arrow import converted_table, export_arrow, raw_table
+from skoufas_dbf_reader.utilities import entries_catalogue
+
+pa = pytest.importorskip("pyarrow")
+
+
+def test_raw_table():
+    table = raw_table(Catalogue.from_entries([{0: 1, 2: "ΤΙΤΛΟΣ", 9: "ΑΘΗΝΑ"}, {0: 2, 9: "ΑΘΗΝΑ"}]))
+    assert table.column_names == ["dbase_number", *(f"A{i:02}" for i in range(1, 31))]
+    assert pa.types.is_dictionary(table.schema.field("A09").type)
+    assert table.column("A09").to_pylist() == ["ΑΘΗΝΑ", "ΑΘΗΝΑ"]
+    assert table.column("A02").to_pylist() == ["ΤΙΤΛΟΣ", None]
+
+
+def test_converted_table():
+    entry = dict.fromkeys(range(31))
+    entry.update({0: 1, 1: "BITSIOS,DIMITRIS                  AGL", 9: "ΑΘΗΝΑ 1984", 12: "foobar-(19 ΑΙΩΝΑ)"})
+    table = converted_table([convert_entry(entry)])
+    row = table.to_pylist()[0]
+    assert row["authors"] == ["ΒΙΤΣΙΟΣ,ΔΗΜΗΤΡΗΣ"]
+    assert row["topics"] == ["19 ΑΙΩΝΑΣ", "foobar"]
+    assert row["translators"] == []
+    assert row["edition_year"] == 1984
+    assert row["language"] == "en"
+    assert row["has_cd"] is False
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_export_arrow(tmp_path, file_format):
+    paths = export_arrow(os.path.join(tmp_path, "export"), file_format)
+    assert [os.path.basename(path) for path in paths] == [f"entries.{file_format}", f"converted_entries.{file_format}"]
+    if file_format == "parquet":
+        import pyarrow.parquet
+
+        tables = [pyarrow.parquet.read_table(path) for path in paths]
+    else:
+        import pyarrow.feather
+
+        tables = [pyarrow.feather.read_table(path) for path in paths]
+    assert tables[0].num_rows == len(entries_catalogue())
+    assert tables[1].num_rows == len(converted_catalog())
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+
+from skoufas_dbf_reader.conversion import convert_entry, converted_catalog
+from skoufas_dbf_reader.export_sqlite import export_sqlite, person_row
+
+from helpers import padded_entry
+
+
+def test_person_row():
+    assert person_row(1, "ΒΙΤΣΙΟΣ,ΔΗΜΗΤΡΗΣ") == (1, "ΔΗΜΗΤΡΗΣ", "ΒΙΤΣΙΟΣ", None, "ΒΙΤΣΙΟΣ,ΔΗΜΗΤΡΗΣ")
+    assert person_row(2, "ΟΜΗΡΟΣ") == (2, None, "ΟΜΗΡΟΣ", None, "ΟΜΗΡΟΣ")
+
+
+def test_export_sqlite(tmp_path):
+    catalog = [
+        convert_entry(
+            padded_entry(
+                {
+                    0: 1,
+                    1: "BITSIOS,DIMITRIS                  AGL",
+                    2: "english title",
+                    4: "001.009ΚΟΝ ",
+                    5: "2710-2709",
+                    8: '"Η ΔΑΜΑΣΚΟΣ"',
+                    9: "ΑΘΗΝΑ 1984",
+                    12: "foobar-(19 ΑΙΩΝΑ)",
+                    17: "ΒΙΒΙΟΘΗΚΗ ΓΑΡΟΥΦΑΛΙΑ",
+                }
+            )
+        ),
+        convert_entry(
+            padded_entry({0: 2, 1: "BITSIOS,DIMITRIS                  AGL", 5: "2710", 8: '"Η ΔΑΜΑΣΚΟΣ"', 9: "ΑΘΗΝΑ"})
+        ),
+    ]
+    database_file = os.path.join(tmp_path, "catalogue.sqlite")
+    with open(database_file, "w", encoding="utf-8") as outfile:
+        outfile.write("an older export")
+    assert export_sqlite(database_file, catalog) == 2
+    assert not os.path.exists(f"{database_file}.tmp")
+
+    connection = sqlite3.connect(database_file)
+    try:
+        assert connection.execute("SELECT Id, Title, Dewey, EditionDate FROM BookEntry ORDER BY Id").fetchall() == [
+            (1, "english title", "001.009 ΚΟΝ", 1984),
+            (2, None, None, None),
+        ]
+        assert connection.execute("SELECT Name, Place FROM Editor").fetchall() == [("Η ΔΑΜΑΣΚΟΣ", "ΑΘΗΝΑ")]
+        assert connection.execute("SELECT COUNT(*) FROM Author").fetchone() == (1,)
+        assert connection.execute(
+            "SELECT BookEntryId FROM EntryNumber WHERE EntryNumber = '2710' ORDER BY BookEntryId"
+        ).fetchall() == [(1,), (2,)]
+        assert connection.execute(
+            "SELECT Donor.Fullname, EntryNumber.EntryNumber FROM Donation "
+            "JOIN Donor ON Donor.Id = Donation.DonorId JOIN EntryNumber ON EntryNumber.Id = Donation.EntryNumberId "
+            "ORDER BY EntryNumber.EntryNumber"
+        ).fetchall() == [("ΒΙΒΛΙΟΘΗΚΗ ΓΑΡΟΥΦΑΛΙΑ", "2709"), ("ΒΙΒΛΙΟΘΗΚΗ ΓΑΡΟΥΦΑΛΙΑ", "2710")]
+        assert connection.execute(
+            "SELECT Topic.Name FROM BookInTopic JOIN Topic ON Topic.Id = BookInTopic.TopicId ORDER BY Topic.Name"
+        ).fetchall() == [("19 ΑΙΩΝΑΣ",), ("foobar",)]
+        plan = connection.execute("EXPLAIN QUERY PLAN SELECT * FROM BookEntry WHERE ISBN = '960'").fetchall()
+        assert "BookEntry_ISBN" in str(plan)
+    finally:
+        connection.close()
+
+
+def test_export_sqlite_catalogue(tmp_path):
+    database_file = os.path.join(tmp_path, "catalogue.sqlite")
+    assert export_sqlite(database_file) == len(converted_catalog())
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import pytest
 
+from skoufas_dbf_reader.correction_data import FIELD_CORRECTION_TABLES, compile_field_correction
 from skoufas_dbf_reader.field_extractors import *
 
 
@@ -53,6 +54,19 @@ def test_authors_from_a01():
     assert authors_from_a01("BITSIOS,DIMITRIS                  AGL") == ["ΒΙΤΣΙΟΣ,ΔΗΜΗΤΡΗΣ"]
     assert authors_from_a01("FINLAY GEORG                        GER") == ["FINLAY,GEORGE"]
     assert authors_from_a01("ΑΝΑΓΝΩΣΤΑΚΗΣ,ΗΛΙΑΣ    .") == ["ΑΝΑΓΝΩΣΤΑΚΗΣ,ΗΛΙΑΣ"]
+    # only the suffix is stripped, not the same letters inside the name
+    assert authors_from_a01("ΓΚΑΛΑΣ ΙΩΑΝΝΗΣ  Ι") == ["ΓΚΑΛΑΣ ΙΩΑΝΝΗΣ"]
+    assert authors_from_a01("GALLIMARD GASTON GAL") == ["GALLIMARD GASTON"]
+
+
+def test_split_language_suffix():
+    assert split_language_suffix("BITSIOS,DIMITRIS                  AGL") == ("BITSIOS,DIMITRIS                 ", "en")
+    assert split_language_suffix("GERMAN,AGLAIA") == ("GERMAN,AGLAIA", None)
+    assert split_language_suffix("GAL") == ("GAL", None)
+    assert split_language_suffix("ΚΕΛΕΣΙΔΗΣ, ΤΕΛΗΣ                       Ι") == (
+        "ΚΕΛΕΣΙΔΗΣ, ΤΕΛΗΣ                       Ι",
+        None,
+    )
 
 
 def test_language_from_a01_a02():
@@ -399,3 +413,44 @@ def test_isbn_from_a17_a18_a19__a22_a30():
 
     # assert isbn_from_a17_a18_a19_a22_a30("foo", None, "7027-05-1", "5-6", None) is None
     assert isbn_from_a17_a18_a19_a22_a30("foo", None, "7027-05-1", "5-6", None) == "7027-05-15-6"
+
+
+def test_compile_field_correction():
+    correction = compile_field_correction("field17_corrections", "2ΑΝΤΙΤΥΠΑ", {"copies": 2, "notes": "ΔΥΟ"})
+    assert correction.is_mapping
+    assert correction.text is None
+    assert correction.copies == 2
+    assert correction.notes == "ΔΥΟ"
+    assert correction.use_dash
+    assert compile_field_correction("field09_corrections", "ΑΘΗΝΑ 1984", {"year": "1984"}).year == 1984
+    assert compile_field_correction("field07_corrections", "Β ΕΚΔΟΣΗ", "Β").text == "Β"
+    removed = compile_field_correction("field07_corrections", "-", None)
+    assert removed.text is None
+    assert not removed.is_mapping
+
+
+@pytest.mark.parametrize(
+    "key, value",
+    [
+        ("ΤΟΜΟΣ", {"copies": "2"}),
+        ("ΤΟΜΟΣ", {"volumes": "Α"}),
+        ("ΤΟΜΟΣ", {"year": "ΠΡΟΣΦΑΤΑ"}),
+        ("ΤΟΜΟΣ", ["Α"]),
+        (" ΤΟΜΟΣ", "Α"),
+        (1, "Α"),
+    ],
+)
+def test_compile_field_correction_invalid(key, value):
+    with pytest.raises(Exception, match="field17_corrections"):
+        compile_field_correction("field17_corrections", key, value)
+
+
+@pytest.mark.parametrize("value", ["", {}, {"notes": ""}])
+def test_compile_field_correction_empty(value):
+    with pytest.raises(Exception, match=r"Empty correction in field17_corrections \[ΤΟΜΟΣ\]"):
+        compile_field_correction("field17_corrections", "ΤΟΜΟΣ", value)
+
+
+def test_field_corrections_compile():
+    for code in FIELD_CORRECTION_TABLES:
+        assert field_corrections(code)
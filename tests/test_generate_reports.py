@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from skoufas_dbf_reader import conversion, generate_reports, search_index
+from skoufas_dbf_reader.catalogue import Catalogue
+from skoufas_dbf_reader.conversion import convert_entry
+from skoufas_dbf_reader.entry_numbers import EntryNumberIndex
+from skoufas_dbf_reader.profiling import ReportProfiler
+
+from helpers import padded_entry
+
+
+def write_marker(reports_directory: str):
+    os.makedirs(reports_directory, exist_ok=True)
+    with open(os.path.join(reports_directory, "marker.md"), "w", encoding="utf-8") as outfile:
+        outfile.write("marker")
+
+
+def failing_report(reports_directory: str):
+    raise ValueError(f"cannot write to {reports_directory}")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_reports_collects_failures(tmp_path, monkeypatch, jobs: int):
+    monkeypatch.setattr(generate_reports, "REPORTS", (failing_report, write_marker))
+    monkeypatch.setattr(generate_reports, "preload_catalog", lambda: None)
+    failures = generate_reports.run_reports(str(tmp_path), jobs)
+    assert list(failures) == ["failing_report"]
+    assert f"ValueError: cannot write to {tmp_path}" in failures["failing_report"]
+    assert os.path.exists(os.path.join(tmp_path, "marker.md"))
+
+
+def test_report_entries_shards(tmp_path, monkeypatch):
+    catalog = [
+        convert_entry(padded_entry({0: 1, 1: "BITSIOS,DIMITRIS                  AGL", 2: "ΤΙΤΛΟΣ", 4: "320ΤΣΟ"})),
+        convert_entry(padded_entry({0: 2, 2: "ΑΛΛΟΣ ΤΙΤΛΟΣ", 3: "ΥΠΟΤΙΤΛΟΣ", 5: "2710-2709"})),
+        convert_entry(padded_entry({0: 3, 1: "ΚΕΛΕΣΙΔΗΣ, ΤΕΛΗΣ                       Ι", 4: "320ΤΣΟ"})),
+    ]
+    monkeypatch.setattr(generate_reports, "converted_catalog", lambda: catalog)
+    monkeypatch.setattr(generate_reports, "ENTRY_SHARD_SIZE", 2)
+
+    serial_directory = os.path.join(tmp_path, "serial")
+    generate_reports.report_entries(serial_directory)
+    sharded_directory = os.path.join(tmp_path, "sharded")
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("fork")) as executor:
+        generate_reports.report_entries(sharded_directory, executor=executor)
+
+    serial_files = sorted(os.listdir(os.path.join(serial_directory, "entries")))
+    assert serial_files == [
+        "entry_00001.md",
+        "entry_00002.md",
+        "entry_00003.md",
+        "index.md",
+        "index_by_author.md",
+        "index_by_dewey.md",
+    ]
+    assert sorted(os.listdir(os.path.join(sharded_directory, "entries"))) == serial_files
+    for name in serial_files:
+        with open(os.path.join(serial_directory, "entries", name), encoding="utf-8") as serial:
+            with open(os.path.join(sharded_directory, "entries", name), encoding="utf-8") as sharded:
+                assert serial.read() == sharded.read()
+
+
+def test_incremental_report_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(generate_reports, "_produced_files", {})
+    monkeypatch.setattr(generate_reports, "_previous_manifest", {})
+    unchanged = os.path.join(tmp_path, "checks", "unchanged.md")
+    changed = os.path.join(tmp_path, "checks", "changed.md")
+    stale = os.path.join(tmp_path, "stale.md")
+    generate_reports.write_report_file(unchanged, "same")
+    generate_reports.write_report_file(changed, "before")
+    generate_reports.write_report_file(stale, "gone")
+    generate_reports.save_manifest(str(tmp_path), generate_reports.drain_produced_files())
+    os.utime(unchanged, ns=(0, 0))
+    os.utime(changed, ns=(0, 0))
+
+    previous = generate_reports.load_manifest(str(tmp_path))
+    assert sorted(previous) == [changed, unchanged, stale]
+    generate_reports.set_previous_manifest(previous)
+    generate_reports.write_report_file(unchanged, "same")
+    generate_reports.write_report_file(changed, "after")
+    produced = generate_reports.drain_produced_files()
+    assert generate_reports.remove_stale_files(previous, produced) == [stale]
+
+    assert os.stat(unchanged).st_mtime_ns == 0
+    assert os.stat(changed).st_mtime_ns != 0
+    with open(changed, encoding="utf-8") as stream:
+        assert stream.read() == "after"
+    assert not os.path.exists(stale)
+
+
+def test_incremental_reports_are_not_rewritten(tmp_path):
+    # titles with the same romanization, listed in the order of a set in the romanize_sort pages
+    titles = ["ΑΝΝΑ", "ΆΝΝΑ", "ANNA", "ΚΑΦΕ", "KAFE", "ΝΕΡΟ", "NERO", "ΜΑΡΙΑ", "ΜΆΡΙΑ", "MARIA"]
+    source = os.path.join(tmp_path, "entries.jsonl")
+    with open(source, "w", encoding="utf-8") as outfile:
+        for dbase_number, title in enumerate(titles, 1):
+            outfile.write(json.dumps({"0": dbase_number, "2": title, "5": str(dbase_number)}) + "\n")
+    reports_directory = os.path.join(tmp_path, "reports")
+    # the package as imported by the tests, installed or not
+    python_path = os.pathsep.join(
+        [os.path.dirname(os.path.dirname(generate_reports.__file__)), os.environ.get("PYTHONPATH", "")]
+    )
+
+    def build(hash_seed: str) -> str:
+        return subprocess.run(
+            [sys.executable, "-m", "skoufas_dbf_reader.generate_reports", reports_directory]
+            + ["--source", source, "--incremental"],
+            env={**os.environ, "PYTHONHASHSEED": hash_seed, "PYTHONPATH": python_path},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+
+    assert "removed 0 files" in build("1")
+    assert "Rewrote 0 of " in build("2")
+
+
+def test_report_profiler(tmp_path, monkeypatch):
+    def copies_report(reports_directory: str):
+        converted = convert_entry(padded_entry({0: 1, 18: "2ΑΝΤΙΤΥΠΑ"}))
+        generate_reports.write_report_file(
+            os.path.join(reports_directory, "checks", "copies.md"), str(converted.copies)
+        )
+
+    monkeypatch.setattr(generate_reports, "REPORTS", (copies_report,))
+    monkeypatch.setattr(generate_reports, "_produced_files", {})
+    field_specs = conversion.FIELD_SPECS
+    with ReportProfiler() as profiler:
+        assert not generate_reports.run_reports(str(tmp_path), 2, profiler)
+    assert conversion.FIELD_SPECS is field_specs
+
+    summary = profiler.summary(str(tmp_path), generate_reports.drain_produced_files())
+    assert list(summary["stages"]) == ["copies_report"]
+    assert summary["stages"]["copies_report"]["wall_seconds"] > 0
+    assert summary["extractors"]["copies_from_a17_a18_a30"] == {"calls": 1, "seconds": pytest.approx(0, abs=1)}
+    assert summary["correction_lookups"]["field18_corrections"]["hits"] > 0
+    assert summary["output_bytes"] == {"checks": 1}
+
+
+def test_report_search(tmp_path, monkeypatch):
+    catalog = [convert_entry(padded_entry({0: 7, 2: "ΟΔΥΣΣΕΙΑ", 5: "10"}))]
+    monkeypatch.setattr(search_index, "converted_catalog", lambda: catalog)
+    monkeypatch.setattr(generate_reports, "_produced_files", {})
+    generate_reports.report_search(str(tmp_path))
+    assert sorted(os.listdir(os.path.join(tmp_path, "search", "shards"))) == ["6f64.json", "cebfceb4.json"]
+    with open(os.path.join(tmp_path, "search", "shards", "cebfceb4.json"), encoding="utf-8") as stream:
+        assert json.load(stream) == {"terms": {"οδυσσεια": [7]}, "titles": {"7": "ΟΔΥΣΣΕΙΑ"}}
+    with open(os.path.join(tmp_path, "search", "index.md"), encoding="utf-8") as stream:
+        page = stream.read()
+    assert "const prefixLength = 2;" in page
+    assert 'fetch("./shards/" + name + ".json")' in page
+
+
+def test_report_search_single_letter(tmp_path, monkeypatch):
+    catalog = [
+        convert_entry(padded_entry({0: 7, 2: "ΟΔΥΣΣΕΙΑ", 5: "10"})),
+        convert_entry(padded_entry({0: 8, 2: "Ο ΑΣΚΗΤΗΣ", 5: "11"})),
+        convert_entry(padded_entry({0: 9, 2: "ΑΣΚΗΤΙΚΗ", 5: "12"})),
+    ]
+    monkeypatch.setattr(search_index, "converted_catalog", lambda: catalog)
+    monkeypatch.setattr(generate_reports, "_produced_files", {})
+    generate_reports.report_search(str(tmp_path))
+
+    def page_matches(word: str) -> set[int]:
+        # the shards the page loads for a word shorter than the shard prefix
+        with open(os.path.join(tmp_path, "search", "shards.json"), encoding="utf-8") as stream:
+            names = [name for name in json.load(stream) if name.startswith(search_index.shard_name(word))]
+        found: set[int] = set()
+        for name in names:
+            with open(os.path.join(tmp_path, "search", "shards", f"{name}.json"), encoding="utf-8") as stream:
+                terms = json.load(stream)["terms"]
+            found.update(entry for term, entries in terms.items() if term.startswith(word) for entry in entries)
+        return found
+
+    index = search_index.build_search_index(catalog)
+    assert page_matches("ο") == {7, 8}
+    assert page_matches("α") == {8, 9}
+    for word in ("ο", "α", "ω"):
+        assert page_matches(word) == {result["dbase_number"] for result in index.search(word)}
+
+
+def test_report_entry_numbers_shows_entry_numbers_as_typed(tmp_path, monkeypatch):
+    entries = [{0: 1, 5: "11921Α"}, {0: 2, 5: "11921A"}, {0: 3, 5: "2710"}, {0: 4, 5: "02710"}]
+    index = EntryNumberIndex.from_catalog(convert_entry(padded_entry(entry)) for entry in entries)
+    monkeypatch.setattr(generate_reports, "entry_number_index", lambda: index)
+    monkeypatch.setattr(generate_reports, "entries_catalogue", lambda: Catalogue.from_entries(entries))
+    monkeypatch.setattr(generate_reports, "_produced_files", {})
+    generate_reports.report_entry_numbers(str(tmp_path))
+
+    with open(os.path.join(tmp_path, "checks", "duplicate_entry_numbers.md"), encoding="utf-8") as stream:
+        duplicates = stream.read()
+    assert "11921Α, 11921A" in duplicates
+    assert "2710, 02710" in duplicates
+    with open(os.path.join(tmp_path, "checks", "non_numeric_entry_numbers.md"), encoding="utf-8") as stream:
+        non_numeric = stream.read()
+    assert "11921A" in non_numeric
+    assert non_numeric.index("11921Α") < non_numeric.index("11921A")
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from skoufas_dbf_reader import conversion
+from skoufas_dbf_reader.correction_data import load_correction_table, record_lookups, reload_correction_data
+from skoufas_dbf_reader.field_extractors import authors_from_a01, editor_from_a08_a09
+from skoufas_dbf_reader.memoization import MemoizedExtractor, memoize_extractors
+
+
+def test_memoized_extractor():
+    editor = MemoizedExtractor(editor_from_a08_a09, maxsize=2)
+    assert editor.__name__ == "editor_from_a08_a09"
+    for _ in range(3):
+        assert editor('"Η ΔΑΜΑΣΚΟΣ"', "ΑΘΗΝΑ 1984") == editor_from_a08_a09('"Η ΔΑΜΑΣΚΟΣ"', "ΑΘΗΝΑ 1984")
+    stats = editor.stats()
+    assert (stats.hits, stats.misses, stats.size) == (2, 1, 1)
+    assert stats.hit_rate == 2 / 3
+    editor("ΚΕΔΡΟΣ", None)
+    editor("ΙΚΑΡΟΣ", None)
+    assert editor.stats().size == 2
+
+
+def test_memoized_extractor_copies_lists():
+    authors = MemoizedExtractor(authors_from_a01)
+    authors("BITSIOS,DIMITRIS                  AGL").append("ΑΛΛΟΣ")
+    assert authors("BITSIOS,DIMITRIS                  AGL") == ["ΒΙΤΣΙΟΣ,ΔΗΜΗΤΡΗΣ"]
+
+
+def test_memoized_extractor_skips_cache_while_recording():
+    authors = MemoizedExtractor(authors_from_a01)
+    authors("BITSIOS,DIMITRIS                  AGL")
+    with record_lookups() as recorded:
+        authors("BITSIOS,DIMITRIS                  AGL")
+    assert ("author_corrections", "BITSIOS,DIMITRIS") in recorded
+    assert authors.stats().hits == 0
+
+
+def test_reload_clears_memoized_extractors():
+    authors = MemoizedExtractor(authors_from_a01)
+    authors("BITSIOS,DIMITRIS                  AGL")
+    table = load_correction_table("author_corrections")
+    reload_correction_data()
+    assert authors.stats().size == 0
+    assert load_correction_table("author_corrections") is not table
+
+
+def test_memoize_extractors():
+    original_specs = conversion.FIELD_SPECS
+    entry = dict.fromkeys(range(31))
+    entry.update({0: 1, 9: "ΑΘΗΝΑ 1984", 12: "foobar-(19 ΑΙΩΝΑ)"})
+    with memoize_extractors() as memoized:
+        assert set(memoized) == {spec.name for spec in original_specs}
+        first = conversion.convert_entry(entry)
+        assert conversion.convert_entry(entry) == first
+        assert memoized["topics"].stats().hits == 1
+    assert conversion.FIELD_SPECS is original_specs
+    assert conversion.convert_entry(entry) == first
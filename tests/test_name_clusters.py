@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import yaml
+
+from skoufas_dbf_reader.conversion import convert_entry
+from skoufas_dbf_reader.correction_data import load_correction_table
+from skoufas_dbf_reader.name_clusters import (
+    VALUE_SEPARATORS,
+    blocking_keys,
+    cluster_names,
+    comparison_key,
+    correction_patch,
+    format_patch,
+    lookup_values,
+    name_counts,
+    similarity,
+)
+
+from helpers import padded_entry
+
+
+def test_comparison_key():
+    assert comparison_key("ΒΑΣΙΛΕΙΟΥ, ΣΩΚΡΑΤΗΣ") == comparison_key("ΒΑΣΙΛΕΙΟΥ,ΣΩΚΡΑΤΗΣ")
+    # a Latin A in a Greek name
+    assert comparison_key("AΝΑΓΝΩΣΤΟΠΟΥΛΟΥ") == comparison_key("ΑΝΑΓΝΩΣΤΟΠΟΥΛΟΥ")
+    assert comparison_key("BALZAC,HONORÉ DE") == "balzachonorede"
+    assert blocking_keys("balzac") == {"bal", "alz", "zac"}
+    assert blocking_keys("ba") == {"ba"}
+    assert similarity("ΜΠΕΝΤΙΛΛΑ,ΕΛΕΝΗ", "ΜΠΕΝΤΙΛΑ,ΕΛΕΝΗ") > 0.85
+    assert similarity("ΜΠΕΝΤΙΛΑ,ΕΛΕΝΗ", "ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ") < 0.2
+
+
+def test_cluster_names():
+    counts = {
+        "ΜΠΕΝΤΙΛΑ,ΕΛΕΝΗ": 3,
+        "ΜΠΕΝΤΙΛΛΑ,ΕΛΕΝΗ": 1,
+        "ΜΠΕΝΤΗΛΑ,ΕΛΕΝΗ": 1,
+        "BALZAC,HONORÉ DE": 2,
+        "BALZAC,HONORE DE": 1,
+        "ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ": 5,
+    }
+    clusters = cluster_names(counts)
+    assert [[name for name, _ in cluster] for cluster in clusters] == [
+        ["BALZAC,HONORÉ DE", "BALZAC,HONORE DE"],
+        ["ΜΠΕΝΤΙΛΑ,ΕΛΕΝΗ", "ΜΠΕΝΤΗΛΑ,ΕΛΕΝΗ", "ΜΠΕΝΤΙΛΛΑ,ΕΛΕΝΗ"],
+    ]
+    assert clusters[0][1][1] == 1.0
+    assert cluster_names(counts, threshold=0.99) == [
+        [("BALZAC,HONORÉ DE", 1.0), ("BALZAC,HONORE DE", 1.0)],
+        [("ΜΠΕΝΤΙΛΑ,ΕΛΕΝΗ", 1.0), ("ΜΠΕΝΤΗΛΑ,ΕΛΕΝΗ", 1.0)],
+    ]
+
+
+def test_cluster_editors():
+    counts = {
+        "ΑΧΑΙΚΕΣ ΕΚΔΟΣΕΙΣ // ΠΑΤΡΑ": 4,
+        "ΑΧΑΙΚΕΣ ΕΚΔΟΣΕIΣ // ΠΑΤΡΑ": 1,
+        "ΑΧΑΙΚΕΣ ΕΚΔΟΣΕΙΣ // ΑΘΗΝΑ": 1,
+        "ΑΧΑΙΚΕΣ ΕΚΔΟΣΕΙΣ // None": 1,
+    }
+    assert cluster_names(counts, with_places=True) == [
+        [("ΑΧΑΙΚΕΣ ΕΚΔΟΣΕΙΣ // ΠΑΤΡΑ", 1.0), ("ΑΧΑΙΚΕΣ ΕΚΔΟΣΕIΣ // ΠΑΤΡΑ", 1.0)]
+    ]
+
+
+def test_correction_patch():
+    catalog = [
+        convert_entry(padded_entry({0: 1, 1: "ΜΠΕΝΤΙΛΑ,ΕΛΕΝΗ"})),
+        convert_entry(padded_entry({0: 2, 1: "ΜΠΕΝΤΙΛΑ,ΕΛΕΝΗ"})),
+        convert_entry(padded_entry({0: 3, 1: "ΜΠΕΝΤΙΛΛΑ,ΕΛΕΝΗ"})),
+    ]
+    counts = name_counts("author_corrections", catalog)
+    assert counts == {"ΜΠΕΝΤΙΛΑ,ΕΛΕΝΗ": 2, "ΜΠΕΝΤΙΛΛΑ,ΕΛΕΝΗ": 1}
+    table = {
+        "ΜΠΕΝΤΙΛΛΑ ΕΛΕΝΗ": "ΜΠΕΝΤΙΛΛΑ,ΕΛΕΝΗ",
+        "ΜΠΕΝΤΙΛΛΑ & ΑΛΛΟΣ": "ΜΠΕΝΤΙΛΛΑ,ΕΛΕΝΗ!!ΑΛΛΟΣ,ΚΑΠΟΙΟΣ",
+        "ΑΛΛΟΣ": "ΑΛΛΟΣ,ΚΑΠΟΙΟΣ",
+        "ΚΑΝΕΝΑΣ": None,
+    }
+    values = lookup_values("author_corrections", catalog)
+    assert values == {"ΜΠΕΝΤΙΛΑ,ΕΛΕΝΗ": "ΜΠΕΝΤΙΛΑ,ΕΛΕΝΗ", "ΜΠΕΝΤΙΛΛΑ,ΕΛΕΝΗ": "ΜΠΕΝΤΙΛΛΑ,ΕΛΕΝΗ"}
+    patch = correction_patch(cluster_names(counts), table, counts, values)
+    assert [(key, value) for key, value, _ in patch] == [
+        ("ΜΠΕΝΤΙΛΛΑ,ΕΛΕΝΗ", "ΜΠΕΝΤΙΛΑ,ΕΛΕΝΗ"),
+        ("ΜΠΕΝΤΙΛΛΑ ΕΛΕΝΗ", "ΜΠΕΝΤΙΛΑ,ΕΛΕΝΗ"),
+        ("ΜΠΕΝΤΙΛΛΑ & ΑΛΛΟΣ", "ΜΠΕΝΤΙΛΑ,ΕΛΕΝΗ!!ΑΛΛΟΣ,ΚΑΠΟΙΟΣ"),
+    ]
+    assert patch[0][2].startswith("entries 1, similarity 0.")
+    assert patch[1][2] == "was ΜΠΕΝΤΙΛΛΑ,ΕΛΕΝΗ"
+
+    patch_yaml = format_patch({"author_corrections": patch, "editor_corrections": []})
+    documents = list(yaml.safe_load_all(patch_yaml))
+    assert documents == [
+        {"author_corrections": {key: value for key, value, _ in patch}},
+        {"editor_corrections": None},
+    ]
+
+
+def test_correction_patch_changes_converted_entries(monkeypatch):
+    entries = [
+        padded_entry({0: 1, 6: "ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ", 8: "ΑΧΑΙΚΕΣ ΕΚΔΟΣΕΙΣ", 9: "ΠΑΤΡΑ"}),
+        padded_entry({0: 2, 6: "ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ", 8: "ΑΧΑΙΚΕΣ ΕΚΔΟΣΕΙΣ", 9: "ΠΑΤΡΑ"}),
+        # a translator value holding two names is looked up whole
+        padded_entry({0: 3, 6: "ΚΑΖΑΝΤΖΑΚΙΣ,ΝΙΚΟΣ!!ΠΡΕΒΕΛΑΚΗΣ,ΠΑΝΤΕΛΗΣ", 8: "ΑΧΑΙΚΕΣ ΕΚΔΟΣΕΙΣ", 9: "ΠΑΤΡΑ"}),
+        # an editor corrected to a variant, and the variant itself with a Latin I
+        padded_entry({0: 4, 6: "ΚΑΖΑΝΤΖΑΚΙΣ,ΝΙΚΟΣ", 8: "ΑΧΑΙΚΕΣ ΕΚΔ.", 9: "ΠΑΤΡΑ"}),
+        padded_entry({0: 5, 8: "ΑΧΑΙΚΕΣ ΕΚΔΟΣΕIΣ", 9: "ΠΑΤΡΑ"}),
+    ]
+    editors = load_correction_table("editor_corrections")
+    monkeypatch.setitem(editors, "ΑΧΑΙΚΕΣ ΕΚΔ. // ΠΑΤΡΑ", "ΑΧΑΙΚΕΣ ΕΚΔΟΣΕIΣ // ΠΑΤΡΑ")
+    catalog = [convert_entry(entry) for entry in entries]
+
+    patches = {}
+    for table in ("translator_corrections", "editor_corrections"):
+        counts = name_counts(table, catalog)
+        clusters = cluster_names(counts, with_places=table == "editor_corrections")
+        values = lookup_values(table, catalog)
+        patches[table] = correction_patch(
+            clusters, load_correction_table(table), counts, values, VALUE_SEPARATORS[table]
+        )
+    assert [(key, value) for key, value, _ in patches["translator_corrections"]] == [
+        ("ΚΑΖΑΝΤΖΑΚΙΣ,ΝΙΚΟΣ", "ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ"),
+        ("ΚΑΖΑΝΤΖΑΚΙΣ,ΝΙΚΟΣ!!ΠΡΕΒΕΛΑΚΗΣ,ΠΑΝΤΕΛΗΣ", "ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ!!ΠΡΕΒΕΛΑΚΗΣ,ΠΑΝΤΕΛΗΣ"),
+    ]
+    assert [(key, value) for key, value, _ in patches["editor_corrections"]] == [
+        ("ΑΧΑΙΚΕΣ ΕΚΔΟΣΕIΣ // ΠΑΤΡΑ", "ΑΧΑΙΚΕΣ ΕΚΔΟΣΕΙΣ // ΠΑΤΡΑ"),
+        ("ΑΧΑΙΚΕΣ ΕΚΔ. // ΠΑΤΡΑ", "ΑΧΑΙΚΕΣ ΕΚΔΟΣΕΙΣ // ΠΑΤΡΑ"),
+    ]
+
+    # copy the patch to the correction tables, as a maintainer would
+    for document in yaml.safe_load_all(format_patch(patches)):
+        for table, patch in document.items():
+            for key, value in patch.items():
+                monkeypatch.setitem(load_correction_table(table), key, value)
+    patched = [convert_entry(entry) for entry in entries]
+    assert [converted.translators for converted in patched] == [
+        ["ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ"],
+        ["ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ"],
+        ["ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ", "ΠΡΕΒΕΛΑΚΗΣ,ΠΑΝΤΕΛΗΣ"],
+        ["ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ"],
+        [],
+    ]
+    assert {converted.editor for converted in patched} == {("ΑΧΑΙΚΕΣ ΕΚΔΟΣΕΙΣ", "ΠΑΤΡΑ")}
+    assert name_counts("translator_corrections", patched) == {"ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ": 4, "ΠΡΕΒΕΛΑΚΗΣ,ΠΑΝΤΕΛΗΣ": 1}
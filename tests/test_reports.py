@@ -7,6 +7,7 @@ from collections import defaultdict
 import pytest
 import yaml
 
+from skoufas_dbf_reader.conversion import converted_catalog
 from skoufas_dbf_reader.correction_data import (
     author_corrections,
     has_author,
@@ -371,131 +372,9 @@ def test_report_isbns(reports_directory: str):
 
 
 def test_report_extracted_fields(reports_directory: str):
-    converted_entries: list[dict[str, str | int | bool | list[str] | dict[int, str] | None]] = []
-    for entry in all_entries():
-        converted_entry: dict[str, str | int | bool | list[str] | dict[int, str] | None] = dict()
-        converted_entry["dbase_number"] = entry[0]
-        converted_entry["authors"] = authors_from_a01(entry[1])
-
-        language = language_from_a01_a02(entry[1], entry[2])
-        if language:
-            converted_entry["language"] = language
-
-        title = title_from_a02(entry[2])
-        if title:
-            converted_entry["title"] = title
-
-        subtitle = subtitle_from_a03(entry[3])
-        if subtitle:
-            converted_entry["subtitle"] = subtitle
-
-        dewey = dewey_from_a04_a05(entry[4], entry[5])
-        if dewey:
-            converted_entry["dewey"] = dewey
-
-        converted_entry["entry_numbers"] = entry_numbers_from_a04_a05_a06_a07_a08_a18_a19(
-            entry[4], entry[5], entry[6], entry[7], entry[8], entry[18], entry[19]
-        )
-
-        translator = translator_from_a06(entry[6])
-        if translator:
-            converted_entry["translators"] = translator.split("!!")
-            # for single_translator in translators:
-            #     translator_surname_name = single_translator.split(",", maxsplit=1)
-            #     if len(translator_surname_name) == 2:
-            #         field_values["translator_family_name"].append(translator_surname_name[0])
-            #         if translator_surname_name[1].endswith("."):
-            #             field_values["translator_name_abbreviations"].append(translator_surname_name[1])
-            #         else:
-            #             field_values["translator_names"].append(translator_surname_name[1])
-
-        edition = edition_from_a07(entry[7])
-        if edition:
-            converted_entry["edition"] = edition
-
-        editor = editor_from_a08_a09(entry[8], entry[9])
-        if editor:
-            converted_entry["editor"] = f"{editor[0]} // {editor[1]}"
-
-        edition_year = edition_year_from_a09_a10(entry[9], entry[10])
-        if edition_year:
-            converted_entry["edition_year"] = edition_year
-
-        pages = pages_from_a11(entry[11])
-        if pages:
-            converted_entry["pages"] = pages
-
-        topic_list = topics_from_a12_to_a15_a20_a22_to_a24(
-            [
-                entry[12],
-                entry[13],
-                entry[14],
-                entry[15],
-                entry[20],
-                entry[22],
-                entry[23],
-                entry[24],
-            ]
-        )
-        converted_entry["topics"] = topic_list
-
-        curator = curator_from_a16(entry[16])
-        if curator:
-            converted_entry["curator"] = curator
-
-        copies = copies_from_a17_a18_a30(entry[17], entry[18], entry[30])
-        if copies:
-            converted_entry["copies"] = copies
-
-        donation = donation_from_a17_a30(entry[17], entry[30])
-        if donation:
-            converted_entry["donors"] = donation.split("!!")
-
-        volume = volume_from_a17_a18_a20_a30(entry[17], entry[18], entry[20], entry[30])
-        if volume:
-            converted_entry["volume"] = volume
-
-        material = material_from_a18_a30(entry[18], entry[30])
-        if material:
-            converted_entry["material"] = material
-
-        notes = notes_from_a17_a18_a21_a30(entry[17], entry[18], entry[21], entry[30])
-        if notes:
-            converted_entry["notes"] = notes
-
-        converted_entry["has_cd"] = has_cd_from_a02_a03_a12_a13_a14_a17_a18_a22_a30(
-            [
-                entry[2],
-                entry[3],
-                entry[12],
-                entry[13],
-                entry[14],
-                entry[17],
-                entry[18],
-                entry[22],
-                entry[30],
-            ]
-        )
-
-        converted_entry["has_dvd"] = has_dvd_from_a30(
-            [
-                entry[30],
-            ]
-        )
-
-        converted_entry["offprint"] = offprint_from_a17_a21_a30(entry[17], entry[21], entry[30])
-
-        isbn = isbn_from_a17_a18_a19_a22_a30(entry[17], entry[18], entry[19], entry[22], entry[30])
-        if isbn:
-            if not check_isbn(isbn):
-                converted_entry["isbn"] = isbn
-            if not check_issn(isbn):
-                converted_entry["issn"] = isbn
-            if not check_ean(isbn):
-                converted_entry["ean"] = isbn
-
-        converted_entry["original_entry"] = entry
-        converted_entries.append(converted_entry)
+    converted_entries: list[dict[str, str | int | bool | list[str] | dict[int, str] | None]] = [
+        converted.as_dict() for converted in converted_catalog()
+    ]
 
     with open(
         os.path.join(
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from skoufas_dbf_reader.conversion import convert_entry
+from skoufas_dbf_reader.search_index import (
+    SHARD_PREFIX_LENGTH,
+    SearchIndex,
+    build_search_index,
+    fold,
+    search_shards,
+    shard_name,
+    words,
+)
+
+from helpers import padded_entry
+
+
+def test_fold():
+    assert fold("Άρης ΟΔΥΣΣΕΑΣ Ϊ") == "αρησ οδυσσεασ ι"
+    assert fold("Ελληνικός") == fold("ΕΛΛΗΝΙΚΟΣ")
+    assert words("Η ΟΔΥΣΣΕΙΑ, τόμος Α'") == ["η", "οδυσσεια", "τομοσ", "α"]
+    assert words(None) == []
+
+
+def test_search_index(tmp_path):
+    catalog = [
+        convert_entry(padded_entry({0: 1, 1: "ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ", 2: "ΑΣΚΗΤΙΚΗ", 5: "10"})),
+        convert_entry(padded_entry({0: 2, 1: "HOMER", 2: "Η ΟΔΥΣΣΕΙΑ", 5: "11", 8: '"Η ΔΑΜΑΣΚΟΣ"', 9: "ΑΘΗΝΑ"})),
+        convert_entry(padded_entry({0: 3, 1: "ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ", 2: "ΟΔΥΣΣΕΙΑ", 5: "12"})),
+    ]
+    index_file = os.path.join(tmp_path, "search.idx")
+    build_search_index(catalog).save(index_file)
+    index = SearchIndex.load(index_file)
+
+    def found(query: str) -> list[int]:
+        return [result["dbase_number"] for result in index.search(query)]
+
+    assert found("Οδύσσεια") == [2, 3]
+    assert found("οδυσσ καζαντζάκης") == [3]
+    assert found("odysseia") == [2, 3]
+    assert found("kazantzakis askitiki") == [1]
+    assert found("δαμασκ") == [2]
+    assert found("ΑΘΗΝΑ") == [2]
+    assert found("ιλιαδα") == []
+    assert found("...") == []
+    assert index.search("οδυσσεια", limit=1) == [
+        {"dbase_number": 2, "title": "Η ΟΔΥΣΣΕΙΑ", "authors": ["HOMER"], "dewey": None, "entry_numbers": ["11"]}
+    ]
+    assert index.term_documents("καζαντζακησ") == [0, 2]
+    assert index.term_documents("καζαν") == []
+
+
+def test_search_index_rejects_other_files(tmp_path):
+    index_file = os.path.join(tmp_path, "search.idx")
+    with open(index_file, "wb") as outfile:
+        outfile.write(b"\0" * 64)
+    with pytest.raises(Exception, match="Not a search index"):
+        SearchIndex.load(index_file)
+
+
+def test_search_shards():
+    catalog = [
+        convert_entry(padded_entry({0: 1, 1: "ΚΑΖΑΝΤΖΑΚΗΣ,ΝΙΚΟΣ", 2: "Η ΑΣΚΗΤΙΚΗ", 5: "10"})),
+        convert_entry(padded_entry({0: 2, 2: "ΑΣΚΗΣΕΙΣ", 5: "11"})),
+    ]
+    shards = search_shards(catalog)
+    assert shard_name("ασκησεισ") == "ceb1cf83"
+    assert shards["ceb1cf83"] == {
+        "terms": {"ασκητικη": [1], "ασκησεισ": [2]},
+        "titles": {"1": "Η ΑΣΚΗΤΙΚΗ", "2": "ΑΣΚΗΣΕΙΣ"},
+    }
+    assert shards[shard_name("η")] == {"terms": {"η": [1]}, "titles": {"1": "Η ΑΣΚΗΤΙΚΗ"}}
+    assert shards[shard_name("kazantzakis")]["terms"] == {"kazantzakis": [1]}
+    assert all(shard_name(term) == name for name, shard in shards.items() for term in shard["terms"])
+    assert len({term[:SHARD_PREFIX_LENGTH] for term in shards["ceb1cf83"]["terms"]}) == 1
@@ -1,7 +1,27 @@
 from __future__ import annotations
 
-from skoufas_dbf_reader.correction_data import converted_entries
-from skoufas_dbf_reader.utilities import all_entries, none_if_empty_or_stripped, read_yaml_data, romanize
+import itertools
+import os
+import random
+
+import pytest
+
+from skoufas_dbf_reader import utilities
+from skoufas_dbf_reader.conversion import converted_catalog
+from skoufas_dbf_reader.correction_data import CORRECTION_TABLES, converted_entries, load_correction_table
+from skoufas_dbf_reader.utilities import (
+    all_entries,
+    entries_catalogue,
+    entries_file,
+    iter_entries,
+    iter_jsonl_entries,
+    iter_yaml_entries,
+    jsonl_byte_ranges,
+    load_yaml_file,
+    none_if_empty_or_stripped,
+    read_yaml_data,
+    romanize,
+)
 
 
 def test_yaml_data():
@@ -11,6 +31,37 @@ def test_yaml_data():
     assert len(no_author) > 0
 
 
+def test_load_yaml_file_cache(tmp_path, monkeypatch):
+    cache_directory = os.path.join(tmp_path, "cache")
+    monkeypatch.setenv("SKOUFAS_DBF_READER_CACHE_DIR", cache_directory)
+    yaml_file = os.path.join(tmp_path, "codes.yml")
+    with open(yaml_file, "w", encoding="utf-8") as outfile:
+        outfile.write("codes:\n  GAL: fr\n")
+    assert load_yaml_file(yaml_file) == {"codes": {"GAL": "fr"}}
+    assert len(os.listdir(cache_directory)) == 1
+    # served from the cache
+    assert load_yaml_file(yaml_file) == {"codes": {"GAL": "fr"}}
+
+    # same content, new modification time
+    os.utime(yaml_file, ns=(0, 0))
+    assert load_yaml_file(yaml_file) == {"codes": {"GAL": "fr"}}
+
+    # changed content is parsed again
+    with open(yaml_file, "w", encoding="utf-8") as outfile:
+        outfile.write("codes:\n  GAL: fr\n  GER: de\n")
+    assert load_yaml_file(yaml_file) == {"codes": {"GAL": "fr", "GER": "de"}}
+    assert len(os.listdir(cache_directory)) == 1
+
+
+def test_load_yaml_file_without_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SKOUFAS_DBF_READER_CACHE_DIR", "")
+    yaml_file = os.path.join(tmp_path, "codes.yml")
+    with open(yaml_file, "w", encoding="utf-8") as outfile:
+        outfile.write("codes: []\n")
+    assert load_yaml_file(yaml_file) == {"codes": []}
+    assert os.listdir(tmp_path) == ["codes.yml"]
+
+
 def test_none_if_empty_or_stripped():
     assert none_if_empty_or_stripped(None) is None
     assert none_if_empty_or_stripped("") is None
@@ -32,6 +83,72 @@ def test_all_entries():
     assert entries[1000][0] == 1001
 
 
+def test_entries_file(tmp_path, monkeypatch):
+    yaml_file = os.path.join(tmp_path, "entries.yml")
+    with open(yaml_file, "w", encoding="utf-8") as outfile:
+        outfile.write("entries:\n- 0: 1\n  2: ΤΙΤΛΟΣ\n")
+    monkeypatch.setenv("SKOUFAS_DBF_READER_ENTRIES", yaml_file)
+    all_entries.cache_clear()
+    entries_catalogue.cache_clear()
+    try:
+        assert entries_file() == yaml_file
+        entries = all_entries()
+        assert len(entries) == 1
+        assert entries[0][2] == "ΤΙΤΛΟΣ"
+        assert entries[0][30] is None
+    finally:
+        all_entries.cache_clear()
+        entries_catalogue.cache_clear()
+
+
+def test_iter_jsonl_entries(tmp_path, monkeypatch):
+    jsonl_file = os.path.join(tmp_path, "entries.jsonl")
+    with open(jsonl_file, "w", encoding="utf-8") as outfile:
+        outfile.writelines(f'{{"0":{i},"2":"ΤΙΤΛΟΣ {i}"}}\n' for i in range(1, 101))
+    entries = list(iter_jsonl_entries(jsonl_file))
+    assert entries[0] == {0: 1, 2: "ΤΙΤΛΟΣ 1"}
+    assert len(entries) == 100
+    for parts in (1, 3, 7, 100, 1000):
+        split = [
+            entry
+            for start, stop in jsonl_byte_ranges(jsonl_file, parts)
+            for entry in iter_jsonl_entries(jsonl_file, start, stop)
+        ]
+        assert split == entries
+
+    monkeypatch.setenv("SKOUFAS_DBF_READER_ENTRIES", jsonl_file)
+    entries_catalogue.cache_clear()
+    try:
+        catalogue = entries_catalogue()
+        assert len(catalogue) == 100
+        assert catalogue[99][2] == "ΤΙΤΛΟΣ 100"
+        assert catalogue[99][30] is None
+    finally:
+        entries_catalogue.cache_clear()
+
+
+def test_iter_yaml_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(utilities, "YAML_STREAM_BATCH", 7)
+    assert list(iter_yaml_entries(entries_file())) == load_yaml_file(entries_file())["entries"]
+
+    yaml_file = os.path.join(tmp_path, "entries.yml")
+    with open(yaml_file, "w", encoding="utf-8") as outfile:
+        outfile.write("# not written by dbf-to-yaml\nentries: [{0: 1, 2: ΤΙΤΛΟΣ}]\n")
+    assert list(iter_yaml_entries(yaml_file)) == [{0: 1, 2: "ΤΙΤΛΟΣ"}]
+    with open(yaml_file, "w", encoding="utf-8") as outfile:
+        outfile.write("entries: []\n")
+    assert list(iter_yaml_entries(yaml_file)) == []
+
+
+def test_iter_entries():
+    entries = iter_entries()
+    entry = next(entries)
+    assert entry == all_entries()[0]
+    with pytest.raises(TypeError):
+        entry[2] = "ΤΙΤΛΟΣ"  # type: ignore[index]
+    assert sum(1 for _ in entries) == len(all_entries()) - 1
+
+
 def test_converted_entries():
     all = converted_entries()
     assert all
@@ -41,3 +158,106 @@ def test_romanize():
     assert romanize("Γειά") == "Geia"
     assert romanize("") == ""
     assert romanize(None) == ""
+    assert romanize("ΜΠΑΜΠΑΣ ΑΥΓΟΥΣΤΟΣ") == "BAMPAS AVGOUSTOS"
+
+
+def reference_romanize(greek_text: str | None) -> str:
+    """The original character by character implementation of romanize"""
+
+    if not greek_text:
+        return ""
+    result = ""
+    cursor = 0
+    while cursor < len(greek_text):
+        letter = greek_text[cursor]
+        prev_letter = greek_text[cursor - 1] if cursor > 0 else ""
+        next_letter = greek_text[cursor + 1] if cursor < len(greek_text) - 1 else ""
+        third_letter = greek_text[cursor + 2] if cursor < len(greek_text) - 2 else ""
+
+        is_upper = letter.upper() == letter
+        is_upper_next = next_letter.upper() == next_letter
+        letter = letter.lower()
+        prev_letter = prev_letter.lower()
+        next_letter = next_letter.lower()
+        third_letter = third_letter.lower()
+
+        simple_translation_greek = "άβδέζήιίϊΐκλνξόπρσςτυύϋΰφωώ"
+        simple_translation_latin = "avdeziiiiiklnxoprsstyyyyfoo"
+
+        digraph_translation_greek = "θχψ"
+        digraph_translation_latin = "thchps"
+
+        digraph_ypsilon_greek = "αεη"
+        digraph_ypsilon_latin = "aei"
+        digraph_ypsilon_beta = "βγδζλμνραάεέηήιίϊΐοόυύϋΰωώ"
+        digraph_ypsilon_phi = "θκξπστφχψ"
+
+        if letter in simple_translation_greek:
+            new_letter = simple_translation_latin[simple_translation_greek.index(letter)]
+        elif letter in digraph_translation_greek:
+            diphthong_index = digraph_translation_greek.index(letter)
+            new_letter = digraph_translation_latin[diphthong_index * 2 : diphthong_index * 2 + 2]
+        elif letter in digraph_ypsilon_greek:
+            new_letter = digraph_ypsilon_latin[digraph_ypsilon_greek.index(letter)]
+            if next_letter in ["υ", "ύ"]:
+                if third_letter in digraph_ypsilon_beta:
+                    new_letter += "v"
+                    cursor += 1
+                elif third_letter in digraph_ypsilon_phi:
+                    new_letter += "f"
+                    cursor += 1
+        elif letter == "γ":
+            if next_letter == "γ":
+                new_letter = "ng"
+                cursor += 1
+            elif next_letter == "ξ":
+                new_letter = "nx"
+                cursor += 1
+            elif next_letter in "χ":
+                new_letter = "nch"
+                cursor += 1
+            else:
+                new_letter = "g"
+        elif letter == "μ":
+            if next_letter == "π":
+                if prev_letter.strip() == "" or third_letter.strip() == "":
+                    new_letter = "b"
+                    cursor += 1
+                else:
+                    new_letter = "mp"
+                    cursor += 1
+            else:
+                new_letter = "m"
+        elif letter == "ο":
+            new_letter = "o"
+            if next_letter in ["υ", "ύ"]:
+                new_letter += "u"
+                cursor += 1
+        else:
+            new_letter = letter
+        if is_upper:
+            new_letter = new_letter[0].upper() + (new_letter[1:].upper() if is_upper_next else new_letter[1:].lower())
+        result += new_letter
+        cursor += 1
+    return result
+
+
+def test_romanize_matches_reference():
+    texts: set[str] = set()
+    for entry in all_entries():
+        texts.update(value for value in entry.values() if isinstance(value, str))
+    for converted in converted_catalog():
+        texts.update(converted.authors + converted.topics + converted.translators + converted.donors)
+    for code in CORRECTION_TABLES:
+        for key, value in load_correction_table(code).items():
+            texts.add(key)
+            if isinstance(value, str):
+                texts.add(value)
+    # every short combination of the letters that take part in digraphs
+    alphabet = "αάευύοηγξχμπβσςθ ΑΕΥΎΟΓΜΠΣΞΧ1-İ"
+    for length in range(1, 4):
+        texts.update("".join(letters) for letters in itertools.product(alphabet, repeat=length))
+    rng = random.Random(843)
+    texts.update("".join(rng.choices(alphabet, k=rng.randint(4, 12))) for _ in range(20000))
+    for text in texts:
+        assert romanize(text) == reference_romanize(text), text